@@ -0,0 +1,169 @@
+import re
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Validation par lots (rapports de qualité sur toute la base) : les champs utiles à
+# ResponseValidator sont extraits une fois en colonnes, chaque règle devient un masque booléen
+# calculé sur tout le lot, et les messages ne sont construits que pour les lignes demandées.
+# Les messages et leur ordre sont ceux de ResponseValidator.validate_responses.
+
+# Même motif que ResponseValidator._validate_job_preferences (re.match)
+_SALARY_FORMAT = re.compile(r'^[\d\s.,k€-]+$')
+
+# Statut d'emploi : code de la colonne 'employed'
+EMPLOYED_CODES = {'oui': 1, 'non': 2}
+
+# Colonnes de présence : (colonne, section, champ) ; vraie si le champ a une valeur non vide
+PRESENCE_COLUMNS = (
+    ('role', 'jobPreferences', 'preferredRole'),
+    ('contract', 'jobPreferences', 'contractType'),
+    ('location', 'jobPreferences', 'location'),
+    ('technical_skills', 'skills', 'technicalSkills'),
+    ('soft_skills', 'skills', 'softSkills'),
+    ('languages', 'skills', 'languages'),
+    ('search_reason', 'availability', 'jobSearchReason'),
+    ('notice_period', 'availability', 'noticePeriod'),
+    ('end_reason', 'availability', 'jobEndReason')
+)
+
+# Règles, dans l'ordre de ResponseValidator : (nom, avertissement, suggestion ou None, masque)
+VALIDATION_RULES: Tuple[Tuple[str, str, Optional[str], Callable[[Dict[str, np.ndarray]], np.ndarray]], ...] = (
+    ('missing_role', 'Le poste recherché n\'est pas spécifié',
+     'Spécifier le poste recherché pour améliorer la précision du matching',
+     lambda c: ~c['role']),
+    ('missing_contract', 'Le type de contrat n\'est pas spécifié', None,
+     lambda c: ~c['contract']),
+    ('missing_location', 'La localisation n\'est pas spécifiée', None,
+     lambda c: ~c['location']),
+    ('malformed_salary', 'Le format des prétentions salariales est incorrect',
+     'Indiquer les prétentions salariales au format "40K€" ou "40-50K€"',
+     lambda c: c['salary_malformed']),
+    ('missing_technical_skills', 'Aucune compétence technique n\'est spécifiée',
+     'Ajouter des compétences techniques pour améliorer le matching',
+     lambda c: ~c['technical_skills']),
+    ('missing_soft_skills', 'Aucune compétence comportementale n\'est spécifiée', None,
+     lambda c: ~c['soft_skills']),
+    ('missing_languages', 'Aucune langue n\'est spécifiée', None,
+     lambda c: ~c['languages']),
+    ('missing_employment_status', 'Le statut d\'emploi n\'est pas spécifié', None,
+     lambda c: ~c['employment_known']),
+    ('employed_without_search_reason', 'La raison de recherche d\'emploi n\'est pas spécifiée', None,
+     lambda c: (c['employed'] == EMPLOYED_CODES['oui']) & ~c['search_reason']),
+    ('employed_without_notice', 'La durée du préavis n\'est pas spécifiée', None,
+     lambda c: (c['employed'] == EMPLOYED_CODES['oui']) & ~c['notice_period']),
+    ('unemployed_without_end_reason', 'La raison de fin du dernier contrat n\'est pas spécifiée', None,
+     lambda c: (c['employed'] == EMPLOYED_CODES['non']) & ~c['end_reason'])
+)
+
+EMPTY_RESULT_ERRORS = ('Données vides',)
+
+
+def validation_columns(candidates: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Colonnes de validation d'un lot de candidats parsés (un seul passage sur les données)"""
+    presence: Dict[str, List[bool]] = {name: [] for name, _, _ in PRESENCE_COLUMNS}
+    # Pour chaque section : (champ, méthode append de sa colonne)
+    appenders = {section: [] for _, section, _ in PRESENCE_COLUMNS}
+    for name, section, field in PRESENCE_COLUMNS:
+        appenders[section].append((field, presence[name].append))
+    job_fields, skill_fields, availability_fields = (appenders[section] for section in
+                                                     ('jobPreferences', 'skills', 'availability'))
+    empty: List[bool] = []
+    employment_known: List[bool] = []
+    employed: List[int] = []
+    salaries: List[str] = []
+
+    for candidate in candidates:
+        empty.append(not candidate)
+        candidate = candidate or {}
+        job_prefs = candidate.get('jobPreferences') or {}
+        for field, append in job_fields:
+            append(bool(job_prefs.get(field)))
+        skills = candidate.get('skills') or {}
+        for field, append in skill_fields:
+            append(bool(skills.get(field)))
+        availability = candidate.get('availability') or {}
+        for field, append in availability_fields:
+            append(bool(availability.get(field)))
+        employment_known.append('currentlyEmployed' in availability)
+        status = availability.get('currentlyEmployed')
+        employed.append(EMPLOYED_CODES.get(status, 0) if isinstance(status, str) else 0)
+        salary = job_prefs.get('salaryExpectation', '')
+        salaries.append(str(salary) if salary else '')
+
+    columns = {name: np.array(values, dtype=bool) for name, values in presence.items()}
+    columns['empty'] = np.array(empty, dtype=bool)
+    columns['employment_known'] = np.array(employment_known, dtype=bool)
+    columns['employed'] = np.array(employed, dtype=np.int8)
+    columns['salary_malformed'] = salary_format_mask(salaries)
+    return columns
+
+
+def salary_format_mask(salaries: Sequence[str]) -> np.ndarray:
+    """Masque des prétentions salariales renseignées mais mal formatées ; chaque texte distinct est testé une fois"""
+    malformed: Dict[str, bool] = {}
+    for text in salaries:
+        if text not in malformed:
+            malformed[text] = bool(text) and not _SALARY_FORMAT.match(text)
+    return np.fromiter(map(malformed.__getitem__, salaries), dtype=bool, count=len(salaries))
+
+
+class BatchValidation:
+    """Résultat de la validation d'un lot : un masque par règle, comptes agrégés et messages à la demande"""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.empty = columns['empty']
+        # Un candidat vide ne reçoit que l'erreur "Données vides" (aucune règle ne s'applique)
+        self.masks: Dict[str, np.ndarray] = {
+            name: rule(columns) & ~self.empty for name, _, _, rule in VALIDATION_RULES
+        }
+        self._matrix = np.column_stack([self.masks[name] for name, _, _, _ in VALIDATION_RULES]) \
+            if len(self.empty) else np.zeros((0, len(VALIDATION_RULES)), dtype=bool)
+
+    @classmethod
+    def from_candidates(cls, candidates: Iterable[Dict[str, Any]]) -> 'BatchValidation':
+        """Valide une suite de candidats parsés"""
+        return cls(validation_columns(candidates))
+
+    def __len__(self) -> int:
+        return len(self.empty)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Masque des candidats valides (ResponseValidator ne produit d'erreur que pour un candidat vide)"""
+        return ~self.empty
+
+    def counts(self) -> Dict[str, int]:
+        """Nombre de candidats concernés par chaque règle, et nombre de candidats vides"""
+        counts = {name: int(mask.sum()) for name, mask in self.masks.items()}
+        counts['empty'] = int(self.empty.sum())
+        return counts
+
+    def warning_counts(self) -> np.ndarray:
+        """Nombre d'avertissements de chaque candidat"""
+        return self._matrix.sum(axis=1)
+
+    def rows(self, rule: str) -> np.ndarray:
+        """Positions des candidats concernés par une règle"""
+        return np.flatnonzero(self.masks[rule])
+
+    def result(self, row: int) -> Dict[str, Any]:
+        """Résultat d'un candidat, identique à ResponseValidator.validate_responses"""
+        if self.empty[row]:
+            return {'valid': False, 'errors': list(EMPTY_RESULT_ERRORS)}
+        failed = self._matrix[row]
+        warnings = []
+        suggestions = []
+        for (_, warning, suggestion, _), hit in zip(VALIDATION_RULES, failed):
+            if hit:
+                warnings.append(warning)
+                if suggestion:
+                    suggestions.append(suggestion)
+        return {'valid': True, 'errors': [], 'warnings': warnings, 'suggestions': suggestions}
+
+    def results(self, rows: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        """Résultats des lignes demandées (toutes par défaut), construits au fur et à mesure"""
+        for row in range(len(self)) if rows is None else rows:
+            yield self.result(row)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark des stratégies d'exécution de ResponseParser.parse_candidate_response
+
+Mesure la latence par candidat pour chaque stratégie (sequential, threads, processes)
+sur un questionnaire de taille normale et sur un très gros questionnaire.
+"""
+
+import os
+import sys
+import copy
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from candidate_parser import EXAMPLE_DATA, ResponseParser
+
+
+def build_large_questionnaire(factor: int) -> dict:
+    """Construit un questionnaire volumineux à partir du questionnaire d'exemple"""
+    questionnaire = copy.deepcopy(EXAMPLE_DATA['questionnaire'])
+    skills = questionnaire['skills']
+    skills['technicalSkills'] = [f"{skill} {i}" for i in range(factor) for skill in skills['technicalSkills']]
+    skills['technicalSkillLevels'] = {skill: 'avancé' for skill in skills['technicalSkills']}
+    
+    additional = questionnaire['additional']
+    for field in ('motivation', 'strengths', 'challenges'):
+        additional[field] = ' '.join([additional[field]] * factor)
+    
+    return questionnaire
+
+
+def measure(parser: ResponseParser, questionnaire: dict, iterations: int) -> list:
+    """Retourne la latence de chaque appel en millisecondes"""
+    # Premier appel hors mesure : démarrage des pools partagés
+    parser.parse_candidate_response(questionnaire)
+    
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        parser.parse_candidate_response(questionnaire)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--iterations', type=int, default=200)
+    arg_parser.add_argument('--large-factor', type=int, default=200,
+                            help="facteur de taille du gros questionnaire")
+    args = arg_parser.parse_args()
+    
+    payloads = {
+        'normal': EXAMPLE_DATA['questionnaire'],
+        'large': build_large_questionnaire(args.large_factor)
+    }
+    
+    print(f"{'stratégie':<12} {'payload':<8} {'moyenne (ms)':>13} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for strategy in ResponseParser.EXECUTION_STRATEGIES:
+        parser = ResponseParser(execution=strategy)
+        for name, questionnaire in payloads.items():
+            iterations = args.iterations if name == 'normal' else max(args.iterations // 10, 1)
+            latencies = sorted(measure(parser, questionnaire, iterations))
+            p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+            print(f"{strategy:<12} {name:<8} {statistics.mean(latencies):>13.3f} "
+                  f"{statistics.median(latencies):>10.3f} {p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
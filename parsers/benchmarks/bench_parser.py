@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark des étapes du parser sur des candidats synthétiques
+
+Mesure TextNormalizer, CategoryClassifier, chaque méthode _parse_* de
+ResponseParser et le traitement complet (process_candidate) sur 1, 1 000 et
+100 000 candidats : débit, latence p50/p99 et pic mémoire (tracemalloc).
+Les résultats peuvent être enregistrés comme référence puis comparés pour
+détecter les régressions.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from candidate_parser import TextNormalizer, CategoryClassifier, ResponseParser, process_candidate
+from candidate_generator import generate_candidates
+
+DEFAULT_SIZES = [1, 1000, 100000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'parser.json')
+
+# En dessous de cette taille, les mesures sont trop bruitées pour être comparées à la référence
+MIN_COMPARED_SIZE = 100
+
+FREE_TEXT_FIELDS = ('motivation', 'strengths', 'challenges', 'additionalInfo')
+
+
+def _free_texts(candidate: dict) -> list:
+    """Textes libres d'un candidat"""
+    additional = candidate['questionnaire']['additional']
+    return [additional[field] for field in FREE_TEXT_FIELDS if additional.get(field)]
+
+
+def build_stages() -> list:
+    """Étapes mesurées : (nom, préparation de l'entrée hors mesure, fonction mesurée)"""
+    parser = ResponseParser()
+
+    def section(name):
+        return lambda candidate: candidate['questionnaire'][name]
+
+    return [
+        ('TextNormalizer.correct_common_errors', _free_texts,
+         lambda texts: [TextNormalizer.correct_common_errors(text) for text in texts]),
+        ('TextNormalizer.extract_key_terms', _free_texts,
+         lambda texts: [TextNormalizer.extract_key_terms(text) for text in texts]),
+        ('CategoryClassifier.classify_response', _free_texts,
+         lambda texts: [CategoryClassifier.classify_response(text) for text in texts]),
+        ('CategoryClassifier.get_confidence_scores', _free_texts,
+         lambda texts: [CategoryClassifier.get_confidence_scores(text) for text in texts]),
+        ('ResponseParser._parse_job_preferences', section('jobPreferences'), parser._parse_job_preferences),
+        ('ResponseParser._parse_skills', section('skills'), parser._parse_skills),
+        ('ResponseParser._parse_availability', section('availability'), parser._parse_availability),
+        ('ResponseParser._parse_additional', section('additional'), parser._parse_additional),
+        ('process_candidate', lambda candidate: json.dumps(candidate, ensure_ascii=False), process_candidate)
+    ]
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Percentile d'une liste triée (méthode du rang le plus proche)"""
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def measure_latencies(stages: list, size: int, seed: int) -> dict:
+    """Latence de chaque appel en millisecondes, par étape ; les candidats sont générés au fil de l'eau"""
+    latencies = {name: [] for name, _, _ in stages}
+    for candidate in generate_candidates(size, seed):
+        for name, prepare, function in stages:
+            argument = prepare(candidate)
+            start = time.perf_counter()
+            function(argument)
+            latencies[name].append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def measure_peak_memory(stages: list, size: int, seed: int) -> dict:
+    """Pic d'allocation (Kio) de chaque étape, mesuré à part car tracemalloc fausse les temps"""
+    candidates = list(generate_candidates(size, seed))
+    peaks = {}
+    for name, prepare, function in stages:
+        arguments = [prepare(candidate) for candidate in candidates]
+        tracemalloc.start()
+        for argument in arguments:
+            function(argument)
+        peaks[name] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return peaks
+
+
+def run(sizes: list, seed: int, memory_sample: int) -> dict:
+    """Mesure toutes les étapes pour chaque taille et retourne les résultats"""
+    stages = build_stages()
+    results = {}
+    for size in sizes:
+        latencies = measure_latencies(stages, size, seed)
+        peaks = measure_peak_memory(stages, min(size, memory_sample), seed)
+
+        results[str(size)] = {}
+        for name, _, _ in stages:
+            values = sorted(latencies[name])
+            total_seconds = sum(values) / 1000
+            results[str(size)][name] = {
+                'throughput': size / total_seconds if total_seconds else 0.0,
+                'p50_ms': percentile(values, 0.50),
+                'p99_ms': percentile(values, 0.99),
+                'peak_kib': peaks[name]
+            }
+    return results
+
+
+def print_results(results: dict, memory_sample: int) -> None:
+    """Affiche les résultats sous forme de tableau"""
+    print(f"{'étape':<42} {'candidats':>9} {'débit (/s)':>12} {'p50 (ms)':>10} {'p99 (ms)':>10} {'pic (Kio)':>10}")
+    for size, stages in results.items():
+        for name, measures in stages.items():
+            print(f"{name:<42} {size:>9} {measures['throughput']:>12.0f} {measures['p50_ms']:>10.4f} "
+                  f"{measures['p99_ms']:>10.4f} {measures['peak_kib']:>10.1f}")
+    print(f"(pic mémoire mesuré sur au plus {memory_sample} candidats)")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Retourne les régressions par rapport à la référence (écart relatif au-delà du seuil)"""
+    regressions = []
+    for size, stages in results.items():
+        if int(size) < MIN_COMPARED_SIZE or size not in baseline['results']:
+            continue
+        for name, measures in stages.items():
+            reference = baseline['results'][size].get(name)
+            if reference is None:
+                continue
+            checks = [
+                ('p50_ms', measures['p50_ms'] > reference['p50_ms'] * (1 + threshold)),
+                ('p99_ms', measures['p99_ms'] > reference['p99_ms'] * (1 + threshold)),
+                ('throughput', measures['throughput'] < reference['throughput'] / (1 + threshold)),
+                ('peak_kib', measures['peak_kib'] > reference['peak_kib'] * (1 + threshold))
+            ]
+            for metric, regressed in checks:
+                if regressed:
+                    regressions.append(f"{name} ({size} candidats) : {metric} "
+                                       f"{reference[metric]:.4f} -> {measures[metric]:.4f}")
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                            help="nombres de candidats, séparés par des virgules")
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument('--memory-sample', type=int, default=1000,
+                            help="nombre maximal de candidats pour la mesure du pic mémoire")
+    arg_parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, default=None,
+                            help="enregistre les résultats comme référence")
+    arg_parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, default=None,
+                            help="compare les résultats à une référence et échoue en cas de régression")
+    arg_parser.add_argument('--threshold', type=float, default=0.25,
+                            help="écart relatif toléré par rapport à la référence")
+    args = arg_parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = run(sizes, args.seed, args.memory_sample)
+    print_results(results, args.memory_sample)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w', encoding='utf-8') as baseline_file:
+            json.dump({
+                'date': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'seed': args.seed,
+                'memorySample': args.memory_sample,
+                'results': results
+            }, baseline_file, ensure_ascii=False, indent=2)
+        print(f"Référence enregistrée dans {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold:.0%} :")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nAucune régression au-delà de {args.threshold:.0%} par rapport à {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Budget de démarrage du parser
+
+Mesure dans un interpréteur neuf le temps d'import de candidate_parser (via
+`python -X importtime`) et la mémoire résidente (RSS) après l'import, et
+échoue si l'une des deux mesures dépasse le budget fixé.
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+PARSERS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Budgets par défaut (le parser importe en ~50 ms et ajoute moins de 1 Mo sur un poste de dev ;
+# l'ancien import de pandas coûtait à lui seul ~340 ms et ~50 Mo)
+DEFAULT_IMPORT_BUDGET_MS = 100.0
+DEFAULT_RSS_BUDGET_MB = 10.0
+
+# Le processus enfant affiche son pic de RSS une fois l'import terminé
+CHILD_CODE = """
+import resource, sys
+{imports}
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# ru_maxrss est en octets sous macOS et en kilo-octets sous Linux
+print(rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024)
+"""
+
+
+def run_child(module: str) -> tuple:
+    """Importe le module dans un nouvel interpréteur et retourne (temps d'import en ms, RSS en Mo)"""
+    code = CHILD_CODE.format(imports=f"import {module}" if module else "")
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PARSERS_DIR, capture_output=True, text=True, check=True
+    )
+    
+    # Lignes "import time: self [us] | cumulative | imported package"
+    import_ms = 0.0
+    for line in completed.stderr.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            import_ms = int(parts[1]) / 1000
+    
+    return import_ms, float(completed.stdout.strip())
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--import-budget-ms', type=float, default=DEFAULT_IMPORT_BUDGET_MS)
+    arg_parser.add_argument('--rss-budget-mb', type=float, default=DEFAULT_RSS_BUDGET_MB,
+                            help="budget de RSS ajoutée par l'import (au-delà de l'interpréteur nu)")
+    arg_parser.add_argument('--module', default='candidate_parser')
+    args = arg_parser.parse_args()
+    
+    # Référence : interpréteur sans import
+    baseline_rss = statistics.median(run_child('')[1] for _ in range(args.runs))
+    
+    measures = [run_child(args.module) for _ in range(args.runs)]
+    import_ms = statistics.median(measure[0] for measure in measures)
+    rss_mb = statistics.median(measure[1] for measure in measures) - baseline_rss
+    
+    print(f"import {args.module}: {import_ms:.1f} ms (budget {args.import_budget_ms:.1f} ms)")
+    print(f"RSS ajoutée: {rss_mb:.1f} Mo (budget {args.rss_budget_mb:.1f} Mo, interpréteur nu {baseline_rss:.1f} Mo)")
+    
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append("temps d'import")
+    if rss_mb > args.rss_budget_mb:
+        failures.append("mémoire")
+    
+    if failures:
+        print(f"ÉCHEC: budget dépassé ({', '.join(failures)})")
+        return 1
+    
+    print("OK: budget de démarrage respecté")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Générateur de candidats synthétiques pour les benchmarks
+
+Produit des questionnaires réalistes (postes, compétences, langues, salaires
+et textes libres en français, avec les fautes et abréviations que le parser
+corrige) de façon reproductible à partir d'une graine.
+"""
+
+import random
+from typing import Dict, Any, Iterator
+
+ROLES = [
+    "Développeur Frontend", "Développeur Backend", "Développeur Full-Stack", "Développeur front-end React",
+    "Ingénieur back-end Python", "Data Scientist", "Data Engineer", "DevOps", "Chef de projet",
+    "Product Owner", "UX/UI Designer", "Tech Lead", "Architecte logiciel", "Développeur mobile",
+    "Administrateur systèmes", "Ingénieur QA"
+]
+
+CONTRACTS = ["CDI", "cdi", "CDD", "cdd", "Freelance", "freelance", "Stage", "Alternance", "CDI ou freelance"]
+
+LOCATIONS = [
+    "Paris", "Lyon", "Marseille", "Toulouse", "Bordeaux", "Lille", "Nantes", "Strasbourg", "Rennes",
+    "Montpellier", "Nice", "Grenoble", "Paris 15e", "Île-de-France", "La Défense", "Sophia Antipolis"
+]
+
+REMOTE_PREFERENCES = [
+    "Hybride", "Télétravail complet", "teletravail", "remote", "Sur site", "onsite", "2 jours de télétravail",
+    "Peu importe", ""
+]
+
+SALARY_FORMATS = [
+    lambda rng: f"{rng.randint(30, 70)}-{rng.randint(71, 95)}k",
+    lambda rng: f"{rng.randint(30, 90)}k",
+    lambda rng: f"{rng.randint(30, 90) * 1000} €",
+    lambda rng: f"{rng.randint(30, 90)} 000 euros brut annuel",
+    lambda rng: f"entre {rng.randint(35, 50)} et {rng.randint(51, 70)}K€",
+    lambda rng: f"{rng.randint(25, 60) * 100}€/mois",
+    lambda rng: f"{rng.randint(35, 90) * 10} € par jour",
+    lambda rng: "à négocier",
+    lambda rng: ""
+]
+
+TECHNICAL_SKILLS = [
+    "JavaScript", "js", "React", "reactjs", "react.js", "Vue.js", "Angular", "TypeScript", "ts", "HTML", "html5",
+    "CSS", "css3", "Node.js", "nodejs", "node", "Python", "Django", "Flask", "Java", "Spring", "C#", ".NET",
+    "PHP", "Symfony", "Laravel", "SQL", "PostgreSQL", "postgre", "MySQL", "MongoDB", "mongo", "NoSQL",
+    "Docker", "Kubernetes", "AWS", "Azure", "GCP", "Terraform", "Git", "Linux", "Go", "Rust", "Kotlin",
+    "Swift", "Flutter", "GraphQL", "Redis", "Elasticsearch", "Kafka", "Spark", "Pandas", "TensorFlow"
+]
+
+SKILL_LEVELS = ["débutant", "debutant", "intermédiaire", "intermediaire", "avancé", "avance", "expert",
+                "junior", "senior", "confirmé", "notions", "bon niveau"]
+
+SOFT_SKILLS = [
+    "Communication", "Travail d'équipe", "Autonomie", "Leadership", "Rigueur", "Curiosité", "Adaptabilité",
+    "Gestion du stress", "Organisation", "Esprit d'analyse", "Créativité", "Pédagogie"
+]
+
+LANGUAGES = [
+    "Français (natif)", "Français", "Anglais (B2)", "Anglais courant", "Anglais (C1)", "Anglais technique",
+    "Espagnol (B1)", "Espagnol courant", "Allemand (A2)", "Allemand scolaire", "Italien (B2)",
+    "Portugais (natif)", "Arabe (C2)", "Chinois (A1)"
+]
+
+CERTIFICATIONS = [
+    "AWS Certified Developer", "AWS Solutions Architect", "Scrum Master PSM I", "TOEIC 900",
+    "Certified Kubernetes Administrator", "Google Cloud Professional", "Microsoft Azure Fundamentals"
+]
+
+EMPLOYMENT_STATUSES = ["oui", "non", "en poste", "actuellement en poste", "sans emploi", "au chômage", "chomage"]
+
+JOB_SEARCH_REASONS = [
+    "Manque de perspectives d'évolutions", "salaire", "pas assez payé", "pas d'évolution", "trop de trajet",
+    "loin de chez moi", "Envie de changer de secteur", "Fin de mission", "Ambiance de travail dégradée"
+]
+
+NOTICE_PERIODS = ["1_mois", "2_mois", "3_mois", "1 mois", "3 mois", "pas de préavis", "période d'essai", ""]
+
+RECRUITMENT_STATUSES = ["aucun", "entretiens", "offres", "en cours de process", ""]
+
+INTERVIEW_AVAILABILITIES = [
+    "Soirs et weekends", "En semaine", "Tous les jours", "Le midi", "Mardi et jeudi après-midi", ""
+]
+
+PRIORITY_KEYS = [
+    "Salaire et avantages", "Ambiance de travail", "Perspectives d'évolution", "Télétravail",
+    "Localisation", "Projets techniques", "Équilibre vie pro / vie perso"
+]
+
+# Fragments de texte libre, avec des termes que le normaliseur corrige
+SENTENCES = [
+    "Je cherche un environnement plus stimulant où je pourrai développer mes compétences.",
+    "Après plusieurs années en cdi dans une ESN, je souhaite rejoindre une équipe produit.",
+    "J'ai travaillé sur une migration de reactjs vers TypeScript avec une API en nodejs et mongo.",
+    "Le temps de trajet actuel est trop important et je souhaite plus de teletravail.",
+    "Je suis à l'aise avec python, postgresql et les pipelines de données.",
+    "Mon manager m'a confié l'encadrement de deux développeurs juniors l'an dernier.",
+    "Je recherche un poste avec des perspectives d'evolution et un vrai plan de formation.",
+    "Grande capacité d'apprentissage et autonomie dans la résolution de problèmes.",
+    "J'ai dû reprendre un projet complexe avec peu de documentation et le livrer dans des délais serrés.",
+    "Je suis passionné par le design d'interfaces en html5 et css3 accessibles.",
+    "La qualité du code, les tests automatisés et la revue de code sont importants pour moi.",
+    "J'ai mis en place l'intégration continue et le déploiement sur AWS avec Docker.",
+    "Je suis pas assez payé par rapport au marché et je n'ai pas d'évolution possible.",
+    "Je souhaite travailler en remote au moins trois jours par semaine.",
+    "Curieux et rigoureux, j'aime comprendre le métier de mes utilisateurs.",
+    "Je parle anglais couramment et j'ai travaillé deux ans à Londres."
+]
+
+
+def _free_text(rng: random.Random, min_sentences: int, max_sentences: int) -> str:
+    """Assemble un texte libre de longueur variable"""
+    return ' '.join(rng.choice(SENTENCES) for _ in range(rng.randint(min_sentences, max_sentences)))
+
+
+def generate_questionnaire(rng: random.Random) -> Dict[str, Any]:
+    """Génère un questionnaire candidat complet"""
+    technical_skills = rng.sample(TECHNICAL_SKILLS, rng.randint(0, 12))
+    employed = rng.choice(EMPLOYMENT_STATUSES)
+
+    availability = {
+        "currentlyEmployed": employed,
+        "noticePeriod": rng.choice(NOTICE_PERIODS),
+        "noticeNegotiable": rng.choice(["oui", "non", ""]),
+        "recruitmentStatus": rng.choice(RECRUITMENT_STATUSES),
+        "interviewAvailability": rng.choice(INTERVIEW_AVAILABILITIES),
+        "relocateWilling": rng.choice([True, False, None])
+    }
+    if employed in ("oui", "en poste", "actuellement en poste"):
+        availability["jobSearchReason"] = rng.choice(JOB_SEARCH_REASONS)
+    else:
+        availability["jobEndReason"] = rng.choice(JOB_SEARCH_REASONS)
+
+    return {
+        "jobPreferences": {
+            "preferredRole": rng.choice(ROLES),
+            "contractType": rng.choice(CONTRACTS),
+            "location": rng.choice(LOCATIONS),
+            "remotePreference": rng.choice(REMOTE_PREFERENCES),
+            "salaryExpectation": rng.choice(SALARY_FORMATS)(rng),
+            "startDate": f"2025-{rng.randint(1, 12):02d}-01"
+        },
+        "skills": {
+            "technicalSkills": technical_skills,
+            "technicalSkillLevels": {
+                skill: rng.choice(SKILL_LEVELS) for skill in technical_skills if rng.random() < 0.7
+            },
+            "softSkills": rng.sample(SOFT_SKILLS, rng.randint(0, 5)),
+            "languages": rng.sample(LANGUAGES, rng.randint(0, 3)),
+            "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 2))
+        },
+        "availability": availability,
+        "additional": {
+            "motivation": _free_text(rng, 1, 8),
+            "strengths": _free_text(rng, 1, 5),
+            "challenges": _free_text(rng, 0, 10),
+            "additionalInfo": _free_text(rng, 0, 20),
+            "priorities": {key: rng.randint(1, 5) for key in rng.sample(PRIORITY_KEYS, rng.randint(0, 4))}
+        }
+    }
+
+
+def generate_candidates(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Génère `count` candidats ({"questionnaire": ...}) ; la même graine donne la même suite"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {"questionnaire": generate_questionnaire(rng)}
@@ -0,0 +1,276 @@
+import re
+import sys
+import json
+import bisect
+import struct
+from array import array
+from typing import Dict, List, Any, Optional, Iterable, Hashable
+
+from skill_registry import skill_id
+
+
+class CandidateIndex:
+    """Index inversé des tags de matching produits par ResponseParser"""
+
+    # Format du snapshot : signature, taille de l'en-tête JSON, en-tête, puis les tableaux bruts
+    SNAPSHOT_MAGIC = b'CIDX2\n'
+
+    # Octets non nuls d'un bitmap (recherche des candidats présents sans boucle Python par bit)
+    _NON_ZERO_BYTE = re.compile(rb'[^\x00]')
+
+    def __init__(self):
+        # Les candidats sont numérotés en interne par ordre d'ajout : les listes de postings
+        # restent triées sans effort et les bitmaps sont indexés par cette position
+        self._ids: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._postings: Dict[str, array] = {}
+        # Postings par compétence (identifiant du registre) puis par niveau : le top-k parcourt
+        # les niveaux du plus élevé au plus bas
+        self._skill_postings: Dict[int, Dict[int, array]] = {}
+        self._bitmaps: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, candidate_id: Hashable) -> bool:
+        return candidate_id in self._positions
+
+    def add(self, candidate_id: Hashable, parsed_data: Dict[str, Any]) -> None:
+        """Indexe les tags et les niveaux de compétence d'un candidat parsé"""
+        if candidate_id in self._positions:
+            raise ValueError(f"Candidat déjà indexé: {candidate_id}")
+
+        position = len(self._ids)
+        self._ids.append(candidate_id)
+        self._positions[candidate_id] = position
+
+        for tag in set(parsed_data.get('tags', [])):
+            self._postings.setdefault(tag, array('I')).append(position)
+            self._bitmaps.pop(tag, None)
+
+        # Niveaux de compétence pour le classement top-k
+        skill_levels = parsed_data.get('skills', {}).get('normalized', {}).get('technicalSkillLevels', {})
+        for skill, value in self._skill_values(skill_levels).items():
+            self._skill_postings.setdefault(skill, {}).setdefault(value, array('I')).append(position)
+
+    def add_many(self, candidates: Iterable[tuple]) -> None:
+        """Indexe une suite de couples (id, données parsées)"""
+        for candidate_id, parsed_data in candidates:
+            self.add(candidate_id, parsed_data)
+
+    def tags(self) -> List[str]:
+        """Retourne la liste des tags indexés"""
+        return sorted(self._postings)
+
+    def count(self, tag: str) -> int:
+        """Retourne le nombre de candidats portant un tag"""
+        return len(self._postings.get(tag, ()))
+
+    def query(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (),
+              none_of: Iterable[str] = (), limit: Optional[int] = None) -> List[Hashable]:
+        """Retourne les candidats ayant tous les tags all_of, au moins un des tags any_of et aucun des tags none_of"""
+        bitmap = self._evaluate(all_of, any_of, none_of)
+        return [self._ids[position] for position in self._iter_positions(bitmap, limit)]
+
+    def query_count(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (),
+                    none_of: Iterable[str] = ()) -> int:
+        """Compte les candidats correspondant à la requête sans les énumérer"""
+        return bin(self._evaluate(all_of, any_of, none_of)).count('1')
+
+    def top_k_by_skill(self, skill: str, k: int = 10,
+                       among: Optional[Iterable[Hashable]] = None) -> List[tuple]:
+        """Retourne les k candidats au niveau le plus élevé sur une compétence, sous forme (id, niveau)"""
+        levels = self._skill_postings.get(skill_id(skill), {})
+
+        allowed = None
+        if among is not None:
+            allowed = {self._positions[candidate_id] for candidate_id in among if candidate_id in self._positions}
+
+        # À niveau égal, le candidat indexé en premier est classé devant
+        best = []
+        for value in sorted(levels, reverse=True):
+            for position in levels[value]:
+                if allowed is None or position in allowed:
+                    best.append((self._ids[position], value))
+                    if len(best) >= k:
+                        return best
+        return best
+
+    def update(self, candidate_id: Hashable, result: Dict[str, Any]) -> None:
+        """Applique à un candidat indexé le résultat de CandidateDataProcessor.reprocess_candidate_data"""
+        skills = result['parsedData'].get('skills') or {}
+        self.update_tags(candidate_id, **result['tagDiff'],
+                         skill_levels=(skills.get('normalized') or {}).get('technicalSkillLevels') or {})
+
+    def update_tags(self, candidate_id: Hashable, added: Iterable[str] = (),
+                    removed: Iterable[str] = (), skill_levels: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Met à jour sur place les tags d'un candidat déjà indexé
+
+        skill_levels (technicalSkillLevels du nouveau résultat parsé) remplace les niveaux de
+        compétence utilisés par top_k_by_skill ; None les laisse inchangés.
+        """
+        position = self._positions[candidate_id]
+        if skill_levels is not None:
+            self._update_skill_levels(position, skill_levels)
+
+        for tag in removed:
+            postings = self._postings.get(tag)
+            if postings is None:
+                continue
+            index = bisect.bisect_left(postings, position)
+            if index < len(postings) and postings[index] == position:
+                del postings[index]
+                self._bitmaps.pop(tag, None)
+                if not postings:
+                    del self._postings[tag]
+
+        for tag in added:
+            postings = self._postings.setdefault(tag, array('I'))
+            index = bisect.bisect_left(postings, position)
+            if index == len(postings) or postings[index] != position:
+                postings.insert(index, position)
+                self._bitmaps.pop(tag, None)
+
+    @staticmethod
+    def _skill_values(skill_levels: Dict[str, Dict[str, Any]]) -> Dict[int, int]:
+        """Niveau de chaque compétence par identifiant ; deux variantes d'un même nom ("React",
+        "react") ne comptent qu'une fois, avec le dernier niveau"""
+        return {skill_id(skill): level.get('value', 0) for skill, level in skill_levels.items()}
+
+    def _update_skill_levels(self, position: int, skill_levels: Dict[str, Dict[str, Any]]) -> None:
+        """Remplace les niveaux de compétence d'une position (les postings restent triés)"""
+        new_levels = self._skill_values(skill_levels)
+
+        for skill, levels in list(self._skill_postings.items()):
+            for value, positions in list(levels.items()):
+                if new_levels.get(skill) == value:
+                    continue
+                index = bisect.bisect_left(positions, position)
+                if index < len(positions) and positions[index] == position:
+                    del positions[index]
+                    if not positions:
+                        del levels[value]
+            if not levels:
+                del self._skill_postings[skill]
+
+        for skill, value in new_levels.items():
+            positions = self._skill_postings.setdefault(skill, {}).setdefault(value, array('I'))
+            index = bisect.bisect_left(positions, position)
+            if index == len(positions) or positions[index] != position:
+                positions.insert(index, position)
+
+    def save(self, path: str) -> None:
+        """Écrit un snapshot de l'index sur disque (les ids de candidats doivent être des chaînes ou des entiers)"""
+        blobs = []
+        header = {
+            'byteorder': sys.byteorder,
+            'ids': self._ids,
+            'postings': [],
+            'skills': []
+        }
+
+        for tag, postings in self._postings.items():
+            header['postings'].append([tag, len(postings)])
+            blobs.append(postings.tobytes())
+
+        for skill, levels in self._skill_postings.items():
+            for value, positions in levels.items():
+                header['skills'].append([skill, value, len(positions)])
+                blobs.append(positions.tobytes())
+
+        header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        with open(path, 'wb') as snapshot:
+            snapshot.write(self.SNAPSHOT_MAGIC)
+            snapshot.write(struct.pack('<Q', len(header_bytes)))
+            snapshot.write(header_bytes)
+            for blob in blobs:
+                snapshot.write(blob)
+
+    @classmethod
+    def load(cls, path: str) -> 'CandidateIndex':
+        """Recharge un index depuis un snapshot écrit par save()"""
+        with open(path, 'rb') as snapshot:
+            data = snapshot.read()
+
+        if not data.startswith(cls.SNAPSHOT_MAGIC):
+            raise ValueError(f"Snapshot d'index invalide: {path}")
+
+        offset = len(cls.SNAPSHOT_MAGIC)
+        (header_size,) = struct.unpack_from('<Q', data, offset)
+        offset += 8
+        header = json.loads(data[offset:offset + header_size].decode('utf-8'))
+        offset += header_size
+        swap = header['byteorder'] != sys.byteorder
+
+        def read_array(typecode: str, length: int) -> array:
+            nonlocal offset
+            values = array(typecode)
+            size = length * values.itemsize
+            values.frombytes(data[offset:offset + size])
+            offset += size
+            if swap:
+                values.byteswap()
+            return values
+
+        index = cls()
+        index._ids = header['ids']
+        index._positions = {candidate_id: position for position, candidate_id in enumerate(index._ids)}
+
+        for tag, length in header['postings']:
+            index._postings[tag] = read_array('I', length)
+
+        for skill, value, length in header['skills']:
+            index._skill_postings.setdefault(skill, {})[value] = read_array('I', length)
+
+        return index
+
+    def _evaluate(self, all_of: Iterable[str], any_of: Iterable[str], none_of: Iterable[str]) -> int:
+        """Combine les bitmaps des tags selon la requête booléenne"""
+        all_of, any_of, none_of = list(all_of), list(any_of), list(none_of)
+
+        # Sans contrainte positive, la requête part de tous les candidats
+        result = (1 << len(self._ids)) - 1
+
+        for tag in all_of:
+            result &= self._bitmap(tag)
+            if not result:
+                return 0
+
+        if any_of:
+            union = 0
+            for tag in any_of:
+                union |= self._bitmap(tag)
+            result &= union
+
+        for tag in none_of:
+            result &= ~self._bitmap(tag)
+
+        return result
+
+    def _bitmap(self, tag: str) -> int:
+        """Retourne le bitmap des candidats portant un tag (construit à la demande puis mis en cache)"""
+        bitmap = self._bitmaps.get(tag)
+        if bitmap is None:
+            bits = bytearray((len(self._ids) + 7) // 8)
+            for position in self._postings.get(tag, ()):
+                bits[position >> 3] |= 1 << (position & 7)
+            bitmap = int.from_bytes(bits, 'little')
+            self._bitmaps[tag] = bitmap
+        return bitmap
+
+    def _iter_positions(self, bitmap: int, limit: Optional[int] = None):
+        """Énumère les positions présentes dans un bitmap, par ordre croissant"""
+        if not bitmap:
+            return
+
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+        found = 0
+        for match in self._NON_ZERO_BYTE.finditer(data):
+            byte_index = match.start()
+            byte = data[byte_index]
+            for bit in range(8):
+                if byte & (1 << bit):
+                    yield byte_index * 8 + bit
+                    found += 1
+                    if limit is not None and found >= limit:
+                        return
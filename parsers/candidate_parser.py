@@ -1,8 +1,78 @@
 import re
+import os
+import sys
 import json
-import pandas as pd
-from typing import Dict, List, Any, Tuple, Optional, Union
-from concurrent.futures import ThreadPoolExecutor
+import argparse
+import time
+import threading
+from datetime import datetime
+from functools import partial, lru_cache
+from itertools import islice
+from typing import Dict, List, Any, Tuple, Optional, Union, Iterable, Iterator
+import concurrent.futures
+
+from skill_registry import SkillRegistry
+from gazetteer import Gazetteer
+from consistency_rules import ConsistencyRules
+from text_vectors import term_vector
+from serializers import OUTPUT_PROFILES, SERIALIZERS, get_serializer, output_profile, read_frame, write_frame
+
+# Version du format de sortie du parser (à incrémenter quand la normalisation change :
+# elle fait partie de la clé du cache de résultats)
+PARSER_VERSION = '1.5.0'
+
+# Conversion des prétentions salariales en euros annuels : facteurs par période et taux de change
+# vers l'euro (mêmes valeurs par défaut que convertToAnnual dans services/matching-algorithm.js)
+SALARY_PERIOD_FACTORS = {'yearly': 1, 'monthly': 12, 'daily': 220, 'hourly': 35 * 52}
+SALARY_CURRENCY_RATES = {'EUR': 1.0, 'USD': 0.85, 'GBP': 1.15}
+
+
+# Instrumentation : les mesures du thread courant sont collectées par un enregistreur actif.
+# Sans enregistreur (cas par défaut), le coût se limite à la lecture d'un attribut.
+class _Recording(threading.local):
+    recorder = None
+
+
+_recording = _Recording()
+
+
+class _StageRecorder:
+    """Durées et compteurs collectés pendant un appel instrumenté"""
+    
+    __slots__ = ('stages', 'counters')
+    
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+    
+    def add_time(self, stage: str, duration_ms: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + duration_ms
+    
+    def add_count(self, counter: str, value: int) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+
+def _run_instrumented_section(section_parser, section: Dict[str, Any]) -> Tuple[Any, float, Dict, Dict]:
+    """Exécute un parser de section en mesurant sa durée, ses étapes internes et ses compteurs"""
+    recorder = _StageRecorder()
+    _recording.recorder = recorder
+    start = time.perf_counter()
+    try:
+        result = section_parser(section)
+    finally:
+        _recording.recorder = None
+    return result, (time.perf_counter() - start) * 1000, recorder.stages, recorder.counters
+
+
+def _timed(timings: Optional[Dict[str, Any]], stage: str, function, *args):
+    """Appelle la fonction ; si l'instrumentation est active, ajoute sa durée aux timings"""
+    if timings is None:
+        return function(*args)
+    start = time.perf_counter()
+    result = function(*args)
+    timings['stages'][stage] = timings['stages'].get(stage, 0.0) + (time.perf_counter() - start) * 1000
+    return result
+
 
 # Version simplifiée sans dépendance à spaCy pour faciliter le déploiement
 class TextNormalizer:
@@ -71,10 +141,9 @@ class TextNormalizer:
         if not text or not isinstance(text, str):
             return ""
         
-        # Convertir en minuscule et supprimer les espaces en trop
-        text = text.lower().strip()
-        text = re.sub(r'\s+', ' ', text)
-        return text
+        # Convertir en minuscule et supprimer les espaces en trop (split() découpe sur les mêmes
+        # caractères que \s, sans passer par une regex)
+        return ' '.join(text.lower().split())
     
     @classmethod
     def correct_common_errors(cls, text: str) -> str:
@@ -84,13 +153,58 @@ class TextNormalizer:
         
         cleaned_text = cls.clean_text(text)
         
-        # Trouver les correspondances dans le dictionnaire de corrections
+        # Un seul passage de la regex compilée remplace toutes les erreurs connues
+        replace = cls._replace_correction
+        recorder = _recording.recorder
+        if recorder is None:
+            return cls._correction_pattern.sub(replace, cleaned_text)
+        
+        start = time.perf_counter()
+        corrected, substitutions = cls._correction_pattern.subn(replace, cleaned_text)
+        recorder.add_time('correction', (time.perf_counter() - start) * 1000)
+        recorder.add_count('substitutions', substitutions)
+        return corrected
+    
+    @classmethod
+    def _replace_correction(cls, match) -> str:
+        """Remplacement d'un terme trouvé par la regex compilée"""
+        replacement = cls._correction_replacements.get(match.group(0).lower())
+        if replacement is None:
+            # IGNORECASE rapproche aussi des caractères que lower() ne ramène pas à l'ASCII
+            # ("ſ" pour "s", "ı" pour "i") : le terme est corrigé comme dans la version séquentielle
+            replacement = cls._apply_corrections_sequentially(match.group(0))
+        return replacement
+    
+    @classmethod
+    def _apply_corrections_sequentially(cls, text: str) -> str:
+        """Applique les corrections une par une, dans l'ordre du dictionnaire (sémantique de référence)"""
+        ascii_text = text.isascii()
         for error, correction in cls.CORRECTIONS.items():
-            # Utiliser une regex pour trouver le mot entier
+            # Éviter de compiler les motifs absents du texte (le démarrage compile tout le tableau) ;
+            # le test par sous-chaîne n'est sûr que pour un texte ASCII, à cause des équivalences
+            # de casse Unicode de IGNORECASE
+            if ascii_text and error not in text.lower():
+                continue
             pattern = r'\b' + re.escape(error) + r'\b'
-            cleaned_text = re.sub(pattern, correction, cleaned_text, flags=re.IGNORECASE)
+            text = re.sub(pattern, correction, text, flags=re.IGNORECASE)
+        return text
+    
+    @classmethod
+    def compile_corrections(cls) -> None:
+        """Compile le dictionnaire CORRECTIONS en une seule regex (à rappeler si CORRECTIONS change)"""
+        # Le remplacement de chaque terme est le résultat de l'application séquentielle des
+        # corrections sur ce terme seul : les corrections imbriquées ("react.js" touché par "js")
+        # et enchaînées (une correction réécrite par une suivante) donnent le même texte qu'avant
+        cls._correction_replacements = {
+            error: cls._apply_corrections_sequentially(error) for error in cls.CORRECTIONS
+        }
         
-        return cleaned_text
+        # Les termes les plus longs d'abord : "node.js" est essayé avant "node"
+        alternatives = sorted(cls.CORRECTIONS, key=len, reverse=True)
+        cls._correction_pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(error) for error in alternatives) + r')\b',
+            flags=re.IGNORECASE
+        )
 
     @classmethod
     def extract_key_terms(cls, text: str) -> List[str]:
@@ -116,6 +230,18 @@ class TextNormalizer:
         return key_terms
 
 
+TextNormalizer.compile_corrections()
+
+# Registre des compétences techniques du processus : variante brute -> (identifiant stable, nom canonique)
+SKILL_REGISTRY = SkillRegistry(TextNormalizer.correct_common_errors)
+
+# Gazetteer hors ligne des villes françaises (coordonnées des lieux sans locationCoordinates)
+GAZETTEER = Gazetteer()
+
+# Règles de cohérence compilées, partagées par tous les parsers
+CONSISTENCY_CHECKS = ConsistencyRules()
+
+
 class CategoryClassifier:
     """Classe pour classifier les réponses dans des catégories spécifiques"""
     
@@ -147,21 +273,36 @@ class CategoryClassifier:
         ],
     }
     
+    @classmethod
+    def compile_terms(cls) -> None:
+        """Compile CATEGORIES en une table de termes distincts (à rappeler si CATEGORIES change)"""
+        cls._category_names = tuple(cls.CATEGORIES)
+        cls._score_divisors = tuple(max(len(terms) * 0.3, 1) for terms in cls.CATEGORIES.values())
+        
+        # Chaque terme n'est cherché qu'une fois, même s'il appartient à plusieurs catégories ("niveau")
+        term_categories = {}
+        for index, terms in enumerate(cls.CATEGORIES.values()):
+            for term in terms:
+                term_categories.setdefault(term, []).append(index)
+        cls._terms = tuple((term, tuple(indexes)) for term, indexes in term_categories.items())
+    
+    @classmethod
+    def _category_hits(cls, clean_response: str) -> List[int]:
+        """Nombre de termes de chaque catégorie présents dans un texte nettoyé, en un passage sur la table"""
+        hits = [0] * len(cls._category_names)
+        for indexes in [indexes for term, indexes in cls._terms if term in clean_response]:
+            for index in indexes:
+                hits[index] += 1
+        return hits
+    
     @classmethod
     def classify_response(cls, response: str) -> List[str]:
         """Classifie une réponse dans une ou plusieurs catégories"""
         if not response:
             return []
         
-        clean_response = TextNormalizer.clean_text(response)
-        categories = []
-        
-        # Vérifier chaque catégorie
-        for category, terms in cls.CATEGORIES.items():
-            for term in terms:
-                if term in clean_response:
-                    categories.append(category)
-                    break
+        hits = cls._category_hits(TextNormalizer.clean_text(response))
+        categories = [category for category, count in zip(cls._category_names, hits) if count]
         
         return list(set(categories))
     
@@ -171,48 +312,225 @@ class CategoryClassifier:
         if not response:
             return {category: 0.0 for category in cls.CATEGORIES}
         
-        clean_response = TextNormalizer.clean_text(response)
-        scores = {}
+        hits = cls._category_hits(TextNormalizer.clean_text(response))
         
-        # Vectoriser les termes et la réponse
-        for category, terms in cls.CATEGORIES.items():
-            # Calculer le nombre de correspondances
-            matches = sum(1 for term in terms if term in clean_response)
-            # Score normalisé entre 0 et 1
-            scores[category] = min(matches / max(len(terms) * 0.3, 1), 1.0)
-        
-        return scores
+        # Score normalisé entre 0 et 1
+        return {
+            category: min(count / divisor, 1.0)
+            for category, count, divisor in zip(cls._category_names, hits, cls._score_divisors)
+        }
+    
+    @classmethod
+    def classify_batch(cls, responses: Iterable[str]):
+        """Scores de confiance d'un lot de réponses : matrice NumPy (réponses × catégories, dans l'ordre de CATEGORIES)"""
+        # NumPy n'est importé que pour l'analyse en masse : le parser n'en dépend pas
+        import numpy as np
+        
+        # Les réponses identiques (réponses courtes, valeurs par défaut) ne sont analysées qu'une fois
+        distinct = {}
+        rows = []
+        for response in responses:
+            hits = distinct.get(response) if isinstance(response, str) else None
+            if hits is None:
+                hits = cls._category_hits(TextNormalizer.clean_text(response))
+                if isinstance(response, str):
+                    distinct[response] = hits
+            rows.append(hits)
+        
+        hits = np.array(rows, dtype=np.float64).reshape(len(rows), len(cls._category_names))
+        return np.minimum(hits / np.array(cls._score_divisors), 1.0)
+
+
+CategoryClassifier.compile_terms()
+
+
+# Pools d'exécution partagés par toutes les instances de ResponseParser
+_shared_executors = {}
+_shared_executors_lock = threading.Lock()
+
+
+def _get_shared_executor(strategy: str):
+    """Retourne le pool partagé d'une stratégie d'exécution (créé au premier appel)"""
+    with _shared_executors_lock:
+        executor = _shared_executors.get(strategy)
+        if executor is None:
+            if strategy == 'threads':
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+            else:
+                executor = concurrent.futures.ProcessPoolExecutor()
+            _shared_executors[strategy] = executor
+        return executor
+
+
+# Tables de normalisation des niveaux, construites une seule fois. L'ordre des entrées compte :
+# la première clé (dans l'ordre de la table) contenue dans le texte l'emporte.
+SKILL_LEVELS = (
+    ('débutant', {'level': 'Débutant', 'value': 1}),
+    ('notions', {'level': 'Débutant', 'value': 1}),
+    ('basique', {'level': 'Débutant', 'value': 1}),
+    ('basic', {'level': 'Débutant', 'value': 1}),
+    ('intermédiaire', {'level': 'Intermédiaire', 'value': 2}),
+    ('intermediaire', {'level': 'Intermédiaire', 'value': 2}),
+    ('avancé', {'level': 'Avancé', 'value': 3}),
+    ('avance', {'level': 'Avancé', 'value': 3}),
+    ('confirmé', {'level': 'Avancé', 'value': 3}),
+    ('confirme', {'level': 'Avancé', 'value': 3}),
+    ('expert', {'level': 'Expert', 'value': 4}),
+    ('maître', {'level': 'Expert', 'value': 4}),
+    ('maitre', {'level': 'Expert', 'value': 4})
+)
+
+LANGUAGE_LEVELS = (
+    ('a1', {'level': 'Débutant', 'value': 1, 'cefr': 'A1'}),
+    ('a2', {'level': 'Élémentaire', 'value': 2, 'cefr': 'A2'}),
+    ('b1', {'level': 'Intermédiaire', 'value': 3, 'cefr': 'B1'}),
+    ('b2', {'level': 'Avancé', 'value': 4, 'cefr': 'B2'}),
+    ('c1', {'level': 'Autonome', 'value': 5, 'cefr': 'C1'}),
+    ('c2', {'level': 'Maîtrise', 'value': 6, 'cefr': 'C2'}),
+    ('débutant', {'level': 'Débutant', 'value': 1, 'cefr': 'A1'}),
+    ('elementaire', {'level': 'Élémentaire', 'value': 2, 'cefr': 'A2'}),
+    ('intermédiaire', {'level': 'Intermédiaire', 'value': 3, 'cefr': 'B1'}),
+    ('intermediaire', {'level': 'Intermédiaire', 'value': 3, 'cefr': 'B1'}),
+    ('avancé', {'level': 'Avancé', 'value': 4, 'cefr': 'B2'}),
+    ('avance', {'level': 'Avancé', 'value': 4, 'cefr': 'B2'}),
+    ('courant', {'level': 'Autonome', 'value': 5, 'cefr': 'C1'}),
+    ('bilingue', {'level': 'Maîtrise', 'value': 6, 'cefr': 'C2'}),
+    ('natif', {'level': 'Langue maternelle', 'value': 7, 'cefr': 'Native'})
+)
+
+# Niveau éventuel en fin d'intitulé de langue (ex: "Anglais - B2" ou "Anglais (courant)")
+_LANGUAGE_PATTERN = re.compile(
+    r'(.*?)[\s-]+\(?([A-C][1-2]|débutant|intermédiaire|avancé|courant|bilingue|natif)\)?', re.IGNORECASE
+)
+
+# Nombre de textes distincts mémorisés par fonction de normalisation
+LEVEL_CACHE_SIZE = 4096
+
+
+class _LevelTable:
+    """Table de niveaux compilée en une regex : un seul passage trouve la première clé de la table présente"""
+
+    def __init__(self, entries: Tuple[Tuple[str, Dict[str, Any]], ...]):
+        self.entries = entries
+        self.ranks = {key: rank for rank, (key, _) in reversed(list(enumerate(entries)))}
+        # Le lookahead repère les clés à chaque position, même chevauchantes ; à une position
+        # donnée, l'alternance retient la clé qui vient en premier dans la table
+        self.pattern = re.compile('(?=(' + '|'.join(re.escape(key) for key, _ in entries) + '))')
+
+    def lookup(self, text: str) -> Optional[Dict[str, Any]]:
+        """Valeur de la première clé de la table contenue dans le texte, ou None"""
+        best = None
+        for match in self.pattern.finditer(text):
+            rank = self.ranks[match.group(1)]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return self.entries[best][1] if best is not None else None
+
+
+_SKILL_LEVEL_TABLE = _LevelTable(SKILL_LEVELS)
+_LANGUAGE_LEVEL_TABLE = _LevelTable(LANGUAGE_LEVELS)
+
+
+# Les résultats mémorisés sont partagés : les appelants en renvoient une copie
+@lru_cache(maxsize=LEVEL_CACHE_SIZE)
+def _skill_level(level: str) -> Dict[str, Any]:
+    """Niveau de compétence normalisé d'un texte brut"""
+    level = TextNormalizer.clean_text(level)
+    return _SKILL_LEVEL_TABLE.lookup(level) or {'level': level.capitalize(), 'value': 0}
+
+
+@lru_cache(maxsize=LEVEL_CACHE_SIZE)
+def _language_level(level: str) -> Dict[str, Any]:
+    """Niveau de langue normalisé d'un texte déjà mis en minuscules"""
+    return _LANGUAGE_LEVEL_TABLE.lookup(level) or {'level': level.capitalize(), 'value': 0}
+
+
+@lru_cache(maxsize=LEVEL_CACHE_SIZE)
+def _language(language: str) -> Dict[str, Any]:
+    """Langue et niveau normalisés d'un intitulé brut"""
+    lang_text = TextNormalizer.clean_text(language)
+    match = _LANGUAGE_PATTERN.match(lang_text)
+    if not match:
+        # Si pas de niveau spécifié
+        return {'language': lang_text.capitalize(), 'level': 'Non spécifié', 'value': 0, 'cefr': None}
+    
+    level = _language_level(match.group(2).lower())
+    return {
+        'language': match.group(1).strip().capitalize(),
+        'level': level['level'],
+        'value': level['value'],
+        'cefr': level.get('cefr')
+    }
 
 
 class ResponseParser:
     """Classe principale pour analyser les réponses du questionnaire"""
     
-    def __init__(self):
+    # Stratégies d'exécution des parsers de section :
+    # - sequential : dans le thread appelant (le plus rapide pour un candidat de taille normale)
+    # - threads : pool de threads partagé au niveau du module
+    # - processes : pool de processus partagé, pour les très gros questionnaires
+    EXECUTION_STRATEGIES = ('sequential', 'threads', 'processes')
+    
+    SECTIONS = ('jobPreferences', 'skills', 'availability', 'additional')
+    
+    def __init__(self, execution: str = 'sequential', instrument: bool = False,
+                 salary_period_factors: Optional[Dict[str, float]] = None,
+                 salary_currency_rates: Optional[Dict[str, float]] = None,
+                 gazetteer: Optional[Gazetteer] = None,
+                 consistency_rules: Optional[ConsistencyRules] = None):
+        if execution not in self.EXECUTION_STRATEGIES:
+            raise ValueError(f"Stratégie d'exécution inconnue: {execution}")
+        
         self.normalizer = TextNormalizer
         self.classifier = CategoryClassifier
+        self.execution = execution
+        # Instrumentation : durées par étape et compteurs dans metadata.timings
+        self.instrument = instrument
+        # Tables de conversion des salaires (une période ou une devise absente compte pour 1)
+        self.salary_period_factors = salary_period_factors or SALARY_PERIOD_FACTORS
+        self.salary_currency_rates = salary_currency_rates or SALARY_CURRENCY_RATES
+        # Résolution des lieux saisis librement en coordonnées
+        self.gazetteer = gazetteer or GAZETTEER
+        # Règles de cohérence (metadata.inconsistencies)
+        self.consistency_rules = consistency_rules or CONSISTENCY_CHECKS
         
     def parse_candidate_response(self, response_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse et structure les réponses d'un candidat"""
         if not response_data:
             return {}
         
-        # Traiter les différentes sections en parallèle pour améliorer les performances
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # Lancer le traitement en parallèle pour chaque section
-            job_prefs_future = executor.submit(self._parse_job_preferences, 
-                                               response_data.get('jobPreferences', {}))
-            skills_future = executor.submit(self._parse_skills, 
-                                            response_data.get('skills', {}))
-            availability_future = executor.submit(self._parse_availability, 
-                                                 response_data.get('availability', {}))
-            additional_future = executor.submit(self._parse_additional, 
-                                               response_data.get('additional', {}))
-            
-            # Récupérer les résultats
-            parsed_job_prefs = job_prefs_future.result()
-            parsed_skills = skills_future.result()
-            parsed_availability = availability_future.result()
-            parsed_additional = additional_future.result()
+        timings = None
+        if self.instrument:
+            started = time.perf_counter()
+            timings = {'sections': {}, 'stages': {}, 'counters': {}}
+        
+        sections = [
+            (self._parse_job_preferences, response_data.get('jobPreferences', {})),
+            (self._parse_skills, response_data.get('skills', {})),
+            (self._parse_availability, response_data.get('availability', {})),
+            (self._parse_additional, response_data.get('additional', {}))
+        ]
+        
+        # Instrumentation : chaque section est mesurée là où elle s'exécute (thread ou processus)
+        if timings is not None:
+            sections = [(partial(_run_instrumented_section, section_parser), section)
+                        for section_parser, section in sections]
+        
+        # Traiter les différentes sections selon la stratégie d'exécution
+        if self.execution == 'sequential':
+            results = [section_parser(section) for section_parser, section in sections]
+        else:
+            executor = _get_shared_executor(self.execution)
+            futures = [executor.submit(section_parser, section) for section_parser, section in sections]
+            results = [future.result() for future in futures]
+        
+        if timings is not None:
+            results = self._collect_section_timings(timings, results)
+        
+        parsed_job_prefs, parsed_skills, parsed_availability, parsed_additional = results
         
         # Assembler le résultat final
         parsed_data = {
@@ -221,23 +539,106 @@ class ResponseParser:
             'availability': parsed_availability,
             'additional': parsed_additional,
             'metadata': {
-                'parsedDate': pd.Timestamp.now().isoformat(),
-                'dataQuality': self._calculate_data_quality(parsed_job_prefs, 
-                                                           parsed_skills, 
-                                                           parsed_availability, 
-                                                           parsed_additional)
+                'parsedDate': datetime.now().isoformat(),
+                'dataQuality': _timed(timings, 'quality', self._calculate_data_quality,
+                                      parsed_job_prefs, parsed_skills, parsed_availability, parsed_additional)
             }
         }
         
         # Vérification de cohérence
-        inconsistencies = self._check_data_consistency(parsed_data)
+        inconsistencies = _timed(timings, 'consistency', self._check_data_consistency, parsed_data)
         if inconsistencies:
             parsed_data['metadata']['inconsistencies'] = inconsistencies
         
         # Tags pour faciliter le matching
-        parsed_data['tags'] = self._generate_matching_tags(parsed_data)
+        parsed_data['tags'] = _timed(timings, 'tags', self._generate_matching_tags, parsed_data)
+        
+        if timings is not None:
+            timings['counters']['tags'] = len(parsed_data['tags'])
+            timings['total'] = (time.perf_counter() - started) * 1000
+            parsed_data['metadata']['timings'] = timings
         
         return parsed_data
+    
+    def _collect_section_timings(self, timings: Dict[str, Any], results: List[tuple]) -> List[Any]:
+        """Reporte les mesures des sections instrumentées dans les timings et retourne leurs résultats"""
+        parsed_sections = []
+        for section, (parsed_section, duration, stages, counters) in zip(self.SECTIONS, results):
+            timings['sections'][section] = duration
+            for stage, stage_duration in stages.items():
+                timings['stages'][stage] = timings['stages'].get(stage, 0.0) + stage_duration
+            for counter, value in counters.items():
+                timings['counters'][counter] = timings['counters'].get(counter, 0) + value
+            parsed_sections.append(parsed_section)
+        return parsed_sections
+        
+    def reparse_candidate_response(self, previous: Dict[str, Any],
+                                   patch: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+        """Met à jour un résultat parsé à partir des seules sections modifiées du questionnaire
+        
+        `patch` associe un nom de section (jobPreferences, skills, availability, additional)
+        à ses nouvelles données brutes, qui remplacent entièrement la section précédente.
+        Retourne le nouveau résultat et le diff des tags {'added': [...], 'removed': [...]},
+        directement utilisable avec CandidateIndex.update_tags.
+        """
+        section_parsers = {
+            'jobPreferences': self._parse_job_preferences,
+            'skills': self._parse_skills,
+            'availability': self._parse_availability,
+            'additional': self._parse_additional
+        }
+        
+        unknown = [section for section in patch if section not in section_parsers]
+        if unknown:
+            raise ValueError(f"Sections inconnues: {', '.join(unknown)}")
+        
+        # Sans résultat précédent, l'analyse complète s'impose
+        if not previous:
+            parsed_data = self.parse_candidate_response(patch)
+            return parsed_data, {'added': list(dict.fromkeys(parsed_data.get('tags', []))), 'removed': []}
+        
+        # Le résultat précédent n'est pas modifié
+        parsed_data = dict(previous)
+        metadata = dict(previous.get('metadata', {}))
+        quality = dict(metadata.get('dataQuality', {}))
+        
+        changed = set()
+        for section, section_data in patch.items():
+            parsed_section = section_parsers[section](section_data)
+            if parsed_section != previous.get(section):
+                parsed_data[section] = parsed_section
+                quality[section] = self._section_quality(section, parsed_section)
+                changed.add(section)
+        
+        if not changed:
+            return previous, {'added': [], 'removed': []}
+        
+        quality['overall'] = (quality['jobPreferences'] + quality['skills'] + 
+                             quality['availability'] + quality['additional']) / 4
+        metadata['parsedDate'] = datetime.now().isoformat()
+        metadata['dataQuality'] = quality
+        parsed_data['metadata'] = metadata
+        
+        # Les incohérences ne dépendent que des préférences et des compétences
+        if changed & {'jobPreferences', 'skills'}:
+            metadata.pop('inconsistencies', None)
+            inconsistencies = self._check_data_consistency(parsed_data)
+            if inconsistencies:
+                metadata['inconsistencies'] = inconsistencies
+        
+        # Les informations complémentaires ne produisent pas de tags
+        if not changed & {'jobPreferences', 'skills', 'availability'}:
+            return parsed_data, {'added': [], 'removed': []}
+        
+        previous_tags = previous.get('tags', [])
+        parsed_data['tags'] = self._generate_matching_tags(parsed_data)
+        old_tags, new_tags = set(previous_tags), set(parsed_data['tags'])
+        tag_diff = {
+            'added': [tag for tag in dict.fromkeys(parsed_data['tags']) if tag not in old_tags],
+            'removed': [tag for tag in dict.fromkeys(previous_tags) if tag not in new_tags]
+        }
+        
+        return parsed_data, tag_diff
         
     def _parse_job_preferences(self, job_prefs: Dict[str, Any]) -> Dict[str, Any]:
         """Parse et structure les préférences professionnelles"""
@@ -259,6 +660,7 @@ class ResponseParser:
             'remotePreference': self.normalizer.correct_common_errors(job_prefs.get('remotePreference', '')),
             'salaryExpectation': self._normalize_salary(job_prefs.get('salaryExpectation', ''))
         }
+        normalized['city'], normalized['coordinates'] = self._resolve_location(job_prefs)
         
         # Structurer le résultat
         result = {
@@ -275,10 +677,24 @@ class ResponseParser:
         
         return result
     
+    def _resolve_location(self, job_prefs: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, float]]]:
+        """Ville (gazetteer) et coordonnées du lieu : locationCoordinates si fournies, sinon celles de la ville"""
+        place = (self.gazetteer.resolve(job_prefs.get('formattedLocation'))
+                 or self.gazetteer.resolve(job_prefs.get('location')))
+        coordinates = job_prefs.get('locationCoordinates')
+        if isinstance(coordinates, dict) and coordinates.get('lat') is not None and coordinates.get('lng') is not None:
+            coordinates = {'lat': coordinates['lat'], 'lng': coordinates['lng']}
+        elif place:
+            coordinates = {'lat': place['lat'], 'lng': place['lng']}
+        else:
+            coordinates = None
+        return (place['city'] if place else None), coordinates
+    
     def _normalize_salary(self, salary_text: str) -> Dict[str, Any]:
         """Normalise et structure les informations de salaire"""
         if not salary_text:
-            return {'min': None, 'max': None, 'currency': 'EUR', 'period': 'yearly'}
+            return {'min': None, 'max': None, 'currency': 'EUR', 'period': 'yearly',
+                    'annualMin': None, 'annualMax': None}
         
         # Nettoyer le texte
         salary_text = self.normalizer.clean_text(salary_text)
@@ -320,11 +736,16 @@ class ResponseParser:
                 # Si une seule valeur, considérer comme valeur minimale
                 min_salary = float(numbers[0])
         
+        # Montants annuels en euros, calculés comme convertToAnnual côté matching
+        factor = self.salary_period_factors.get(period, 1) * self.salary_currency_rates.get(currency, 1)
+        
         return {
             'min': min_salary,
             'max': max_salary,
             'currency': currency,
-            'period': period
+            'period': period,
+            'annualMin': min_salary * factor if min_salary is not None else None,
+            'annualMax': max_salary * factor if max_salary is not None else None
         }
         
     def _parse_skills(self, skills_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -341,11 +762,14 @@ class ResponseParser:
         tech_skills = skills_data.get('technicalSkills', [])
         normalized_tech_skills = []
         
+        technical_skill_ids = []
+        
         for skill in tech_skills:
-            # Normaliser chaque compétence
-            normalized_skill = self.normalizer.correct_common_errors(skill)
+            # Normaliser chaque compétence (mémorisé par variante brute)
+            skill_id, normalized_skill = self._canonical_skill(skill)
             if normalized_skill:
                 normalized_tech_skills.append(normalized_skill)
+                technical_skill_ids.append(skill_id)
         
         # Normaliser les niveaux de compétence
         skill_levels = {}
@@ -353,7 +777,7 @@ class ResponseParser:
         
         for skill, level in raw_skill_levels.items():
             # Normaliser le nom de la compétence
-            normalized_skill = self.normalizer.correct_common_errors(skill)
+            _, normalized_skill = self._canonical_skill(skill)
             # Normaliser le niveau
             normalized_level = self._normalize_skill_level(level)
             
@@ -386,6 +810,7 @@ class ResponseParser:
             'certifications': skills_data.get('certifications', []),
             'normalized': {
                 'technicalSkills': normalized_tech_skills,
+                'technicalSkillIds': technical_skill_ids,
                 'technicalSkillLevels': skill_levels,
                 'softSkills': normalized_soft_skills,
                 'languages': normalized_languages
@@ -394,107 +819,40 @@ class ResponseParser:
         
         return result
     
+    @staticmethod
+    def _canonical_skill(skill: str) -> Tuple[Optional[int], str]:
+        """Identifiant et nom canonique d'une compétence technique brute"""
+        if not isinstance(skill, str):
+            # correct_common_errors ne garde rien d'une valeur qui n'est pas du texte
+            return None, ''
+        return SKILL_REGISTRY.resolve(skill)
+    
     def _normalize_skill_level(self, level: str) -> Dict[str, Any]:
         """Normalise un niveau de compétence"""
         if not level:
             return {'level': 'Non spécifié', 'value': 0}
+        if not isinstance(level, str):
+            # clean_text ne garde rien d'une valeur qui n'est pas du texte
+            return {'level': '', 'value': 0}
         
-        # Nettoyer le texte
-        level = self.normalizer.clean_text(level)
-        
-        # Mapper le niveau à une valeur numérique
-        level_map = {
-            'débutant': {'level': 'Débutant', 'value': 1},
-            'notions': {'level': 'Débutant', 'value': 1},
-            'basique': {'level': 'Débutant', 'value': 1},
-            'basic': {'level': 'Débutant', 'value': 1},
-            'intermédiaire': {'level': 'Intermédiaire', 'value': 2},
-            'intermediaire': {'level': 'Intermédiaire', 'value': 2},
-            'avancé': {'level': 'Avancé', 'value': 3},
-            'avance': {'level': 'Avancé', 'value': 3},
-            'confirmé': {'level': 'Avancé', 'value': 3},
-            'confirme': {'level': 'Avancé', 'value': 3},
-            'expert': {'level': 'Expert', 'value': 4},
-            'maître': {'level': 'Expert', 'value': 4},
-            'maitre': {'level': 'Expert', 'value': 4}
-        }
-        
-        # Rechercher dans les correspondances
-        for key, val in level_map.items():
-            if key in level:
-                return val
-        
-        # Valeur par défaut
-        return {'level': level.capitalize(), 'value': 0}
+        # Copie : le résultat mémorisé est partagé entre les candidats
+        return dict(_skill_level(level))
     
     def _parse_language(self, language: str) -> Dict[str, Any]:
         """Parse et structure une compétence linguistique"""
         if not language:
             return None
+        if not isinstance(language, str):
+            return {'language': '', 'level': 'Non spécifié', 'value': 0, 'cefr': None}
         
-        # Nettoyer le texte
-        lang_text = self.normalizer.clean_text(language)
-        
-        # Extraire le niveau si présent (ex: "Anglais - B2" ou "Anglais (courant)")
-        level_pattern = r'(.*?)[\s-]+\(?([A-C][1-2]|débutant|intermédiaire|avancé|courant|bilingue|natif)\)?'
-        match = re.match(level_pattern, lang_text, re.IGNORECASE)
-        
-        if match:
-            lang_name = match.group(1).strip()
-            level_text = match.group(2).lower()
-            
-            # Normaliser le niveau
-            level = self._normalize_language_level(level_text)
-            
-            return {
-                'language': lang_name.capitalize(),
-                'level': level['level'],
-                'value': level['value'],
-                'cefr': level.get('cefr')
-            }
-        else:
-            # Si pas de niveau spécifié
-            return {
-                'language': lang_text.capitalize(),
-                'level': 'Non spécifié',
-                'value': 0,
-                'cefr': None
-            }
+        return dict(_language(language))
     
     def _normalize_language_level(self, level: str) -> Dict[str, Any]:
         """Normalise un niveau de langue"""
         if not level:
             return {'level': 'Non spécifié', 'value': 0}
         
-        # Nettoyer le texte
-        level = level.lower().strip()
-        
-        # Mapper le niveau à une valeur normalisée
-        level_map = {
-            'a1': {'level': 'Débutant', 'value': 1, 'cefr': 'A1'},
-            'a2': {'level': 'Élémentaire', 'value': 2, 'cefr': 'A2'},
-            'b1': {'level': 'Intermédiaire', 'value': 3, 'cefr': 'B1'},
-            'b2': {'level': 'Avancé', 'value': 4, 'cefr': 'B2'},
-            'c1': {'level': 'Autonome', 'value': 5, 'cefr': 'C1'},
-            'c2': {'level': 'Maîtrise', 'value': 6, 'cefr': 'C2'},
-            'débutant': {'level': 'Débutant', 'value': 1, 'cefr': 'A1'},
-            'elementaire': {'level': 'Élémentaire', 'value': 2, 'cefr': 'A2'},
-            'intermédiaire': {'level': 'Intermédiaire', 'value': 3, 'cefr': 'B1'},
-            'intermediaire': {'level': 'Intermédiaire', 'value': 3, 'cefr': 'B1'},
-            'avancé': {'level': 'Avancé', 'value': 4, 'cefr': 'B2'},
-            'avance': {'level': 'Avancé', 'value': 4, 'cefr': 'B2'},
-            'courant': {'level': 'Autonome', 'value': 5, 'cefr': 'C1'},
-            'bilingue': {'level': 'Maîtrise', 'value': 6, 'cefr': 'C2'},
-            'natif': {'level': 'Langue maternelle', 'value': 7, 'cefr': 'Native'}
-        }
-        
-        # Rechercher dans les correspondances
-        for key, val in level_map.items():
-            if key in level:
-                return val
-        
-        # Valeur par défaut
-        return {'level': level.capitalize(), 'value': 0}
+        return dict(_language_level(level.lower().strip()))
     
     def _parse_availability(self, availability_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse et structure les informations de disponibilité"""
@@ -582,6 +940,12 @@ class ResponseParser:
                     'strengths': strengths_terms,
                     'challenges': challenges_terms
                 },
+                # Vecteurs creux (espace haché commun) pour la recherche par similarité
+                'termVectors': {
+                    'motivation': term_vector(motivation_terms),
+                    'strengths': term_vector(strengths_terms),
+                    'challenges': term_vector(challenges_terms)
+                },
                 'priorities': self._normalize_priorities(additional_data.get('priorities', {}))
             }
         }
@@ -611,45 +975,12 @@ class ResponseParser:
     def _calculate_data_quality(self, job_prefs: Dict, skills: Dict, 
                                availability: Dict, additional: Dict) -> Dict[str, float]:
         """Calcule la qualité des données pour chaque section"""
-        quality = {}
-        
-        # Calculer la qualité des préférences professionnelles
-        if job_prefs:
-            # Vérifier le remplissage des champs clés
-            job_prefs_fields = ['preferredRole', 'contractType', 'location', 'remotePreference', 'salaryExpectation']
-            filled_fields = sum(1 for field in job_prefs_fields if job_prefs.get(field))
-            quality['jobPreferences'] = min(filled_fields / len(job_prefs_fields), 1.0)
-        else:
-            quality['jobPreferences'] = 0.0
-        
-        # Calculer la qualité des compétences
-        if skills:
-            has_technical = bool(skills.get('technicalSkills'))
-            has_soft = bool(skills.get('softSkills'))
-            has_languages = bool(skills.get('languages'))
-            
-            quality['skills'] = (has_technical + has_soft + has_languages) / 3
-        else:
-            quality['skills'] = 0.0
-        
-        # Calculer la qualité des informations de disponibilité
-        if availability:
-            has_employment_status = bool(availability.get('currentlyEmployed'))
-            has_interview_availability = bool(availability.get('interviewAvailability'))
-            has_reason = bool(availability.get('jobSearchReason') or availability.get('jobEndReason'))
-            
-            quality['availability'] = (has_employment_status + has_interview_availability + has_reason) / 3
-        else:
-            quality['availability'] = 0.0
-        
-        # Calculer la qualité des informations complémentaires
-        if additional:
-            has_motivation = bool(additional.get('motivation'))
-            has_strengths = bool(additional.get('strengths'))
-            
-            quality['additional'] = (has_motivation + has_strengths) / 2
-        else:
-            quality['additional'] = 0.0
+        quality = {
+            'jobPreferences': self._section_quality('jobPreferences', job_prefs),
+            'skills': self._section_quality('skills', skills),
+            'availability': self._section_quality('availability', availability),
+            'additional': self._section_quality('additional', additional)
+        }
         
         # Qualité globale
         quality['overall'] = (quality['jobPreferences'] + quality['skills'] + 
@@ -657,55 +988,42 @@ class ResponseParser:
         
         return quality
     
-    def _check_data_consistency(self, parsed_data: Dict) -> List[Dict[str, str]]:
-        """Vérifie la cohérence des données"""
-        inconsistencies = []
+    def _section_quality(self, section: str, data: Dict) -> float:
+        """Calcule la qualité des données d'une section parsée"""
+        if not data:
+            return 0.0
         
-        # Vérifier la cohérence entre l'expérience et le niveau
-        if parsed_data.get('jobPreferences') and parsed_data.get('skills'):
-            pref_role = parsed_data['jobPreferences'].get('preferredRole', '')
-            tech_skills = parsed_data['skills'].get('technicalSkills', [])
+        # Qualité des préférences professionnelles : remplissage des champs clés
+        if section == 'jobPreferences':
+            job_prefs_fields = ['preferredRole', 'contractType', 'location', 'remotePreference', 'salaryExpectation']
+            filled_fields = sum(1 for field in job_prefs_fields if data.get(field))
+            return min(filled_fields / len(job_prefs_fields), 1.0)
+        
+        # Qualité des compétences
+        if section == 'skills':
+            has_technical = bool(data.get('technicalSkills'))
+            has_soft = bool(data.get('softSkills'))
+            has_languages = bool(data.get('languages'))
             
-            # Vérifier si le poste demandé est cohérent avec les compétences
-            if pref_role and tech_skills:
-                skills_text = ' '.join(tech_skills).lower()
-                role_lower = pref_role.lower()
-                
-                # Incohérence entre poste frontend et compétences backend
-                if ('frontend' in role_lower or 'front-end' in role_lower) and not any(s.lower() in skills_text for s in ['html', 'css', 'javascript', 'react', 'vue', 'angular']):
-                    inconsistencies.append({
-                        'type': 'skill_mismatch',
-                        'message': 'Le poste recherché (Frontend) ne correspond pas aux compétences déclarées'
-                    })
-                
-                # Incohérence entre poste backend et compétences frontend
-                if ('backend' in role_lower or 'back-end' in role_lower) and not any(s.lower() in skills_text for s in ['python', 'java', 'c#', 'nodejs', 'php', 'sql', 'mongo']):
-                    inconsistencies.append({
-                        'type': 'skill_mismatch',
-                        'message': 'Le poste recherché (Backend) ne correspond pas aux compétences déclarées'
-                    })
-        
-        # Vérifier la cohérence entre le niveau d'expérience et le salaire
-        # (Logique simplifiée, à adapter selon les besoins réels)
-        skill_levels = parsed_data.get('skills', {}).get('normalized', {}).get('technicalSkillLevels', {})
-        salary_info = parsed_data.get('jobPreferences', {}).get('normalized', {}).get('salaryExpectation', {})
-        
-        if skill_levels and salary_info and salary_info.get('min'):
-            # Calculer le niveau moyen
-            avg_level = 0
-            if skill_levels:
-                level_values = [level.get('value', 0) for level in skill_levels.values()]
-                if level_values:
-                    avg_level = sum(level_values) / len(level_values)
+            return (has_technical + has_soft + has_languages) / 3
+        
+        # Qualité des informations de disponibilité
+        if section == 'availability':
+            has_employment_status = bool(data.get('currentlyEmployed'))
+            has_interview_availability = bool(data.get('interviewAvailability'))
+            has_reason = bool(data.get('jobSearchReason') or data.get('jobEndReason'))
             
-            # Vérifier si le niveau de débutant demande un salaire trop élevé
-            if avg_level <= 1.5 and salary_info.get('min', 0) > 50000:
-                inconsistencies.append({
-                    'type': 'salary_experience_mismatch',
-                    'message': 'Le niveau d\'expérience (Débutant) semble incohérent avec les prétentions salariales'
-                })
+            return (has_employment_status + has_interview_availability + has_reason) / 3
+        
+        # Qualité des informations complémentaires
+        has_motivation = bool(data.get('motivation'))
+        has_strengths = bool(data.get('strengths'))
         
-        return inconsistencies
+        return (has_motivation + has_strengths) / 2
+    
+    def _check_data_consistency(self, parsed_data: Dict) -> List[Dict[str, str]]:
+        """Vérifie la cohérence des données (règles déclarées dans consistency_rules.py)"""
+        return self.consistency_rules.check(parsed_data)
     
     def _generate_matching_tags(self, parsed_data: Dict) -> List[str]:
         """Génère des tags pour faciliter le matching avec les offres"""
@@ -731,9 +1049,10 @@ class ResponseParser:
         if parsed_data.get('skills'):
             skills = parsed_data['skills']
             
-            # Compétences techniques
+            # Compétences techniques (une valeur qui n'est pas du texte ne donne pas de tag)
             for skill in skills.get('technicalSkills', []):
-                tags.append(f"skill:{skill.lower()}")
+                if isinstance(skill, str):
+                    tags.append(SKILL_REGISTRY.tag(skill))
             
             # Langues
             for lang in skills.get('languages', []):
@@ -788,6 +1107,11 @@ class ResponseValidator:
         
         return result
     
+    def validate_batch(self, candidates: Iterable[Dict[str, Any]]):
+        """Valide un lot de candidats par colonnes (NumPy) : masques par règle, comptes, messages à la demande"""
+        from batch_validation import BatchValidation
+        return BatchValidation.from_candidates(candidates)
+    
     def _validate_job_preferences(self, job_prefs: Dict[str, Any], 
                                  errors: List[str], warnings: List[str], suggestions: List[str]):
         """Valide les préférences professionnelles"""
@@ -850,9 +1174,28 @@ class ResponseValidator:
 class CandidateDataProcessor:
     """Classe principale pour traiter les données des candidats"""
     
-    def __init__(self):
-        self.parser = ResponseParser()
+    # Représentation des données d'origine dans le résultat :
+    # - full : copie complète du candidat
+    # - omit : absentes du résultat
+    # - reference : le candidat sans son questionnaire (identifiants et métadonnées de l'export)
+    ORIGINAL_DATA_MODES = ('full', 'omit', 'reference')
+    
+    def __init__(self, execution: str = 'sequential', cache=None, original_data: str = 'full',
+                 instrument: bool = False):
+        if original_data not in self.ORIGINAL_DATA_MODES:
+            raise ValueError(f"Mode originalData inconnu: {original_data}")
+        
+        self.parser = ResponseParser(execution=execution, instrument=instrument)
         self.validator = ResponseValidator()
+        # Cache optionnel des résultats (voir result_cache.ResultCache)
+        self.cache = cache
+        self.original_data = original_data
+        
+        # Les mesures de chaque candidat alimentent les histogrammes du processus
+        self.metrics = None
+        if instrument:
+            from instrumentation import PARSER_METRICS
+            self.metrics = PARSER_METRICS
     
     def process_candidate_data(self, candidate_data: Dict[str, Any]) -> Dict[str, Any]:
         """Traite les données d'un candidat"""
@@ -862,90 +1205,503 @@ class CandidateDataProcessor:
         # Extraire les données du questionnaire
         questionnaire_data = candidate_data.get('questionnaire', {})
         
+        # Un questionnaire identique à un questionnaire déjà traité n'est pas réanalysé
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key_for(questionnaire_data)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._build_result(candidate_data, cached['parsedData'], cached['validation'])
+        
         # Analyser les données
         parsed_data = self.parser.parse_candidate_response(questionnaire_data)
         
         # Valider les données
-        validation_result = self.validator.validate_responses(parsed_data)
+        timings = parsed_data.get('metadata', {}).get('timings') if self.metrics is not None else None
+        validation_result = _timed(timings, 'validation', self.validator.validate_responses, parsed_data)
+        
+        if timings is not None:
+            timings['total'] += timings['stages']['validation']
+            self.metrics.record(timings)
+        
+        if cache_key is not None:
+            # Les mesures concernent ce traitement-ci : elles ne sont pas mises en cache
+            cached_data = parsed_data
+            if timings is not None:
+                metadata = {key: value for key, value in parsed_data['metadata'].items() if key != 'timings'}
+                cached_data = dict(parsed_data, metadata=metadata)
+            self.cache.set(cache_key, {'parsedData': cached_data, 'validation': validation_result})
+        
+        return self._build_result(candidate_data, parsed_data, validation_result)
+    
+    def _build_result(self, candidate_data: Dict[str, Any], parsed_data: Dict[str, Any],
+                      validation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine les résultats selon le mode originalData"""
+        result = {}
+        if self.original_data == 'full':
+            result['originalData'] = candidate_data
+        elif self.original_data == 'reference':
+            result['originalData'] = {key: value for key, value in candidate_data.items() if key != 'questionnaire'}
+        
+        result['parsedData'] = parsed_data
+        result['validation'] = validation_result
         
-        # Combiner les résultats
-        result = {
-            'originalData': candidate_data,
+        return result
+    
+    def reprocess_candidate_data(self, previous_result: Dict[str, Any],
+                                 patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Met à jour le résultat d'un candidat après modification de certaines sections du questionnaire"""
+        parsed_data, tag_diff = self.parser.reparse_candidate_response(previous_result.get('parsedData', {}), patch)
+        
+        # Les données d'origine reflètent le questionnaire modifié
+        original_data = dict(previous_result.get('originalData') or {})
+        original_data['questionnaire'] = dict(original_data.get('questionnaire') or {}, **patch)
+        
+        return {
+            'originalData': original_data,
             'parsedData': parsed_data,
-            'validation': validation_result
+            'validation': self.validator.validate_responses(parsed_data),
+            'tagDiff': tag_diff
         }
-        
-        return result
 
 
 # Fonction pour traiter les données candidat et les retourner au format JSON
-def process_candidate(data_json):
-    """Traite les données JSON d'un candidat et retourne le résultat"""
+def process_candidate(data_json, profile: str = 'default'):
+    """Traite les données JSON d'un candidat et retourne le résultat (profil de sortie : voir OUTPUT_PROFILES)"""
+    # Sérialiseur du profil par défaut pour le message d'erreur d'un profil inconnu
+    serializer = get_serializer('json')
     try:
+        serializer, original_data = output_profile(profile)
+        
         # Parser les données JSON
         data = json.loads(data_json)
         
         # Initialiser le processeur
-        processor = CandidateDataProcessor()
+        processor = CandidateDataProcessor(original_data=original_data)
         
         # Traiter les données
         result = processor.process_candidate_data(data)
         
         # Retourner le résultat au format JSON
-        return json.dumps(result, ensure_ascii=False)
+        return serializer.dumps(result)
     except Exception as e:
         # En cas d'erreur, retourner un message d'erreur
-        return json.dumps({
+        return serializer.dumps({
             'error': f"Erreur lors du traitement des données: {str(e)}"
-        }, ensure_ascii=False)
+        })
 
 
-# Point d'entrée pour les tests
-if __name__ == "__main__":
-    # Données d'exemple
-    example_data = {
-        "questionnaire": {
-            "jobPreferences": {
-                "preferredRole": "Développeur Frontend",
-                "contractType": "CDI",
-                "location": "Paris",
-                "remotePreference": "Hybride",
-                "salaryExpectation": "45-50k",
-                "startDate": "2025-04-01"
-            },
-            "skills": {
-                "technicalSkills": ["JavaScript", "React", "TypeScript", "HTML", "CSS"],
-                "technicalSkillLevels": {
-                    "JavaScript": "avancé", 
-                    "React": "intermédiaire", 
-                    "TypeScript": "débutant"
-                },
-                "softSkills": ["Communication", "Travail d'équipe", "Autonomie"],
-                "languages": ["Français (natif)", "Anglais (B2)"],
-                "certifications": ["AWS Certified Developer"]
-            },
-            "availability": {
-                "currentlyEmployed": "oui",
-                "jobSearchReason": "Manque de perspectives d'évolutions",
-                "noticePeriod": "2_mois",
-                "noticeNegotiable": "oui",
-                "recruitmentStatus": "entretiens",
-                "interviewAvailability": "Soirs et weekends",
-                "relocateWilling": False
+# Lecture en flux : un export JSON (tableau) ou JSON Lines n'est jamais chargé entièrement en mémoire
+def iter_json_records(stream, read_size: int = 1 << 16) -> Iterator[Union[str, Dict[str, Any]]]:
+    """Énumère les candidats d'un flux texte au format JSON Lines ou tableau JSON
+    
+    Les lignes JSON Lines sont retournées brutes (décodées par le processus qui les traite) ;
+    les éléments d'un tableau JSON sont décodés un à un avec JSONDecoder.raw_decode.
+    """
+    buffer = stream.read(read_size)
+    while buffer and not buffer.strip():
+        buffer = stream.read(read_size)
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+    
+    if buffer[0] != '[':
+        # JSON Lines : lecture ligne par ligne en reprenant ce qui a déjà été lu
+        for line in _iter_lines(buffer, stream, read_size):
+            if line.strip():
+                yield line
+        return
+    
+    decoder = json.JSONDecoder()
+    buffer = buffer[1:]
+    position = 0
+    eof = False
+    expect_separator = False
+    after_separator = False
+    
+    while True:
+        # Sauter les blancs et les séparateurs entre éléments
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer, position = stream.read(read_size), 0
+            eof = not buffer
+        
+        if position == len(buffer):
+            raise ValueError("Tableau JSON incomplet")
+        
+        char = buffer[position]
+        if char == ']':
+            # Virgule finale ("[1,]") : même erreur que json.loads
+            if after_separator:
+                raise json.JSONDecodeError("Expecting value", buffer, position)
+            return
+        if expect_separator:
+            if char != ',':
+                raise ValueError(f"Séparateur attendu dans le tableau JSON, trouvé {char!r}")
+            position += 1
+            expect_separator = False
+            after_separator = True
+            continue
+        
+        # Décoder l'élément suivant ; s'il est coupé, lire davantage (taille doublée pour rester linéaire)
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+                # Un objet ou un tableau se termine sans ambiguïté ; un scalaire (nombre)
+                # peut être tronqué par la fin du tampon : attendre un délimiteur
+                if isinstance(record, (dict, list)) or eof or (end < len(buffer) and buffer[end] in ' \t\r\n,]'):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            buffer = buffer[position:]
+            position = 0
+            chunk = stream.read(max(read_size, len(buffer)))
+            eof = not chunk
+            buffer += chunk
+        
+        yield record
+        position = end
+        expect_separator = True
+        after_separator = False
+        
+        # Libérer la partie déjà décodée du tampon
+        if position >= read_size:
+            buffer, position = buffer[position:], 0
+
+
+def _iter_lines(pending: str, stream, read_size: int) -> Iterator[str]:
+    """Découpe en lignes un début de flux déjà lu suivi du reste du flux"""
+    while True:
+        lines = pending.split('\n')
+        pending = lines.pop()
+        yield from lines
+        chunk = stream.read(read_size)
+        if not chunk:
+            break
+        pending += chunk
+    if pending:
+        yield pending
+
+
+# Traitement par lots : chaque processus du pool garde son propre processeur
+_batch_processor = None
+
+
+def _init_batch_processor(original_data: str = 'full', instrument: bool = False) -> None:
+    """Initialise le processeur du processus courant pour le traitement par lots"""
+    global _batch_processor
+    _batch_processor = CandidateDataProcessor(original_data=original_data, instrument=instrument)
+
+
+def _process_batch_record(record: Tuple[int, Union[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Traite un enregistrement du lot ; une erreur est rapportée dans le résultat de cet enregistrement"""
+    if _batch_processor is None:
+        _init_batch_processor()
+    
+    index, candidate = record
+    try:
+        if isinstance(candidate, (str, bytes)):
+            candidate = json.loads(candidate)
+        if not isinstance(candidate, dict):
+            raise ValueError("l'enregistrement doit être un objet JSON")
+        return _batch_processor.process_candidate_data(candidate)
+    except Exception as e:
+        return {
+            'index': index,
+            'error': f"Erreur lors du traitement des données: {str(e)}"
+        }
+
+
+def process_candidates(candidates: Iterable[Union[str, Dict[str, Any]]], chunk_size: int = 32,
+                       max_workers: Optional[int] = None, original_data: str = 'full',
+                       instrument: bool = False) -> Iterator[Dict[str, Any]]:
+    """Traite un flux de candidats (dicts ou chaînes JSON) et retourne les résultats dans l'ordre d'entrée"""
+    # Vérifié avant le premier résultat : une fenêtre vide terminerait le lot sans aucune sortie
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size doit être supérieur ou égal à 1 (reçu : {chunk_size})")
+    return _iter_processed_candidates(enumerate(candidates), chunk_size, max_workers, original_data, instrument)
+
+
+def _iter_processed_candidates(records: Iterator[Tuple[int, Any]], chunk_size: int, max_workers: Optional[int],
+                               original_data: str, instrument: bool) -> Iterator[Dict[str, Any]]:
+    """Résultats de process_candidates, une fois les paramètres vérifiés"""
+    # Un seul worker : traitement dans le processus courant, sans pool
+    if max_workers == 1:
+        _init_batch_processor(original_data, instrument)
+        for record in records:
+            yield _process_batch_record(record)
+        return
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_processor,
+                                                initargs=(original_data, instrument)) as executor:
+        # Soumettre le flux par fenêtres pour ne pas le charger entièrement en mémoire
+        window_size = chunk_size * max_workers * 2
+        while True:
+            window = list(islice(records, window_size))
+            if not window:
+                break
+            yield from executor.map(_process_batch_record, window, chunksize=chunk_size)
+
+
+def run_batch(input_stream, output_stream, chunk_size: int = 32, max_workers: Optional[int] = None,
+              original_data: str = 'full', instrument: bool = False, serializer: str = 'json') -> None:
+    """Lit des candidats (JSON Lines ou tableau JSON) en flux et écrit un résultat JSON par ligne"""
+    records = iter_json_records(input_stream)
+    dumps = get_serializer(serializer).dumps
+    
+    for result in process_candidates(records, chunk_size=chunk_size, max_workers=max_workers,
+                                     original_data=original_data, instrument=instrument):
+        output_stream.write(dumps(result) + '\n')
+
+
+# Mode worker résident : un processus pré-chargé traite une suite de requêtes
+def handle_worker_request(request: Dict[str, Any], processor: CandidateDataProcessor) -> Dict[str, Any]:
+    """Traite une requête du protocole worker et retourne la réponse associée à son id"""
+    request_id = request.get('id')
+    request_type = request.get('type', 'process')
+    
+    # Vérification de santé envoyée par le pool
+    if request_type == 'ping':
+        response = {'id': request_id, 'type': 'pong', 'pid': os.getpid()}
+        if processor.cache is not None:
+            response['cache'] = processor.cache.stats()
+        return response
+    
+    # Agrégats de l'instrumentation (vides si le worker n'est pas instrumenté)
+    if request_type == 'metrics':
+        from instrumentation import PARSER_METRICS
+        return {'id': request_id, 'type': 'metrics', 'metrics': PARSER_METRICS.snapshot()}
+    
+    if request_type != 'process':
+        return {'id': request_id, 'error': f"Type de requête inconnu: {request_type}"}
+    
+    try:
+        return {'id': request_id, 'result': processor.process_candidate_data(request.get('data'))}
+    except Exception as e:
+        return {'id': request_id, 'error': f"Erreur lors du traitement des données: {str(e)}"}
+
+
+def _worker_response(payload: Union[str, bytes], loads, processor: CandidateDataProcessor) -> Dict[str, Any]:
+    """Décode une requête du worker et retourne sa réponse"""
+    try:
+        request = loads(payload)
+        if not isinstance(request, dict):
+            raise ValueError("la requête doit être un objet JSON")
+    except ValueError as e:
+        return {'id': None, 'error': f"Requête invalide: {str(e)}"}
+    return handle_worker_request(request, processor)
+
+
+def run_worker(input_stream=None, output_stream=None, cache=None, original_data: str = 'full',
+               instrument: bool = False, serializer: str = 'json', framing: str = 'lines') -> None:
+    """Boucle du worker : lit des requêtes et écrit une réponse par requête
+    
+    framing='lines' : un message texte par ligne (JSON) ;
+    framing='frames' : trames binaires préfixées par leur longueur (MessagePack par exemple),
+    sur les flux binaires sous-jacents.
+    """
+    codec = get_serializer(serializer)
+    
+    # Le processeur est initialisé une seule fois pour toute la durée de vie du worker
+    processor = CandidateDataProcessor(cache=cache, original_data=original_data, instrument=instrument)
+    
+    if framing == 'frames':
+        input_stream = input_stream or sys.stdin.buffer
+        output_stream = output_stream or sys.stdout.buffer
+        while True:
+            payload = read_frame(input_stream)
+            if payload is None:
+                break
+            write_frame(output_stream, codec.dumpb(_worker_response(payload, codec.loads, processor)))
+            output_stream.flush()
+        return
+    
+    if framing != 'lines':
+        raise ValueError(f"Découpage inconnu: {framing}")
+    
+    input_stream = input_stream or sys.stdin
+    output_stream = output_stream or sys.stdout
+    
+    for line in input_stream:
+        line = line.strip()
+        if not line:
+            continue
+        
+        response = _worker_response(line, codec.loads, processor)
+        
+        # Le JSON échappe les retours à la ligne : une réponse tient toujours sur une ligne
+        output_stream.write(codec.dumps(response) + '\n')
+        output_stream.flush()
+
+
+# Données d'exemple (utilisées pour les tests manuels et les benchmarks)
+EXAMPLE_DATA = {
+    "questionnaire": {
+        "jobPreferences": {
+            "preferredRole": "Développeur Frontend",
+            "contractType": "CDI",
+            "location": "Paris",
+            "remotePreference": "Hybride",
+            "salaryExpectation": "45-50k",
+            "startDate": "2025-04-01"
+        },
+        "skills": {
+            "technicalSkills": ["JavaScript", "React", "TypeScript", "HTML", "CSS"],
+            "technicalSkillLevels": {
+                "JavaScript": "avancé", 
+                "React": "intermédiaire", 
+                "TypeScript": "débutant"
             },
-            "additional": {
-                "motivation": "Je cherche un environnement plus stimulant où je pourrai développer mes compétences.",
-                "strengths": "Grande capacité d'apprentissage et autonomie dans la résolution de problèmes.",
-                "challenges": "J'ai dû reprendre un projet complexe avec peu de documentation et le livrer dans des délais serrés.",
-                "priorities": {
-                    "Salaire et avantages": 2,
-                    "Ambiance de travail": 1,
-                    "Perspectives d'évolution": 3
-                }
+            "softSkills": ["Communication", "Travail d'équipe", "Autonomie"],
+            "languages": ["Français (natif)", "Anglais (B2)"],
+            "certifications": ["AWS Certified Developer"]
+        },
+        "availability": {
+            "currentlyEmployed": "oui",
+            "jobSearchReason": "Manque de perspectives d'évolutions",
+            "noticePeriod": "2_mois",
+            "noticeNegotiable": "oui",
+            "recruitmentStatus": "entretiens",
+            "interviewAvailability": "Soirs et weekends",
+            "relocateWilling": False
+        },
+        "additional": {
+            "motivation": "Je cherche un environnement plus stimulant où je pourrai développer mes compétences.",
+            "strengths": "Grande capacité d'apprentissage et autonomie dans la résolution de problèmes.",
+            "challenges": "J'ai dû reprendre un projet complexe avec peu de documentation et le livrer dans des délais serrés.",
+            "priorities": {
+                "Salaire et avantages": 2,
+                "Ambiance de travail": 1,
+                "Perspectives d'évolution": 3
             }
         }
     }
+}
+
+
+def run_example(profile: str = 'default') -> None:
+    """Traite le candidat d'exemple et affiche le résultat"""
+    result = process_candidate(json.dumps(EXAMPLE_DATA), profile)
+    print(result)
+
+
+def _positive_int(value: str) -> int:
+    """Type argparse : entier strictement positif"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"doit être un entier supérieur ou égal à 1 : {value}")
+    return number
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Point d'entrée en ligne de commande"""
+    arg_parser = argparse.ArgumentParser(description="Parser des réponses candidats")
+    arg_parser.add_argument('--worker', action='store_true',
+                            help="mode worker résident : requêtes JSON ligne par ligne sur stdin")
+    arg_parser.add_argument('--batch', action='store_true',
+                            help="mode lot : candidats au format JSON Lines en entrée et en sortie")
+    arg_parser.add_argument('--serve', action='store_true',
+                            help="mode service HTTP (asyncio) : mêmes routes que server.js, analyse dans un pool de processus")
+    arg_parser.add_argument('--host', default='127.0.0.1', help="mode service : adresse d'écoute")
+    arg_parser.add_argument('--port', type=int, default=8000, help="mode service : port d'écoute")
+    arg_parser.add_argument('--max-pending', type=int, default=None,
+                            help="mode service : tâches en cours au-delà desquelles les requêtes sont refusées (503)")
+    arg_parser.add_argument('--max-body-mb', type=float, default=10,
+                            help="mode service : taille maximale d'une requête, en Mo (413 au-delà)")
+    arg_parser.add_argument('--max-batch', type=int, default=1000,
+                            help="mode service : nombre maximal de candidats par requête de lot")
+    arg_parser.add_argument('--input', default='-',
+                            help="fichier JSON Lines ou tableau JSON à traiter en mode lot (stdin par défaut)")
+    arg_parser.add_argument('--output', default='-',
+                            help="fichier de sortie du mode lot (stdout par défaut)")
+    arg_parser.add_argument('--chunk-size', type=_positive_int, default=32,
+                            help="nombre d'enregistrements envoyés à la fois à chaque processus")
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help="nombre de processus des modes lot et service (nombre de CPU par défaut)")
+    arg_parser.add_argument('--profile', choices=list(OUTPUT_PROFILES), default='default',
+                            help="profil de sortie : JSON standard, JSON rapide (orjson/msgspec) ou allégé sans copie du questionnaire")
+    arg_parser.add_argument('--serializer', choices=list(SERIALIZERS), default=None,
+                            help="sérialiseur des résultats (celui du profil par défaut) ; msgpack n'est possible qu'avec --framing frames")
+    arg_parser.add_argument('--framing', choices=('lines', 'frames'), default='lines',
+                            help="mode worker : un message par ligne ou trames binaires préfixées par leur longueur")
+    arg_parser.add_argument('--original-data', choices=CandidateDataProcessor.ORIGINAL_DATA_MODES, default=None,
+                            help="données d'origine dans les résultats : copie complète, omises ou référence sans questionnaire (selon le profil par défaut)")
+    arg_parser.add_argument('--instrument', action='store_true',
+                            help="ajoute les durées par étape dans metadata.timings et agrège les histogrammes")
+    arg_parser.add_argument('--cache-entries', type=int, default=0,
+                            help="modes worker et service : nombre de résultats gardés en cache par processus (0 = pas de cache)")
+    arg_parser.add_argument('--cache-max-mb', type=float, default=64,
+                            help="modes worker et service : taille maximale du cache en mémoire, en Mo")
+    arg_parser.add_argument('--cache-ttl', type=float, default=None,
+                            help="modes worker et service : durée de vie d'une entrée du cache, en secondes")
+    arg_parser.add_argument('--cache-path', default=None,
+                            help="modes worker et service : fichier sqlite du cache persistant")
+    arg_parser.add_argument('--cache-disk-entries', type=int, default=100000,
+                            help="modes worker et service : nombre maximal d'entrées du cache persistant")
+    arg_parser.add_argument('--cache-disk-max-mb', type=float, default=512,
+                            help="modes worker et service : taille maximale du cache persistant, en Mo")
+    args = arg_parser.parse_args(argv)
     
-    # Tester le parsing
-    result = process_candidate(json.dumps(example_data))
-    print(result)
\ No newline at end of file
+    serializer, original_data = OUTPUT_PROFILES[args.profile]
+    serializer = args.serializer or serializer
+    original_data = args.original_data or original_data
+    if args.framing == 'frames' and not args.worker:
+        arg_parser.error("--framing frames n'est disponible qu'en mode worker")
+    if SERIALIZERS[serializer].binary and args.framing != 'frames':
+        arg_parser.error(f"le sérialiseur {serializer} est binaire : utiliser --worker --framing frames")
+    
+    if args.worker:
+        # Le pool Node.js échange en UTF-8 quel que soit l'environnement du processus
+        sys.stdin.reconfigure(encoding='utf-8')
+        sys.stdout.reconfigure(encoding='utf-8')
+        
+        cache = None
+        if args.cache_entries > 0:
+            from result_cache import ResultCache
+            cache = ResultCache(max_entries=args.cache_entries, max_bytes=int(args.cache_max_mb * 1024 * 1024),
+                                ttl=args.cache_ttl, path=args.cache_path, version=PARSER_VERSION,
+                                disk_max_entries=args.cache_disk_entries,
+                                disk_max_bytes=int(args.cache_disk_max_mb * 1024 * 1024))
+        
+        run_worker(cache=cache, original_data=original_data, instrument=args.instrument,
+                   serializer=serializer, framing=args.framing)
+        return
+    
+    if args.serve:
+        from http_service import serve
+        cache_options = None
+        if args.cache_entries > 0:
+            cache_options = {'max_entries': args.cache_entries, 'max_bytes': int(args.cache_max_mb * 1024 * 1024),
+                             'ttl': args.cache_ttl, 'path': args.cache_path,
+                             'disk_max_entries': args.cache_disk_entries,
+                             'disk_max_bytes': int(args.cache_disk_max_mb * 1024 * 1024)}
+        serve(args.host, args.port, workers=args.workers, max_pending=args.max_pending,
+              max_body_bytes=int(args.max_body_mb * 1024 * 1024), max_batch=args.max_batch,
+              original_data=original_data, instrument=args.instrument, cache_options=cache_options,
+              serializer=serializer)
+        return
+    
+    if args.batch:
+        input_stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+        output_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        try:
+            run_batch(input_stream, output_stream, chunk_size=args.chunk_size, max_workers=args.workers,
+                      original_data=original_data, instrument=args.instrument, serializer=serializer)
+        finally:
+            if input_stream is not sys.stdin:
+                input_stream.close()
+            if output_stream is not sys.stdout:
+                output_stream.close()
+        return
+    
+    run_example(args.profile)
+
+
+if __name__ == "__main__":
+    main()
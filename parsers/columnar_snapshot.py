@@ -0,0 +1,325 @@
+import sys
+import json
+import math
+import mmap
+import struct
+from array import array
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Hashable
+
+from compact_model import contract_type, remote_type
+
+
+# Snapshot en colonnes de la base de candidats parsés, ouvert en mmap en lecture seule :
+# tous les workers partagent les mêmes pages et l'ouverture ne décode aucun document JSON.
+#
+# Format : signature, taille de l'en-tête (<Q), en-tête JSON (description des colonnes),
+# puis les colonnes brutes, chacune alignée sur 8 octets.
+
+SNAPSHOT_MAGIC = b'CCOL1\n'
+ALIGNMENT = 8
+
+SALARY_PERIODS = ('yearly', 'monthly', 'daily', 'hourly')
+SALARY_CURRENCIES = ('EUR', 'USD', 'GBP')
+QUALITY_KEYS = ('jobPreferences', 'skills', 'availability', 'additional', 'overall')
+
+# Code des valeurs absentes dans les colonnes d'octets
+MISSING_CODE = 255
+
+
+class _StringColumn:
+    """Colonne de chaînes : décalages (Q) dans un bloc UTF-8, décodées à la demande"""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+        self._lookup = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return bytes(self._data[self._offsets[position]:self._offsets[position + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def index(self, value: str) -> Optional[int]:
+        """Position d'une chaîne (la table de recherche est construite au premier appel)"""
+        if self._lookup is None:
+            self._lookup = {string: position for position, string in enumerate(self)}
+        return self._lookup.get(value)
+
+
+class _Vocabulary:
+    """Attribue un numéro à chaque chaîne distincte, dans l'ordre d'apparition"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        identifier = self.ids.get(value)
+        if identifier is None:
+            identifier = self.ids[value] = len(self.ids)
+        return identifier
+
+
+def _string_column(strings: Iterable[str]) -> Tuple[array, bytes]:
+    """Encode une suite de chaînes en (décalages, bloc UTF-8)"""
+    offsets = array('Q', [0])
+    chunks = []
+    total = 0
+    for string in strings:
+        encoded = string.encode('utf-8')
+        chunks.append(encoded)
+        total += len(encoded)
+        offsets.append(total)
+    return offsets, b''.join(chunks)
+
+
+def _coordinates(value: Any) -> Tuple[float, float]:
+    """Coordonnées {lat, lng} ou (lat, lng), NaN si absentes"""
+    if not value:
+        return math.nan, math.nan
+    if isinstance(value, dict):
+        lat, lng = value.get('lat'), value.get('lng')
+    else:
+        lat, lng = tuple(value)[:2]
+    return (float(lat) if lat is not None else math.nan,
+            float(lng) if lng is not None else math.nan)
+
+
+def _code(table: tuple, value: Any) -> int:
+    """Code d'une valeur dans une table fermée (MISSING_CODE si absente ou inconnue)"""
+    try:
+        return table.index(value)
+    except ValueError:
+        return MISSING_CODE
+
+
+def write_snapshot(path: str, candidates: Iterable[Tuple[Hashable, Dict[str, Any]]]) -> int:
+    """Écrit un snapshot en colonnes à partir de couples (id, sortie de ResponseParser) ; retourne le nombre de candidats"""
+    ids: List[str] = []
+    columns: Dict[str, array] = {
+        'salary_min': array('d'),
+        'salary_max': array('d'),
+        'salary_period': array('B'),
+        'salary_currency': array('B'),
+        'salary_annual_min': array('d'),
+        'salary_annual_max': array('d'),
+        'contract': array('B'),
+        'remote': array('B'),
+        'lat': array('d'),
+        'lng': array('d'),
+        'skill_offsets': array('I', [0]),
+        'skill_ids': array('I'),
+        'skill_levels': array('B'),
+        'tag_offsets': array('I', [0]),
+        'tag_ids': array('I')
+    }
+    for key in QUALITY_KEYS:
+        columns[f'quality_{key}'] = array('d')
+
+    skill_vocabulary = _Vocabulary()
+    tag_vocabulary = _Vocabulary()
+
+    for candidate_id, parsed_data in candidates:
+        ids.append(str(candidate_id))
+
+        # Préférences : salaire, contrat, télétravail, coordonnées
+        job_prefs = parsed_data.get('jobPreferences') or {}
+        normalized_prefs = job_prefs.get('normalized') or {}
+        salary = normalized_prefs.get('salaryExpectation') or {}
+        columns['salary_min'].append(salary['min'] if salary.get('min') is not None else math.nan)
+        columns['salary_max'].append(salary['max'] if salary.get('max') is not None else math.nan)
+        columns['salary_period'].append(_code(SALARY_PERIODS, salary.get('period')))
+        columns['salary_currency'].append(_code(SALARY_CURRENCIES, salary.get('currency')))
+        columns['salary_annual_min'].append(salary['annualMin'] if salary.get('annualMin') is not None else math.nan)
+        columns['salary_annual_max'].append(salary['annualMax'] if salary.get('annualMax') is not None else math.nan)
+        columns['contract'].append(contract_type(normalized_prefs.get('contractType')))
+        columns['remote'].append(remote_type(normalized_prefs.get('remotePreference')))
+        lat, lng = _coordinates(normalized_prefs.get('coordinates') or job_prefs.get('locationCoordinates'))
+        columns['lat'].append(lat)
+        columns['lng'].append(lng)
+
+        # Compétences techniques (liste normalisée puis compétences notées hors liste) et niveaux
+        normalized_skills = (parsed_data.get('skills') or {}).get('normalized') or {}
+        skill_levels = normalized_skills.get('technicalSkillLevels') or {}
+        skills = list(dict.fromkeys(list(normalized_skills.get('technicalSkills') or []) + list(skill_levels)))
+        for skill in skills:
+            columns['skill_ids'].append(skill_vocabulary(skill))
+            level = skill_levels.get(skill)
+            columns['skill_levels'].append(level.get('value', 0) if level else 0)
+        columns['skill_offsets'].append(len(columns['skill_ids']))
+
+        for tag in dict.fromkeys(parsed_data.get('tags') or []):
+            columns['tag_ids'].append(tag_vocabulary(tag))
+        columns['tag_offsets'].append(len(columns['tag_ids']))
+
+        quality = (parsed_data.get('metadata') or {}).get('dataQuality') or {}
+        for key in QUALITY_KEYS:
+            columns[f'quality_{key}'].append(quality.get(key, math.nan))
+
+    strings = {
+        'ids': ids,
+        'skills': list(skill_vocabulary.ids),
+        'tags': list(tag_vocabulary.ids)
+    }
+
+    # Blocs à écrire : colonnes typées puis tables de chaînes (décalages + données)
+    blobs: List[Tuple[str, str, bytes]] = [(name, values.typecode, values.tobytes()) for name, values in columns.items()]
+    for name, values in strings.items():
+        offsets, data = _string_column(values)
+        blobs.append((f'{name}.offsets', 'Q', offsets.tobytes()))
+        blobs.append((f'{name}.data', 'B', data))
+
+    header = {
+        'byteorder': sys.byteorder,
+        'count': len(ids),
+        'salaryPeriods': SALARY_PERIODS,
+        'salaryCurrencies': SALARY_CURRENCIES,
+        'columns': {}
+    }
+    # Les décalages sont relatifs à la fin de l'en-tête (alignée), ce qui évite de dépendre de sa taille
+    offset = 0
+    for name, typecode, data in blobs:
+        header['columns'][name] = {'type': typecode, 'offset': offset, 'size': len(data)}
+        offset += len(data) + (-len(data) % ALIGNMENT)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    prefix_size = len(SNAPSHOT_MAGIC) + 8 + len(header_bytes)
+
+    with open(path, 'wb') as snapshot:
+        snapshot.write(SNAPSHOT_MAGIC)
+        snapshot.write(struct.pack('<Q', len(header_bytes)))
+        snapshot.write(header_bytes)
+        snapshot.write(b'\0' * (-prefix_size % ALIGNMENT))
+        for _, _, data in blobs:
+            snapshot.write(data)
+            snapshot.write(b'\0' * (-len(data) % ALIGNMENT))
+
+    return len(ids)
+
+
+class CandidateSnapshot:
+    """Snapshot en colonnes ouvert en mmap : les colonnes sont des vues sans copie sur le fichier"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as snapshot:
+            self._mmap = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(self._mmap)
+        if bytes(buffer[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+            buffer.release()
+            self._mmap.close()
+            raise ValueError(f"Snapshot de candidats invalide: {path}")
+
+        (header_size,) = struct.unpack_from('<Q', self._mmap, len(SNAPSHOT_MAGIC))
+        header_start = len(SNAPSHOT_MAGIC) + 8
+        self.header = json.loads(bytes(buffer[header_start:header_start + header_size]).decode('utf-8'))
+        data_start = header_start + header_size
+        data_start += -data_start % ALIGNMENT
+
+        # Un snapshot écrit sur une machine d'un autre boutisme est recopié, colonne par colonne
+        self._swap = self.header['byteorder'] != sys.byteorder
+        self._buffer = buffer
+        self._data_start = data_start
+        self._columns: Dict[str, Any] = {}
+
+        self.count = self.header['count']
+        self.ids = self._strings('ids')
+        self.skill_names = self._strings('skills')
+        self.tag_names = self._strings('tags')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> 'CandidateSnapshot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libère les vues et ferme le mmap (les tableaux obtenus par as_numpy doivent être libérés avant)"""
+        for view in self._columns.values():
+            view.release()
+        self._columns.clear()
+        self.ids = self.skill_names = self.tag_names = None
+        self._buffer.release()
+        self._mmap.close()
+
+    def column_names(self) -> List[str]:
+        """Noms des colonnes typées"""
+        return [name for name in self.header['columns'] if '.' not in name]
+
+    def column(self, name: str) -> memoryview:
+        """Vue typée (memoryview) d'une colonne, sans copie"""
+        view = self._columns.get(name)
+        if view is None:
+            description = self.header['columns'][name]
+            start = self._data_start + description['offset']
+            view = self._buffer[start:start + description['size']].cast(description['type'])
+            if self._swap and view.itemsize > 1:
+                values = array(description['type'], view)
+                values.byteswap()
+                view = memoryview(values)
+            self._columns[name] = view
+        return view
+
+    def as_numpy(self, name: str):
+        """Colonne sous forme de tableau NumPy en lecture seule partageant la mémoire du mmap"""
+        import numpy as np
+        return np.frombuffer(self.column(name), dtype=self.header['columns'][name]['type'])
+
+    def salary(self, position: int) -> Dict[str, Any]:
+        """Prétentions salariales d'un candidat"""
+        minimum = self.column('salary_min')[position]
+        maximum = self.column('salary_max')[position]
+        period = self.column('salary_period')[position]
+        currency = self.column('salary_currency')[position]
+        annual_min = self.column('salary_annual_min')[position]
+        annual_max = self.column('salary_annual_max')[position]
+        return {
+            'min': None if math.isnan(minimum) else minimum,
+            'max': None if math.isnan(maximum) else maximum,
+            'currency': SALARY_CURRENCIES[currency] if currency != MISSING_CODE else None,
+            'period': SALARY_PERIODS[period] if period != MISSING_CODE else None,
+            'annualMin': None if math.isnan(annual_min) else annual_min,
+            'annualMax': None if math.isnan(annual_max) else annual_max
+        }
+
+    def coordinates(self, position: int) -> Optional[Tuple[float, float]]:
+        """Coordonnées (lat, lng) d'un candidat, ou None"""
+        lat, lng = self.column('lat')[position], self.column('lng')[position]
+        if math.isnan(lat) and math.isnan(lng):
+            return None
+        return lat, lng
+
+    def skills(self, position: int) -> List[Tuple[str, int]]:
+        """Compétences techniques et niveaux d'un candidat"""
+        offsets = self.column('skill_offsets')
+        start, end = offsets[position], offsets[position + 1]
+        skill_ids = self.column('skill_ids')
+        levels = self.column('skill_levels')
+        return [(self.skill_names[skill_ids[i]], levels[i]) for i in range(start, end)]
+
+    def tags(self, position: int) -> List[str]:
+        """Tags de matching d'un candidat"""
+        offsets = self.column('tag_offsets')
+        tag_ids = self.column('tag_ids')
+        return [self.tag_names[tag_ids[i]] for i in range(offsets[position], offsets[position + 1])]
+
+    def quality(self, position: int) -> Dict[str, float]:
+        """Qualité des données d'un candidat"""
+        return {key: self.column(f'quality_{key}')[position] for key in QUALITY_KEYS}
+
+    def position(self, candidate_id: Hashable) -> Optional[int]:
+        """Position d'un candidat à partir de son id"""
+        return self.ids.index(str(candidate_id))
+
+    def _strings(self, name: str) -> _StringColumn:
+        return _StringColumn(self.column(f'{name}.offsets'), self.column(f'{name}.data'))
@@ -0,0 +1,524 @@
+import sys
+import re
+from enum import IntEnum
+from array import array
+from typing import Dict, List, Any, Optional, Tuple
+
+from skill_registry import SKILL_ID_BITS
+
+
+# Représentation compacte des candidats parsés, pour garder un grand nombre de candidats en mémoire
+# (matching, index) : classes à __slots__, chaînes internées, niveaux en petits entiers.
+# Le format JSON actuel n'est reconstruit qu'à la frontière de l'API, par to_parsed().
+
+
+class SkillLevel(IntEnum):
+    """Niveau de compétence (valeurs de ResponseParser._normalize_skill_level)"""
+    NOT_SPECIFIED = 0
+    BEGINNER = 1
+    INTERMEDIATE = 2
+    ADVANCED = 3
+    EXPERT = 4
+
+
+class CefrLevel(IntEnum):
+    """Niveau de langue (valeurs de ResponseParser._normalize_language_level)"""
+    NOT_SPECIFIED = 0
+    A1 = 1
+    A2 = 2
+    B1 = 3
+    B2 = 4
+    C1 = 5
+    C2 = 6
+    NATIVE = 7
+
+
+class ContractType(IntEnum):
+    """Type de contrat, dans l'ordre de matching_engine.CONTRACT_TYPES"""
+    CDI = 0
+    CDD = 1
+    FREELANCE = 2
+    STAGE = 3
+    ALTERNANCE = 4
+    INTERIM = 5
+
+
+class RemoteType(IntEnum):
+    """Préférence de télétravail, dans l'ordre de matching_engine.REMOTE_TYPES"""
+    FULL_REMOTE = 0
+    HYBRID = 1
+    ON_SITE = 2
+    ANY = 3
+
+
+SKILL_LEVEL_LABELS = {
+    SkillLevel.NOT_SPECIFIED: 'Non spécifié',
+    SkillLevel.BEGINNER: 'Débutant',
+    SkillLevel.INTERMEDIATE: 'Intermédiaire',
+    SkillLevel.ADVANCED: 'Avancé',
+    SkillLevel.EXPERT: 'Expert'
+}
+
+# (libellé, code CECRL) de chaque niveau de langue
+CEFR_LEVEL_LABELS = {
+    CefrLevel.NOT_SPECIFIED: ('Non spécifié', None),
+    CefrLevel.A1: ('Débutant', 'A1'),
+    CefrLevel.A2: ('Élémentaire', 'A2'),
+    CefrLevel.B1: ('Intermédiaire', 'B1'),
+    CefrLevel.B2: ('Avancé', 'B2'),
+    CefrLevel.C1: ('Autonome', 'C1'),
+    CefrLevel.C2: ('Maîtrise', 'C2'),
+    CefrLevel.NATIVE: ('Langue maternelle', 'Native')
+}
+
+# Mêmes règles que matching_engine.normalize_contract_type et normalize_remote_preference
+_CONTRACT_PATTERNS = (
+    (re.compile(r'cdi|indéterminée|indeterminee'), ContractType.CDI),
+    (re.compile(r'cdd|déterminée|determinee'), ContractType.CDD),
+    (re.compile(r'freelance|consultant|indépendant|independant'), ContractType.FREELANCE),
+    (re.compile(r'stage|intern'), ContractType.STAGE),
+    (re.compile(r'alternance|apprentissage'), ContractType.ALTERNANCE),
+    (re.compile(r'intérim|interim|temporaire'), ContractType.INTERIM)
+)
+_FULL_REMOTE = re.compile(r'100%|full|complet|total')
+_REMOTE = re.compile(r'télétravail|remote|à distance')
+_HYBRID = re.compile(r'hybride|hybrid|mixte|partiel')
+_ON_SITE = re.compile(r'sur site|on site|présentiel')
+
+
+def contract_type(text: Any) -> ContractType:
+    """Classe un type de contrat (CDI par défaut)"""
+    if not text:
+        return ContractType.CDI
+    normalized = str(text).lower().strip()
+    for pattern, value in _CONTRACT_PATTERNS:
+        if pattern.search(normalized):
+            return value
+    return ContractType.CDI
+
+
+def remote_type(text: Any) -> RemoteType:
+    """Classe une préférence de télétravail (peu importe par défaut)"""
+    if not text:
+        return RemoteType.ANY
+    normalized = str(text).lower().strip()
+    if _FULL_REMOTE.search(normalized) and _REMOTE.search(normalized):
+        return RemoteType.FULL_REMOTE
+    if _HYBRID.search(normalized):
+        return RemoteType.HYBRID
+    if _ON_SITE.search(normalized):
+        return RemoteType.ON_SITE
+    return RemoteType.ANY
+
+
+def _freeze(value: Any) -> Any:
+    """Version compacte et non modifiable d'une valeur JSON (chaînes internées, listes en tuples)"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return {_freeze(key): _freeze(item) for key, item in value.items()}
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Reconstruit une valeur JSON modifiable à partir de sa version compacte"""
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
+def _section_to_parsed(section: Any) -> Any:
+    """Reconstruit une section (classe compacte, ou dict gelé pour une forme non reconnue)"""
+    if isinstance(section, dict):
+        return _thaw(section)
+    return section.to_parsed()
+
+
+# Sections vides produites par ResponseParser
+_EMPTY_SECTIONS = {
+    'jobPreferences': {'preferredRole': None, 'contractType': None, 'location': None,
+                       'remotePreference': None, 'salaryExpectation': None, 'normalized': {}},
+    'skills': {'technicalSkills': [], 'softSkills': [], 'languages': [], 'normalized': {}},
+    'availability': {'currentlyEmployed': None, 'interviewAvailability': None, 'normalized': {}},
+    'additional': {'motivation': None, 'strengths': None, 'normalized': {}}
+}
+# Une seule instance gelée de chaque section vide, partagée par tous les candidats
+_FROZEN_EMPTY_SECTIONS = {key: _freeze(section) for key, section in _EMPTY_SECTIONS.items()}
+
+
+class CompactJobPreferences:
+    """Préférences professionnelles : champs bruts, textes normalisés internés, contrat et télétravail en enum"""
+
+    RAW_KEYS = ('preferredRole', 'contractType', 'location', 'formattedLocation', 'locationCoordinates',
+                'remotePreference', 'salaryExpectation', 'startDate')
+    NORMALIZED_KEYS = ('preferredRole', 'contractType', 'location', 'remotePreference', 'salaryExpectation',
+                       'city', 'coordinates')
+    SALARY_KEYS = ('min', 'max', 'currency', 'period', 'annualMin', 'annualMax')
+
+    __slots__ = ('raw', 'role', 'contract_text', 'location', 'remote_text', 'salary_min', 'salary_max',
+                 'salary_currency', 'salary_period', 'annual_min', 'annual_max', 'contract', 'remote',
+                 'city', 'lat', 'lng')
+
+    @classmethod
+    def matches(cls, data: Dict[str, Any]) -> bool:
+        """Vérifie que la section a exactement la forme produite par _parse_job_preferences"""
+        if tuple(data) != cls.RAW_KEYS + ('normalized',):
+            return False
+        normalized = data['normalized']
+        return (isinstance(normalized, dict) and tuple(normalized) == cls.NORMALIZED_KEYS
+                and isinstance(normalized['salaryExpectation'], dict)
+                and tuple(normalized['salaryExpectation']) == cls.SALARY_KEYS
+                and (normalized['coordinates'] is None or tuple(normalized['coordinates']) == ('lat', 'lng')))
+
+    def __init__(self, data: Dict[str, Any]):
+        normalized = data['normalized']
+        salary = normalized['salaryExpectation']
+        self.raw = tuple(_freeze(data[key]) for key in self.RAW_KEYS)
+        self.role = _freeze(normalized['preferredRole'])
+        self.contract_text = _freeze(normalized['contractType'])
+        self.location = _freeze(normalized['location'])
+        self.remote_text = _freeze(normalized['remotePreference'])
+        self.salary_min = salary['min']
+        self.salary_max = salary['max']
+        self.salary_currency = _freeze(salary['currency'])
+        self.salary_period = _freeze(salary['period'])
+        self.annual_min = salary['annualMin']
+        self.annual_max = salary['annualMax']
+        self.contract = contract_type(self.contract_text)
+        self.remote = remote_type(self.remote_text)
+        # Ville internée et coordonnées à plat (None si le lieu n'est pas résolu)
+        self.city = _freeze(normalized['city'])
+        coordinates = normalized['coordinates'] or {}
+        self.lat = coordinates.get('lat')
+        self.lng = coordinates.get('lng')
+
+    def to_parsed(self) -> Dict[str, Any]:
+        result = {key: _thaw(value) for key, value in zip(self.RAW_KEYS, self.raw)}
+        result['normalized'] = {
+            'preferredRole': self.role,
+            'contractType': self.contract_text,
+            'location': self.location,
+            'remotePreference': self.remote_text,
+            'salaryExpectation': {
+                'min': self.salary_min,
+                'max': self.salary_max,
+                'currency': self.salary_currency,
+                'period': self.salary_period,
+                'annualMin': self.annual_min,
+                'annualMax': self.annual_max
+            },
+            'city': self.city,
+            'coordinates': {'lat': self.lat, 'lng': self.lng} if self.lat is not None else None
+        }
+        return result
+
+
+class CompactSkills:
+    """Compétences : noms internés, niveaux et niveaux de langue stockés sur un octet"""
+
+    RAW_KEYS = ('technicalSkills', 'softSkills', 'languages', 'certifications')
+    NORMALIZED_KEYS = ('technicalSkills', 'technicalSkillIds', 'technicalSkillLevels', 'softSkills', 'languages')
+    LANGUAGE_KEYS = ('language', 'level', 'value', 'cefr')
+
+    __slots__ = ('raw', 'technical', 'technical_ids', 'level_skills', 'levels', 'level_labels', 'soft',
+                 'language_names', 'language_levels')
+
+    @classmethod
+    def matches(cls, data: Dict[str, Any]) -> bool:
+        """Vérifie la forme de la section et que tous les niveaux sont représentables"""
+        if tuple(data) != cls.RAW_KEYS + ('normalized',):
+            return False
+        normalized = data['normalized']
+        if not isinstance(normalized, dict) or tuple(normalized) != cls.NORMALIZED_KEYS:
+            return False
+        if not all(type(identifier) is int and 0 <= identifier < 1 << SKILL_ID_BITS
+                   for identifier in normalized['technicalSkillIds']):
+            return False
+
+        for level in normalized['technicalSkillLevels'].values():
+            if not isinstance(level, dict) or tuple(level) != ('level', 'value'):
+                return False
+            value = level['value']
+            if type(value) is not int or value not in SKILL_LEVEL_LABELS:
+                return False
+            # Seul le niveau 0 porte un libellé libre (niveau non reconnu)
+            if value and level['level'] != SKILL_LEVEL_LABELS[value]:
+                return False
+            if not isinstance(level['level'], str):
+                return False
+
+        for language in normalized['languages']:
+            if not isinstance(language, dict) or tuple(language) != cls.LANGUAGE_KEYS:
+                return False
+            value = language['value']
+            if type(value) is not int or value not in CEFR_LEVEL_LABELS:
+                return False
+            if (language['level'], language['cefr']) != CEFR_LEVEL_LABELS[value]:
+                return False
+
+        return True
+
+    def __init__(self, data: Dict[str, Any]):
+        normalized = data['normalized']
+        self.raw = tuple(_freeze(data[key]) for key in self.RAW_KEYS)
+        self.technical = _freeze(normalized['technicalSkills'])
+        self.technical_ids = array('Q', normalized['technicalSkillIds'])
+        self.soft = _freeze(normalized['softSkills'])
+
+        skill_levels = normalized['technicalSkillLevels']
+        self.level_skills = tuple(sys.intern(skill) for skill in skill_levels)
+        self.levels = bytes(level['value'] for level in skill_levels.values())
+        # Libellés libres (niveaux non reconnus) : absents dans le cas courant
+        labels = tuple(
+            _freeze(level['level']) if level['level'] != SKILL_LEVEL_LABELS[level['value']] else None
+            for level in skill_levels.values()
+        )
+        self.level_labels = labels if any(label is not None for label in labels) else None
+
+        self.language_names = tuple(_freeze(language['language']) for language in normalized['languages'])
+        self.language_levels = bytes(language['value'] for language in normalized['languages'])
+
+    def skill_levels(self) -> Dict[str, SkillLevel]:
+        """Niveau de chaque compétence technique notée"""
+        return {skill: SkillLevel(value) for skill, value in zip(self.level_skills, self.levels)}
+
+    def languages(self) -> List[Tuple[str, CefrLevel]]:
+        """Langues et niveaux"""
+        return [(name, CefrLevel(value)) for name, value in zip(self.language_names, self.language_levels)]
+
+    def to_parsed(self) -> Dict[str, Any]:
+        result = {key: _thaw(value) for key, value in zip(self.RAW_KEYS, self.raw)}
+
+        labels = self.level_labels or (None,) * len(self.levels)
+        skill_levels = {}
+        for skill, value, label in zip(self.level_skills, self.levels, labels):
+            skill_levels[skill] = {'level': label if label is not None else SKILL_LEVEL_LABELS[value],
+                                   'value': value}
+
+        languages = []
+        for name, value in zip(self.language_names, self.language_levels):
+            level, cefr = CEFR_LEVEL_LABELS[value]
+            languages.append({'language': name, 'level': level, 'value': value, 'cefr': cefr})
+
+        result['normalized'] = {
+            'technicalSkills': list(self.technical),
+            'technicalSkillIds': self.technical_ids.tolist(),
+            'technicalSkillLevels': skill_levels,
+            'softSkills': list(self.soft),
+            'languages': languages
+        }
+        return result
+
+
+class CompactAvailability:
+    """Disponibilité : valeurs brutes et normalisées en tuples internés"""
+
+    RAW_KEYS = ('currentlyEmployed', 'interviewAvailability', 'recruitmentStatus', 'relocateWilling')
+    NORMALIZED_KEYS = ('currentlyEmployed', 'jobSearchReason', 'jobEndReason', 'noticePeriod',
+                       'noticeNegotiable', 'relocateWilling')
+    # Champs ajoutés après `normalized` selon le statut d'emploi normalisé
+    STATUS_KEYS = {
+        'oui': ('jobSearchReason', 'noticePeriod', 'noticeNegotiable'),
+        'non': ('jobEndReason',)
+    }
+
+    __slots__ = ('raw', 'normalized')
+
+    @classmethod
+    def matches(cls, data: Dict[str, Any]) -> bool:
+        normalized = data.get('normalized')
+        if not isinstance(normalized, dict) or tuple(normalized) != cls.NORMALIZED_KEYS:
+            return False
+        status_keys = cls.STATUS_KEYS.get(normalized['currentlyEmployed'], ())
+        return tuple(data) == cls.RAW_KEYS + ('normalized',) + status_keys
+
+    def __init__(self, data: Dict[str, Any]):
+        normalized = data['normalized']
+        status_keys = self.STATUS_KEYS.get(normalized['currentlyEmployed'], ())
+        self.raw = tuple(_freeze(data[key]) for key in self.RAW_KEYS + status_keys)
+        self.normalized = tuple(_freeze(normalized[key]) for key in self.NORMALIZED_KEYS)
+
+    def to_parsed(self) -> Dict[str, Any]:
+        status_keys = self.STATUS_KEYS.get(self.normalized[0], ())
+        raw = dict(zip(self.RAW_KEYS + status_keys, self.raw))
+        result = {key: _thaw(raw[key]) for key in self.RAW_KEYS}
+        result['normalized'] = {key: _thaw(value) for key, value in zip(self.NORMALIZED_KEYS, self.normalized)}
+        for key in status_keys:
+            result[key] = _thaw(raw[key])
+        return result
+
+
+class CompactAdditional:
+    """Informations complémentaires : textes libres tels quels, termes clés internés"""
+
+    TEXT_KEYS = ('motivation', 'strengths', 'challenges', 'additionalInfo')
+    KEY_TERM_KEYS = ('motivation', 'strengths', 'challenges')
+
+    __slots__ = ('texts', 'priorities', 'key_terms', 'term_vectors', 'normalized_priorities')
+
+    @classmethod
+    def matches(cls, data: Dict[str, Any]) -> bool:
+        if tuple(data) != cls.TEXT_KEYS + ('priorities', 'normalized'):
+            return False
+        normalized = data['normalized']
+        if not (isinstance(normalized, dict) and tuple(normalized) == ('keyTerms', 'termVectors', 'priorities')
+                and isinstance(normalized['keyTerms'], dict)
+                and tuple(normalized['keyTerms']) == cls.KEY_TERM_KEYS
+                and isinstance(normalized['termVectors'], dict)
+                and tuple(normalized['termVectors']) == cls.KEY_TERM_KEYS
+                and isinstance(normalized['priorities'], dict)):
+            return False
+        # Vecteurs stockés en tableaux d'entiers non signés
+        return all(isinstance(vector, dict) and tuple(vector) == ('indices', 'counts')
+                   and all(type(value) is int and 0 <= value < 1 << 32
+                           for value in vector['indices'] + vector['counts'])
+                   for vector in normalized['termVectors'].values())
+
+    def __init__(self, data: Dict[str, Any]):
+        normalized = data['normalized']
+        # Les textes libres sont propres à chaque candidat : les interner n'apporterait rien
+        self.texts = tuple(data[key] for key in self.TEXT_KEYS)
+        self.priorities = _freeze(data['priorities'])
+        self.key_terms = tuple(_freeze(normalized['keyTerms'][key]) for key in self.KEY_TERM_KEYS)
+        self.term_vectors = tuple((array('I', normalized['termVectors'][key]['indices']),
+                                   array('I', normalized['termVectors'][key]['counts']))
+                                  for key in self.KEY_TERM_KEYS)
+        self.normalized_priorities = tuple((_freeze(key), _freeze(value))
+                                           for key, value in normalized['priorities'].items())
+
+    def to_parsed(self) -> Dict[str, Any]:
+        result = dict(zip(self.TEXT_KEYS, self.texts))
+        result['priorities'] = _thaw(self.priorities)
+        result['normalized'] = {
+            'keyTerms': {key: list(terms) for key, terms in zip(self.KEY_TERM_KEYS, self.key_terms)},
+            'termVectors': {key: {'indices': indices.tolist(), 'counts': counts.tolist()}
+                            for key, (indices, counts) in zip(self.KEY_TERM_KEYS, self.term_vectors)},
+            'priorities': {key: _thaw(value) for key, value in self.normalized_priorities}
+        }
+        return result
+
+
+class CompactMetadata:
+    """Métadonnées : qualité en tuple de flottants, incohérences internées"""
+
+    QUALITY_KEYS = ('jobPreferences', 'skills', 'availability', 'additional', 'overall')
+
+    __slots__ = ('parsed_date', 'quality', 'inconsistencies', 'extra')
+
+    @classmethod
+    def matches(cls, data: Dict[str, Any]) -> bool:
+        keys = tuple(data)
+        if keys[:2] != ('parsedDate', 'dataQuality') or 'inconsistencies' in keys[3:]:
+            return False
+        quality = data['dataQuality']
+        return isinstance(quality, dict) and tuple(quality) == cls.QUALITY_KEYS
+
+    def __init__(self, data: Dict[str, Any]):
+        self.parsed_date = data['parsedDate']
+        self.quality = tuple(data['dataQuality'][key] for key in self.QUALITY_KEYS)
+        self.inconsistencies = _freeze(data['inconsistencies']) if 'inconsistencies' in data else None
+        # Autres blocs (timings...) conservés tels quels, dans l'ordre
+        extra = {key: _freeze(value) for key, value in data.items()
+                 if key not in ('parsedDate', 'dataQuality', 'inconsistencies')}
+        self.extra = extra or None
+
+    def to_parsed(self) -> Dict[str, Any]:
+        result = {
+            'parsedDate': self.parsed_date,
+            'dataQuality': dict(zip(self.QUALITY_KEYS, self.quality))
+        }
+        if self.inconsistencies is not None:
+            result['inconsistencies'] = _thaw(self.inconsistencies)
+        if self.extra:
+            result.update(_thaw(self.extra))
+        return result
+
+
+class CompactCandidate:
+    """Candidat parsé en représentation compacte ; to_parsed() reconstruit exactement le format JSON"""
+
+    SECTIONS = (
+        ('jobPreferences', CompactJobPreferences),
+        ('skills', CompactSkills),
+        ('availability', CompactAvailability),
+        ('additional', CompactAdditional),
+        ('metadata', CompactMetadata)
+    )
+    KEYS = tuple(key for key, _ in SECTIONS) + ('tags',)
+
+    __slots__ = ('job_preferences', 'skills', 'availability', 'additional', 'metadata', 'tags', 'extra', 'raw')
+
+    def __init__(self):
+        for slot in self.__slots__:
+            setattr(self, slot, None)
+
+    @classmethod
+    def from_parsed(cls, parsed_data: Dict[str, Any]) -> 'CompactCandidate':
+        """Construit la représentation compacte d'un résultat de ResponseParser.parse_candidate_response"""
+        candidate = cls()
+
+        # Forme non reconnue (questionnaire vide...) : le résultat est conservé gelé, sans perte
+        if tuple(parsed_data)[:len(cls.KEYS)] != cls.KEYS:
+            candidate.raw = _freeze(parsed_data)
+            return candidate
+
+        sections = []
+        for key, section_class in cls.SECTIONS:
+            data = parsed_data[key]
+            empty = _EMPTY_SECTIONS.get(key)
+            if empty is not None and data == empty and tuple(data) == tuple(empty):
+                sections.append(_FROZEN_EMPTY_SECTIONS[key])
+            elif isinstance(data, dict) and section_class.matches(data):
+                sections.append(section_class(data))
+            else:
+                sections.append(_freeze(data))
+
+        (candidate.job_preferences, candidate.skills, candidate.availability,
+         candidate.additional, candidate.metadata) = sections
+        candidate.tags = tuple(sys.intern(tag) for tag in parsed_data['tags'])
+
+        extra = {key: _freeze(value) for key, value in parsed_data.items() if key not in cls.KEYS}
+        candidate.extra = extra or None
+        return candidate
+
+    def to_parsed(self) -> Dict[str, Any]:
+        """Reconstruit le résultat au format JSON du parser"""
+        if self.raw is not None:
+            return _thaw(self.raw)
+
+        result = {
+            'jobPreferences': _section_to_parsed(self.job_preferences),
+            'skills': _section_to_parsed(self.skills),
+            'availability': _section_to_parsed(self.availability),
+            'additional': _section_to_parsed(self.additional),
+            'metadata': _section_to_parsed(self.metadata),
+            'tags': list(self.tags)
+        }
+        if self.extra:
+            result.update(_thaw(self.extra))
+        return result
+
+    @property
+    def contract(self) -> Optional[ContractType]:
+        """Type de contrat recherché (None si la section n'est pas renseignée)"""
+        return getattr(self.job_preferences, 'contract', None)
+
+    @property
+    def remote(self) -> Optional[RemoteType]:
+        """Préférence de télétravail (None si la section n'est pas renseignée)"""
+        return getattr(self.job_preferences, 'remote', None)
+
+    def skill_levels(self) -> Dict[str, SkillLevel]:
+        """Niveau de chaque compétence technique notée"""
+        if isinstance(self.skills, CompactSkills):
+            return self.skills.skill_levels()
+        return {}
+
+
+def compact_candidates(parsed_candidates) -> List[CompactCandidate]:
+    """Convertit une suite de résultats du parser en représentation compacte"""
+    return [CompactCandidate.from_parsed(parsed_data) for parsed_data in parsed_candidates]
@@ -0,0 +1,171 @@
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple
+
+
+# Règles de cohérence des données d'un candidat, déclarées sous forme de tables et compilées une
+# fois : chaque compétence ou poste distinct est associé (avec un cache) au masque des règles dont
+# il contient un terme, et toutes les règles d'un candidat sont évaluées en un seul passage.
+#
+# Types de règles :
+# - role_skills : le poste recherché contient l'un des role_terms mais aucune compétence technique
+#   ne contient l'un des skill_terms (sous-chaîne, sans tenir compte de la casse)
+# - level_salary : la moyenne des niveaux de compétence est au plus max_average_level alors que
+#   le salaire minimum demandé dépasse min_salary
+CONSISTENCY_RULES = (
+    {
+        'kind': 'role_skills',
+        'type': 'skill_mismatch',
+        'role_terms': ('frontend', 'front-end'),
+        'skill_terms': ('html', 'css', 'javascript', 'react', 'vue', 'angular'),
+        'message': 'Le poste recherché (Frontend) ne correspond pas aux compétences déclarées'
+    },
+    {
+        'kind': 'role_skills',
+        'type': 'skill_mismatch',
+        'role_terms': ('backend', 'back-end'),
+        'skill_terms': ('python', 'java', 'c#', 'nodejs', 'php', 'sql', 'mongo'),
+        'message': 'Le poste recherché (Backend) ne correspond pas aux compétences déclarées'
+    },
+    {
+        'kind': 'level_salary',
+        'type': 'salary_experience_mismatch',
+        'max_average_level': 1.5,
+        'min_salary': 50000,
+        'message': 'Le niveau d\'expérience (Débutant) semble incohérent avec les prétentions salariales'
+    }
+)
+
+RULE_KINDS = ('role_skills', 'level_salary')
+
+# Nombre de compétences et de postes distincts mémorisés
+RULE_CACHE_SIZE = 8192
+# Les masques du mode par lots tiennent sur 64 bits
+MAX_ROLE_RULES = 64
+
+
+class ConsistencyRules:
+    """Règles de cohérence compilées : évaluation d'un candidat ou d'un lot de candidats parsés"""
+
+    def __init__(self, rules: Sequence[Dict[str, Any]] = CONSISTENCY_RULES, cache_size: int = RULE_CACHE_SIZE):
+        self.rules = tuple(dict(rule) for rule in rules)
+        self._cache_size = cache_size
+        for rule in self.rules:
+            if rule.get('kind') not in RULE_KINDS:
+                raise ValueError(f"Type de règle de cohérence inconnu: {rule.get('kind')}")
+
+        # Règles compilées, dans l'ordre de déclaration : (bit role_skills ou 0, niveau moyen
+        # maximal, salaire minimal, incohérence signalée)
+        self._role_rules: List[Tuple[int, Tuple[str, ...], Tuple[str, ...]]] = []
+        self._checks: List[Tuple[int, float, float, Dict[str, str]]] = []
+        for rule in self.rules:
+            entry = {'type': rule['type'], 'message': rule['message']}
+            if rule['kind'] == 'role_skills':
+                bit = 1 << len(self._role_rules)
+                self._role_rules.append((bit, tuple(term.lower() for term in rule['role_terms']),
+                                         tuple(term.lower() for term in rule['skill_terms'])))
+                self._checks.append((bit, 0, 0, entry))
+            else:
+                self._checks.append((0, rule['max_average_level'], rule['min_salary'], entry))
+        if len(self._role_rules) > MAX_ROLE_RULES:
+            raise ValueError(f"Au plus {MAX_ROLE_RULES} règles role_skills")
+
+        self._role_mask = lru_cache(maxsize=cache_size)(self._compute_role_mask)
+        self._skill_mask = lru_cache(maxsize=cache_size)(self._compute_skill_mask)
+
+    def __reduce__(self):
+        # Les caches ne sont pas transmis : ils sont reconstruits dans le processus destinataire
+        return self.__class__, (self.rules, self._cache_size)
+
+    def _compute_role_mask(self, role: str) -> int:
+        """Règles dont le poste (en minuscules) contient l'un des role_terms"""
+        return sum(bit for bit, role_terms, _ in self._role_rules if any(term in role for term in role_terms))
+
+    def _compute_skill_mask(self, skill: str) -> int:
+        """Règles dont la compétence (en minuscules) contient l'un des skill_terms"""
+        return sum(bit for bit, _, skill_terms in self._role_rules if any(term in skill for term in skill_terms))
+
+    def features(self, parsed_data: Dict[str, Any]) -> Tuple[int, int, Optional[float], Any]:
+        """(masque du poste, masque des compétences, niveau moyen, salaire minimum) d'un candidat parsé
+
+        Les masques valent 0 quand le poste ou les compétences sont absents ; le niveau moyen est
+        None sans niveaux de compétence. Les termes ne contiennent pas d'espace : chercher dans
+        chaque compétence revient à chercher dans la liste des compétences jointe par des espaces.
+        """
+        job_prefs = parsed_data.get('jobPreferences') or {}
+        skills = parsed_data.get('skills') or {}
+
+        role_mask = skills_mask = 0
+        role = job_prefs.get('preferredRole')
+        technical_skills = skills.get('technicalSkills')
+        if role and technical_skills:
+            role_mask = self._role_mask(role.lower())
+            if role_mask:
+                skill_mask = self._skill_mask
+                for skill in technical_skills:
+                    if isinstance(skill, str):
+                        skills_mask |= skill_mask(skill.lower())
+
+        skill_levels = (skills.get('normalized') or {}).get('technicalSkillLevels')
+        average_level = None
+        if skill_levels:
+            average_level = sum(level.get('value', 0) for level in skill_levels.values()) / len(skill_levels)
+        salary_min = ((job_prefs.get('normalized') or {}).get('salaryExpectation') or {}).get('min')
+
+        return role_mask, skills_mask, average_level, salary_min
+
+    def check(self, parsed_data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Incohérences d'un candidat parsé, dans l'ordre des règles"""
+        role_mask, skills_mask, average_level, salary_min = self.features(parsed_data)
+        # Cas le plus courant : aucune règle ne peut s'appliquer
+        if not role_mask and (average_level is None or not salary_min):
+            return []
+        inconsistencies = []
+        for bit, max_average_level, min_salary, entry in self._checks:
+            if bit:
+                failed = role_mask & bit and not skills_mask & bit
+            else:
+                failed = (average_level is not None and salary_min
+                          and average_level <= max_average_level and salary_min > min_salary)
+            if failed:
+                inconsistencies.append(dict(entry))
+        return inconsistencies
+
+    def check_batch(self, parsed_candidates: Iterable[Dict[str, Any]]):
+        """Matrice booléenne (candidats × règles) des règles non respectées, évaluée par colonnes (NumPy)"""
+        import numpy as np
+
+        columns = list(zip(*(self.features(parsed_data) for parsed_data in parsed_candidates)))
+        if not columns:
+            return np.zeros((0, len(self.rules)), dtype=bool)
+        role_masks = np.array(columns[0], dtype=np.uint64)
+        skills_masks = np.array(columns[1], dtype=np.uint64)
+        average_levels = np.array([np.nan if value is None else value for value in columns[2]], dtype=np.float64)
+        # Salaire absent ou nul : la règle ne s'applique pas
+        salary_mins = np.array([value if value else np.nan for value in columns[3]], dtype=np.float64)
+
+        failed = np.zeros((len(role_masks), len(self.rules)), dtype=bool)
+        # Les comparaisons avec NaN sont fausses : niveaux ou salaire absents ne déclenchent rien
+        with np.errstate(invalid='ignore'):
+            for column, (bit, max_average_level, min_salary, _) in enumerate(self._checks):
+                if bit:
+                    bit = np.uint64(bit)
+                    failed[:, column] = ((role_masks & bit) != 0) & ((skills_masks & bit) == 0)
+                else:
+                    failed[:, column] = (average_levels <= max_average_level) & (salary_mins > min_salary)
+        return failed
+
+    def inconsistencies(self, failed) -> List[List[Dict[str, str]]]:
+        """Incohérences de chaque candidat à partir de la matrice de check_batch"""
+        entries = [entry for _, _, _, entry in self._checks]
+        return [[dict(entries[column]) for column in row.nonzero()[0]] for row in failed]
+
+    def counts(self, failed) -> Dict[str, int]:
+        """Nombre de candidats en défaut pour chaque message de règle"""
+        totals = failed.sum(axis=0)
+        return {rule['message']: int(total) for rule, total in zip(self.rules, totals)}
+
+    def cache_info(self) -> Dict[str, int]:
+        """Statistiques des caches des postes et des compétences"""
+        roles, skills = self._role_mask.cache_info(), self._skill_mask.cache_info()
+        return {'hits': roles.hits + skills.hits, 'misses': roles.misses + skills.misses,
+                'roles': roles.currsize, 'skills': skills.currsize}
@@ -0,0 +1,212 @@
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Gazetteer hors ligne : résout un lieu saisi librement ("Paris 15e", "Lyon, France",
+# "St-Étienne") en coordonnées, sans appel réseau. Les noms sont normalisés (minuscules, sans
+# accents ni tirets) et indexés une fois : recherche exacte par dictionnaire et recherche par
+# préfixe par dichotomie sur la liste triée des noms, au lieu d'un parcours de toute la table.
+
+# (nom, latitude, longitude, population) ; les 19 premières villes reprennent les coordonnées de
+# getCityCoordinates dans services/matching-algorithm.js
+FRENCH_CITIES = (
+    ('Paris', 48.8566, 2.3522, 2145906),
+    ('Lyon', 45.7578, 4.8320, 522250),
+    ('Marseille', 43.2965, 5.3698, 870731),
+    ('Toulouse', 43.6047, 1.4442, 498003),
+    ('Nice', 43.7102, 7.2620, 342669),
+    ('Nantes', 47.2184, -1.5536, 320732),
+    ('Strasbourg', 48.5734, 7.7521, 287228),
+    ('Montpellier', 43.6108, 3.8767, 302454),
+    ('Bordeaux', 44.8378, -0.5792, 260958),
+    ('Lille', 50.6292, 3.0573, 236710),
+    ('Rennes', 48.1173, -1.6778, 222485),
+    ('Reims', 49.2583, 4.0317, 181194),
+    ('Saint-Étienne', 45.4397, 4.3872, 173089),
+    ('Toulon', 43.1242, 5.9280, 180452),
+    ('Grenoble', 45.1885, 5.7245, 158240),
+    ('Angers', 47.4784, -0.5632, 157175),
+    ('Dijon', 47.3220, 5.0415, 159346),
+    ('Nîmes', 43.8367, 4.3601, 151001),
+    ('Le Mans', 48.0061, 0.1996, 145004),
+    ('Le Havre', 49.4944, 0.1079, 168290),
+    ('Villeurbanne', 45.7719, 4.8902, 150659),
+    ('Clermont-Ferrand', 45.7772, 3.0870, 147284),
+    ('Aix-en-Provence', 43.5297, 5.4474, 145133),
+    ('Brest', 48.3904, -4.4861, 139602),
+    ('Tours', 47.3941, 0.6848, 136463),
+    ('Amiens', 49.8941, 2.2958, 133891),
+    ('Limoges', 45.8336, 1.2611, 131479),
+    ('Annecy', 45.8992, 6.1294, 128199),
+    ('Boulogne-Billancourt', 48.8397, 2.2399, 121334),
+    ('Perpignan', 42.6887, 2.8948, 119656),
+    ('Metz', 49.1193, 6.1757, 116581),
+    ('Besançon', 47.2378, 6.0241, 117912),
+    ('Orléans', 47.9030, 1.9093, 116238),
+    ('Rouen', 49.4432, 1.0999, 112321),
+    ('Montreuil', 48.8638, 2.4485, 111367),
+    ('Argenteuil', 48.9472, 2.2467, 110388),
+    ('Mulhouse', 47.7508, 7.3359, 108038),
+    ('Caen', 49.1829, -0.3707, 106230),
+    ('Nancy', 48.6921, 6.1844, 104885),
+    ('Roubaix', 50.6942, 3.1746, 98828),
+    ('Tourcoing', 50.7239, 3.1612, 98656),
+    ('Nanterre', 48.8924, 2.2071, 96277),
+    ('Avignon', 43.9493, 4.8055, 91143),
+    ('Poitiers', 46.5802, 0.3404, 89472),
+    ('Versailles', 48.8049, 2.1204, 84808),
+    ('La Rochelle', 46.1603, -1.1511, 77205),
+    ('Pau', 43.2951, -0.3708, 75665),
+    ('Cannes', 43.5528, 7.0174, 74152),
+    ('Antibes', 43.5808, 7.1251, 73438),
+    ('Saint-Nazaire', 47.2735, -2.2138, 71887),
+    ('Calais', 50.9513, 1.8587, 67544),
+    ('Valence', 44.9334, 4.8924, 64726),
+    ('Troyes', 48.2973, 4.0744, 61996),
+    ('Chambéry', 45.5646, 5.9178, 59856),
+    ('Niort', 46.3237, -0.4588, 59193),
+    ('Lorient', 47.7483, -3.3700, 57149),
+    ('Vannes', 47.6582, -2.7608, 53718),
+    ('Bayonne', 43.4929, -1.4748, 51894),
+    ('Sophia Antipolis', 43.6163, 7.0552, 0),
+    ('La Défense', 48.8920, 2.2383, 0)
+)
+
+# Variantes courantes d'un nom (après normalisation) -> nom normalisé de la table
+CITY_ALIASES = {
+    'st etienne': 'saint etienne',
+    'st nazaire': 'saint nazaire',
+    'clermont': 'clermont ferrand',
+    'boulogne': 'boulogne billancourt',
+    'sophia': 'sophia antipolis',
+    # Région : rattachée à Paris, comme les offres "Île-de-France"
+    'ile de france': 'paris',
+    'idf': 'paris',
+    'paris la defense': 'la defense'
+}
+
+# Longueur minimale d'un préfixe pour compléter un nom inconnu ("marseil" -> Marseille)
+MIN_PREFIX_LENGTH = 4
+# Nombre maximal de mots (ou noms composés) examinés dans un lieu saisi librement
+MAX_LOCATION_WORDS = 8
+# Nombre de lieux saisis mémorisés par gazetteer
+RESOLVE_CACHE_SIZE = 4096
+
+_SEPARATORS = str.maketrans({character: ' ' for character in "-'’,;/()."})
+# Séparateurs entre mots, hors tirets et apostrophes qui lient un nom composé ("Metz-Tessy")
+_WORD_SEPARATORS = str.maketrans({character: ' ' for character in ",;/()."})
+
+
+@lru_cache(maxsize=RESOLVE_CACHE_SIZE)
+def normalize_place(text: str) -> str:
+    """Forme de comparaison d'un nom de lieu : minuscules, sans accents ni ponctuation"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    stripped = ''.join(character for character in decomposed if not unicodedata.combining(character))
+    return ' '.join(stripped.translate(_SEPARATORS).split())
+
+
+class Gazetteer:
+    """Index des lieux connus : recherche exacte, par préfixe, et résolution d'un lieu saisi librement"""
+
+    def __init__(self, entries: Iterable[Tuple[str, float, float, int]] = FRENCH_CITIES,
+                 aliases: Optional[Dict[str, str]] = None):
+        self._entries = tuple((name, float(lat), float(lng), int(population))
+                              for name, lat, lng, population in entries)
+        self._aliases = dict(CITY_ALIASES if aliases is None else aliases)
+
+        self._places: Dict[str, Dict[str, object]] = {}
+        self._populations: Dict[str, int] = {}
+        for name, lat, lng, population in self._entries:
+            key = normalize_place(name)
+            # Homonymes : la ville la plus peuplée l'emporte
+            if key not in self._places or population > self._populations[key]:
+                self._places[key] = {'city': name, 'lat': lat, 'lng': lng}
+                self._populations[key] = population
+        for alias, key in self._aliases.items():
+            alias = normalize_place(alias)
+            if key in self._places and alias not in self._places:
+                self._places[alias] = self._places[key]
+                self._populations[alias] = self._populations[key]
+
+        self._keys: List[str] = sorted(self._places)
+        self._find = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._find_place)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __reduce__(self):
+        # Le cache n'est pas transmis : il est reconstruit dans le processus destinataire
+        return self.__class__, (self._entries, self._aliases)
+
+    @classmethod
+    def from_csv(cls, path: str, aliases: Optional[Dict[str, str]] = None) -> 'Gazetteer':
+        """Charge un gazetteer depuis un fichier CSV name,lat,lng[,population] (avec en-tête)"""
+        import csv
+        with open(path, encoding='utf-8', newline='') as stream:
+            entries = [(row['name'], row['lat'], row['lng'], row.get('population') or 0)
+                       for row in csv.DictReader(stream)]
+        return cls(entries, aliases)
+
+    def lookup(self, name: str) -> Optional[Dict[str, object]]:
+        """Lieu dont le nom normalisé est exactement celui-ci"""
+        place = self._places.get(normalize_place(name))
+        return dict(place) if place else None
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, object]]:
+        """Lieux dont le nom commence par ce préfixe, les plus peuplés d'abord"""
+        prefix = normalize_place(prefix)
+        if not prefix:
+            return []
+        keys = []
+        position = bisect_left(self._keys, prefix)
+        while position < len(self._keys) and self._keys[position].startswith(prefix):
+            keys.append(self._keys[position])
+            position += 1
+        keys.sort(key=lambda key: -self._populations[key])
+        # Un alias et son nom complet désignent le même lieu
+        places = list({id(self._places[key]): self._places[key] for key in keys}.values())
+        return [dict(place) for place in places[:limit]]
+
+    def resolve(self, location: str) -> Optional[Dict[str, object]]:
+        """Lieu désigné par un texte libre ({city, lat, lng}), ou None
+
+        Essaie le texte entier, puis chaque suite de mots consécutifs, de la plus longue à la plus
+        courte ("Paris 15e" -> Paris, "Grand Lyon" -> Lyon), puis complète un nom tronqué. Un nom
+        composé ne correspond qu'en entier : "Metz-Tessy" n'est pas Metz.
+        """
+        if not isinstance(location, str):
+            return None
+        place = self._find(location)
+        return dict(place) if place else None
+
+    def _find_place(self, location: str) -> Optional[Dict[str, object]]:
+        normalized = normalize_place(location)
+        place = self._places.get(normalized)
+        if place is not None or not normalized:
+            return place
+        # Mots du texte, un nom composé restant un seul mot (normalisé : "saint etienne")
+        words = [word for word in (normalize_place(word) for word in
+                                   location.translate(_WORD_SEPARATORS).split()[:MAX_LOCATION_WORDS]) if word]
+        for size in range(len(words) - 1, 0, -1):
+            for start in range(len(words) - size + 1):
+                place = self._places.get(' '.join(words[start:start + size]))
+                if place is not None:
+                    return place
+        # Complétion d'un nom tronqué ; un nom composé inconnu ("Brest-Litovsk") n'est pas complété
+        if len(normalized) >= MIN_PREFIX_LENGTH:
+            position = bisect_left(self._keys, normalized)
+            best = None
+            while position < len(self._keys) and self._keys[position].startswith(normalized):
+                key = self._keys[position]
+                if best is None or self._populations[key] > self._populations[best]:
+                    best = key
+                position += 1
+            return self._places[best] if best else None
+        return None
+
+    def cache_info(self) -> Dict[str, int]:
+        """Statistiques du cache des lieux résolus"""
+        info = self._find.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'entries': info.currsize, 'places': len(self._keys)}
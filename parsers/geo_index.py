@@ -0,0 +1,148 @@
+import math
+from typing import Dict, List, Any, Hashable, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Index spatial des candidats ("tous les candidats à moins de R km de cette offre") : les points
+# sont rangés par cellule d'une grille en degrés, triés par clé de cellule. Une requête ne lit que
+# les cellules qui recouvrent le cercle (une tranche contiguë du tableau trié par ligne de la
+# grille, trouvée par searchsorted), puis filtre ces points par une distance haversine vectorisée.
+
+# Rayon terrestre en km, celui de calculateDistance côté Node (et de matching_engine)
+EARTH_RADIUS_KM = 6371
+# Longueur d'un degré de latitude, en km
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+# Côté par défaut d'une cellule, en km (de l'ordre des rayons de recherche usuels)
+DEFAULT_CELL_KM = 25.0
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Distance haversine en km (mêmes formule et rayon que calculateDistance côté Node), vectorisée"""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _parsed_coordinates(parsed_data: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Coordonnées d'un candidat parsé : locationCoordinates, sinon celles résolues par le gazetteer"""
+    parsed_data = parsed_data.get('parsedData', parsed_data)
+    job_prefs = parsed_data.get('jobPreferences') or {}
+    for coordinates in (job_prefs.get('locationCoordinates'), (job_prefs.get('normalized') or {}).get('coordinates')):
+        if isinstance(coordinates, dict) and coordinates.get('lat') is not None and coordinates.get('lng') is not None:
+            return float(coordinates['lat']), float(coordinates['lng'])
+    return None
+
+
+class CandidateGeoIndex:
+    """Grille de cellules sur les coordonnées des candidats, pour les recherches par rayon"""
+
+    def __init__(self, cell_km: float = DEFAULT_CELL_KM):
+        if cell_km <= 0:
+            raise ValueError("La taille de cellule doit être positive")
+        self.cell_km = cell_km
+        self._cell_degrees = cell_km / KM_PER_DEGREE
+        # Colonnes de la grille sur 360° de longitude, plus une marge de chaque côté
+        self._columns = int(math.ceil(360 / self._cell_degrees)) + 2
+        self._ids: List[Hashable] = []
+        self._coordinates: List[Tuple[float, float]] = []
+        # Candidats sans coordonnées (ni fournies ni résolues), non indexés
+        self.missing = 0
+        self._keys = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, candidate_id: Hashable, parsed_data: Dict[str, Any]) -> bool:
+        """Ajoute un candidat parsé ; False s'il n'a pas de coordonnées"""
+        coordinates = _parsed_coordinates(parsed_data)
+        if coordinates is None:
+            self.missing += 1
+            return False
+        self._ids.append(candidate_id)
+        self._coordinates.append(coordinates)
+        self._keys = None
+        return True
+
+    def add_many(self, candidates: Iterable[Tuple[Hashable, Dict[str, Any]]]) -> None:
+        """Ajoute une suite de couples (id, données parsées)"""
+        for candidate_id, parsed_data in candidates:
+            self.add(candidate_id, parsed_data)
+
+    @classmethod
+    def from_arrays(cls, ids: Sequence[Hashable], lat, lng, cell_km: float = DEFAULT_CELL_KM) -> 'CandidateGeoIndex':
+        """Index construit à partir de colonnes de coordonnées (NaN = pas de coordonnées)"""
+        index = cls(cell_km)
+        lat, lng = np.asarray(lat, dtype=np.float64), np.asarray(lng, dtype=np.float64)
+        known = ~(np.isnan(lat) | np.isnan(lng))
+        index._ids = [candidate_id for candidate_id, keep in zip(ids, known) if keep]
+        index._coordinates = list(zip(lat[known].tolist(), lng[known].tolist()))
+        index.missing = int(len(known) - known.sum())
+        return index
+
+    @classmethod
+    def from_snapshot(cls, snapshot, cell_km: float = DEFAULT_CELL_KM) -> 'CandidateGeoIndex':
+        """Index des candidats d'un CandidateSnapshot (colonnes lat et lng)"""
+        return cls.from_arrays(list(snapshot.ids), snapshot.as_numpy('lat'), snapshot.as_numpy('lng'), cell_km)
+
+    def build(self) -> None:
+        """Trie les points par cellule (appelé automatiquement à la première recherche)"""
+        coordinates = np.array(self._coordinates, dtype=np.float64).reshape(-1, 2)
+        keys = self._cell_keys(coordinates[:, 0], coordinates[:, 1])
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._positions = order
+        self._lat = coordinates[order, 0]
+        self._lng = coordinates[order, 1]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[Hashable, float]]:
+        """Candidats à moins de radius_km du point, sous forme (id, distance en km), du plus proche au plus lointain"""
+        positions, distances = self.within_positions(lat, lng, radius_km)
+        return [(self._ids[position], float(distance)) for position, distance in zip(positions, distances)]
+
+    def within_batch(self, points: Iterable[Tuple[float, float]], radius_km: float) -> List[List[Tuple[Hashable, float]]]:
+        """within pour une suite de points (lat, lng), par exemple les localisations d'un lot d'offres"""
+        return [self.within(lat, lng, radius_km) for lat, lng in points]
+
+    def within_positions(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions (ordre d'ajout) et distances des candidats à moins de radius_km, triées par distance"""
+        if self._keys is None:
+            self.build()
+        rows = self._candidate_rows(lat, lng, radius_km)
+        distances = haversine_km(lat, lng, self._lat[rows], self._lng[rows])
+        keep = distances <= radius_km
+        rows, distances = rows[keep], distances[keep]
+        order = np.argsort(distances, kind='stable')
+        return self._positions[rows[order]], distances[order]
+
+    def _cell_keys(self, lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+        """Clé de cellule : ligne (latitude) × nombre de colonnes + colonne (longitude)"""
+        rows = np.floor(lat / self._cell_degrees).astype(np.int64)
+        columns = np.floor((lng + 180) / self._cell_degrees).astype(np.int64) + 1
+        return rows * self._columns + columns
+
+    def _candidate_rows(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Indices (dans les tableaux triés) des points des cellules qui recouvrent le cercle"""
+        lat_span = radius_km / KM_PER_DEGREE
+        highest_lat = min(90.0, abs(lat) + lat_span)
+        cos_lat = math.cos(math.radians(highest_lat))
+        lng_span = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 1e-9 else 360.0
+        # Cercle qui contient un pôle ou traverse l'antiméridien : tous les points sont examinés
+        if highest_lat >= 90 or lng - lng_span < -180 or lng + lng_span > 180:
+            return np.arange(len(self._keys))
+
+        first_row = math.floor((lat - lat_span) / self._cell_degrees)
+        last_row = math.floor((lat + lat_span) / self._cell_degrees)
+        first_column = math.floor((lng - lng_span + 180) / self._cell_degrees) + 1
+        last_column = math.floor((lng + lng_span + 180) / self._cell_degrees) + 1
+
+        # Chaque ligne de la grille est une tranche contiguë du tableau trié par clé
+        row_keys = np.arange(first_row, last_row + 1, dtype=np.int64) * self._columns
+        starts = np.searchsorted(self._keys, row_keys + first_column, side='left')
+        ends = np.searchsorted(self._keys, row_keys + last_column, side='right')
+        sizes = ends - starts
+        if not sizes.sum():
+            return np.empty(0, dtype=np.int64)
+        # Concaténation des tranches sans boucle Python : indice de début de chaque tranche + rang
+        offsets = np.repeat(starts - np.cumsum(sizes) + sizes, sizes)
+        return offsets + np.arange(sizes.sum())
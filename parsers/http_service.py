@@ -0,0 +1,394 @@
+import os
+import json
+import signal
+import asyncio
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from typing import Dict, List, Any, Optional, Tuple
+
+from candidate_parser import CandidateDataProcessor, PARSER_VERSION
+from instrumentation import PARSER_METRICS, ParserMetrics
+from serializers import get_serializer
+
+
+# Service HTTP natif du parser (asyncio, bibliothèque standard) : la boucle d'événements ne fait
+# que lire et écrire les requêtes, le décodage JSON, l'analyse et la sérialisation des résultats
+# s'exécutent dans un pool de processus. Les routes reprennent celles de server.js.
+
+DEFAULT_MAX_BODY_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_BATCH_CHUNK = 32
+MAX_HEADER_COUNT = 100
+KEEP_ALIVE_TIMEOUT = 15.0
+BODY_TIMEOUT = 30.0
+
+# Chaque processus du pool garde son propre processeur (et son cache éventuel) et son sérialiseur
+_processor = None
+_serializer = None
+_instrument = False
+
+
+def _init_service_worker(original_data: str, instrument: bool, cache_options: Optional[Dict[str, Any]],
+                         serializer: str = 'json') -> None:
+    """Initialise le processeur et le sérialiseur du processus courant"""
+    global _processor, _serializer, _instrument
+    # Les signaux d'arrêt sont gérés par le processus principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    cache = None
+    if cache_options:
+        from result_cache import ResultCache
+        cache = ResultCache(version=PARSER_VERSION, **cache_options)
+    _processor = CandidateDataProcessor(cache=cache, original_data=original_data, instrument=instrument)
+    _serializer = get_serializer(serializer)
+    _instrument = instrument
+
+
+def _drain_metrics() -> Optional[Dict[str, Any]]:
+    """Mesures accumulées par ce processus depuis la dernière tâche, transmises avec son résultat"""
+    if not _instrument:
+        return None
+    return PARSER_METRICS.drain()
+
+
+def _error_body(message: str) -> bytes:
+    return json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+
+
+def _process_body(body: bytes) -> Tuple[int, bytes, Optional[Dict[str, Any]]]:
+    """Traite le corps d'une requête /api/process-candidate : (statut HTTP, réponse JSON, mesures)"""
+    try:
+        candidate = json.loads(body)
+    except ValueError as e:
+        return 400, _error_body(f"JSON invalide: {str(e)}"), None
+    if not isinstance(candidate, dict):
+        return 400, _error_body("Le corps de la requête doit être un objet JSON"), None
+    try:
+        result = _processor.process_candidate_data(candidate)
+    except Exception as e:
+        return 500, _error_body(f"Erreur lors du traitement des données: {str(e)}"), _drain_metrics()
+    return 200, _serializer.dumpb(result), _drain_metrics()
+
+
+def _split_batch(body: bytes, max_batch: int, chunk_size: int) -> Tuple[int, Any]:
+    """Décode le corps d'une requête /api/process-candidates et le découpe en parties
+
+    Retourne (200, [(début, partie en JSON)]) ou (statut d'erreur, réponse JSON). Les parties
+    sont réencodées pour que le processus principal ne décode jamais le lot lui-même.
+    """
+    try:
+        candidates = json.loads(body)
+    except ValueError as e:
+        return 400, _error_body(f"JSON invalide: {str(e)}")
+    if not isinstance(candidates, list):
+        return 400, _error_body("Le corps de la requête doit être un tableau JSON")
+    if len(candidates) > max_batch:
+        return 413, _error_body(f"Lot trop volumineux (maximum {max_batch} candidats)")
+    return 200, [(start, json.dumps(candidates[start:start + chunk_size], ensure_ascii=False).encode('utf-8'))
+                 for start in range(0, len(candidates), chunk_size)]
+
+
+def _process_chunk(start: int, payload: bytes) -> Tuple[List[bytes], Optional[Dict[str, Any]]]:
+    """Traite une partie d'un lot ; une erreur est rapportée dans le résultat de l'enregistrement concerné"""
+    candidates = json.loads(payload)
+    results = []
+    for index, candidate in enumerate(candidates, start):
+        try:
+            if not isinstance(candidate, dict):
+                raise ValueError("l'enregistrement doit être un objet JSON")
+            result = _processor.process_candidate_data(candidate)
+        except Exception as e:
+            result = {'index': index, 'error': f"Erreur lors du traitement des données: {str(e)}"}
+        results.append(_serializer.dumpb(result))
+    return results, _drain_metrics()
+
+
+class _HTTPError(Exception):
+    """Erreur de protocole : la réponse est envoyée puis la connexion fermée"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _PoolUnavailable(Exception):
+    """Le pool de processus s'est arrêté (processus tué) pendant la requête ; il a été recréé"""
+
+
+class ParserHTTPService:
+    """Serveur HTTP asyncio qui répartit l'analyse des candidats sur un pool de processus"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8000, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+                 max_batch: int = DEFAULT_MAX_BATCH, batch_chunk: int = DEFAULT_BATCH_CHUNK,
+                 original_data: str = 'full', instrument: bool = False,
+                 cache_options: Optional[Dict[str, Any]] = None, serializer: str = 'json'):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        # Au-delà de max_pending tâches en cours dans le pool, les requêtes sont refusées (503)
+        self.max_pending = max_pending or self.workers * 8
+        self.max_body_bytes = max_body_bytes
+        self.max_batch = max_batch
+        self.batch_chunk = batch_chunk
+        self._initargs = (original_data, instrument, cache_options, serializer)
+        self._executor = self._create_pool()
+        self._server = None
+        self._pending = 0
+        # Mesures des processus du pool (--instrument), remontées avec chaque résultat
+        self.metrics = ParserMetrics()
+        self._counters = {'requests': 0, 'candidates': 0, 'rejected': 0, 'errors': 0, 'poolRestarts': 0}
+
+    def _create_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=_init_service_worker,
+                                                      initargs=self._initargs)
+
+    def _restart_pool(self, broken: concurrent.futures.ProcessPoolExecutor) -> None:
+        """Remplace un pool cassé (une seule fois, même si plusieurs requêtes l'ont constaté)"""
+        if self._executor is not broken:
+            return
+        self._counters['poolRestarts'] += 1
+        self._executor = self._create_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        """Ouvre le port d'écoute"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Port effectivement attribué (utile avec port=0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Sert les requêtes jusqu'à l'annulation de la tâche"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Ferme le port puis le pool de processus"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def status(self) -> Dict[str, Any]:
+        """État du service (exposé sur /api/health)"""
+        return dict(self._counters, pid=os.getpid(), workers=self.workers, pending=self._pending,
+                    maxPending=self.max_pending, parserVersion=PARSER_VERSION)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Lit les requêtes d'une connexion (keep-alive HTTP/1.1) et écrit les réponses dans l'ordre"""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+
+                try:
+                    method, path, version, headers = await self._read_head(request_line, reader)
+                    keep_alive = self._keep_alive(version, headers)
+                    body = await self._read_body(headers, reader, writer)
+                except _HTTPError as e:
+                    await self._respond(writer, e.status, _error_body(str(e)), keep_alive=False)
+                    break
+
+                self._counters['requests'] += 1
+                try:
+                    status, payload, extra_headers = await self._dispatch(method, path, body)
+                except _PoolUnavailable:
+                    self._counters['errors'] += 1
+                    status, payload, extra_headers = (503, _error_body("Processus d'analyse interrompu, veuillez réessayer"),
+                                                      {'Retry-After': '1'})
+                await self._respond(writer, status, payload, keep_alive, extra_headers)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ValueError):
+            # Client parti, trop lent ou ligne trop longue : la connexion est simplement fermée
+            pass
+        finally:
+            writer.close()
+
+    async def _read_head(self, request_line: bytes, reader: asyncio.StreamReader) -> Tuple[str, str, str, Dict[str, str]]:
+        """Ligne de requête et en-têtes (noms en minuscules)"""
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise _HTTPError(400, "Ligne de requête invalide")
+        if version not in ('HTTP/1.0', 'HTTP/1.1'):
+            raise _HTTPError(505, f"Version HTTP non prise en charge: {version}")
+
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), BODY_TIMEOUT)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADER_COUNT:
+                raise _HTTPError(431, "Trop d'en-têtes")
+            name, separator, value = line.decode('latin-1').partition(':')
+            if not separator:
+                raise _HTTPError(400, "En-tête invalide")
+            headers[name.strip().lower()] = value.strip()
+
+        return method.upper(), target.split('?', 1)[0], version, headers
+
+    @staticmethod
+    def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.1':
+            return connection != 'close'
+        return connection == 'keep-alive'
+
+    async def _read_body(self, headers: Dict[str, str], reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> bytes:
+        """Corps de la requête, refusé avant lecture s'il dépasse la taille maximale"""
+        if 'transfer-encoding' in headers:
+            raise _HTTPError(411, "Content-Length requis (transfert par blocs non pris en charge)")
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise _HTTPError(400, "Content-Length invalide")
+        if length < 0:
+            raise _HTTPError(400, "Content-Length invalide")
+        if length > self.max_body_bytes:
+            raise _HTTPError(413, f"Requête trop volumineuse (maximum {self.max_body_bytes} octets)")
+
+        if headers.get('expect', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+            await writer.drain()
+        if not length:
+            return b''
+        return await asyncio.wait_for(reader.readexactly(length), BODY_TIMEOUT)
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """Route une requête : (statut, corps JSON, en-têtes supplémentaires)"""
+        routes = {
+            '/api/process-candidate': ('POST', self._process_candidate),
+            '/api/process-candidates': ('POST', self._process_candidates),
+            '/api/test': ('GET', self._test),
+            '/api/health': ('GET', self._health),
+            '/api/metrics': ('GET', self._metrics)
+        }
+        route = routes.get(path)
+        if route is None:
+            return 404, _error_body(f"Route inconnue: {path}"), {}
+        if method == 'OPTIONS':
+            # Pré-vérification CORS (le serveur Express accepte toutes les origines)
+            return 204, b'', {'Access-Control-Allow-Methods': f"{route[0]}, OPTIONS",
+                              'Access-Control-Allow-Headers': 'Content-Type'}
+        if method != route[0]:
+            return 405, _error_body(f"Méthode non autorisée: {method}"), {'Allow': route[0]}
+        return await route[1](body)
+
+    async def _test(self, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        return 200, json.dumps({'message': 'Le serveur API fonctionne correctement!'},
+                               ensure_ascii=False).encode('utf-8'), {}
+
+    async def _health(self, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        return 200, json.dumps(self.status()).encode('utf-8'), {}
+
+    async def _metrics(self, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """Histogrammes des étapes agrégés sur tous les processus du pool, au format Prometheus"""
+        return 200, self.metrics.render_prometheus().encode('utf-8'), \
+            {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+    def _record_metrics(self, metrics: Optional[Dict[str, Any]]) -> None:
+        if metrics:
+            self.metrics.merge(metrics)
+
+    def _saturated(self, tasks: int) -> bool:
+        """Contre-pression : refuse le travail qui ferait dépasser la file du pool"""
+        if self._pending + tasks > self.max_pending:
+            self._counters['rejected'] += 1
+            return True
+        return False
+
+    async def _run(self, function, *args):
+        """Exécute une fonction dans le pool en comptant les tâches en cours
+
+        Si un processus du pool meurt, le pool est recréé et _PoolUnavailable est levée (503).
+        """
+        executor = self._executor
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            raise _PoolUnavailable() from None
+        finally:
+            self._pending -= 1
+
+    async def _process_candidate(self, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        if self._saturated(1):
+            return 503, _error_body("Serveur surchargé, veuillez réessayer"), {'Retry-After': '1'}
+        status, payload, metrics = await self._run(_process_body, body)
+        self._record_metrics(metrics)
+        self._counters['candidates' if status == 200 else 'errors'] += 1
+        return status, payload, {}
+
+    async def _process_candidates(self, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """Lot de candidats (tableau JSON) : tableau des résultats dans l'ordre, erreurs par enregistrement"""
+        # Le décodage d'un lot (jusqu'à max_body_bytes) bloquerait la boucle : il se fait dans le pool
+        if self._saturated(1):
+            return 503, _error_body("Serveur surchargé, veuillez réessayer"), {'Retry-After': '1'}
+        status, chunks = await self._run(_split_batch, body, self.max_batch, self.batch_chunk)
+        if status != 200:
+            return status, chunks, {}
+
+        # Un lot admis compte pour une seule admission : ses parties passent ensuite au plus
+        # `workers` à la fois, quelle que soit sa taille (jusqu'à max_batch)
+        in_flight = asyncio.Semaphore(self.workers)
+
+        async def run_chunk(start: int, chunk: bytes):
+            async with in_flight:
+                return await self._run(_process_chunk, start, chunk)
+
+        parts = await asyncio.gather(*(run_chunk(start, chunk) for start, chunk in chunks), return_exceptions=True)
+        for part in parts:
+            if isinstance(part, BaseException):
+                raise part
+        results = [result for part, metrics in parts for result in part]
+        for _, metrics in parts:
+            self._record_metrics(metrics)
+        self._counters['candidates'] += len(results)
+        return 200, b'[' + b','.join(results) + b']', {}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, body: bytes, keep_alive: bool,
+                       extra_headers: Optional[Dict[str, str]] = None) -> None:
+        headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Content-Length': str(len(body)),
+            'Access-Control-Allow-Origin': '*',
+            'Connection': 'keep-alive' if keep_alive else 'close'
+        }
+        headers.update(extra_headers or {})
+        head = f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin-1') + b'\r\n' + body)
+        await writer.drain()
+
+
+def serve(host: str = '127.0.0.1', port: int = 8000, **options) -> None:
+    """Lance le service jusqu'à SIGINT ou SIGTERM"""
+
+    async def main() -> None:
+        service = ParserHTTPService(host, port, **options)
+        await service.start()
+        print(f"Service HTTP du parser démarré sur http://{service.host}:{service.port} "
+              f"({service.workers} processus)", flush=True)
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, stop.set)
+
+        serving = asyncio.create_task(service.serve_forever())
+        await stop.wait()
+        serving.cancel()
+        await service.close()
+
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Any, List
+
+# Bornes des histogrammes de durée, en millisecondes
+DEFAULT_BUCKETS_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Histogramme cumulatif à bornes fixes (compatible avec le format Prometheus)"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        # Une case de plus pour les valeurs au-delà de la dernière borne
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Enregistre une valeur"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retourne les compteurs cumulés par borne, le nombre et la somme des valeurs"""
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            cumulative.append([bound, total])
+        return {'buckets': cumulative, 'count': self.count, 'sum': self.sum}
+
+
+class ParserMetrics:
+    """Histogrammes des durées par étape et compteurs agrégés sur la durée de vie du processus"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS_MS):
+        self.buckets = buckets
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings: Dict[str, Any]) -> None:
+        """Ajoute le bloc metadata.timings d'un candidat aux agrégats"""
+        durations = dict(timings.get('stages', {}))
+        for section, duration in timings.get('sections', {}).items():
+            durations[f"section.{section}"] = duration
+        if 'total' in timings:
+            durations['total'] = timings['total']
+
+        with self._lock:
+            for stage, duration in durations.items():
+                histogram = self._histograms.get(stage)
+                if histogram is None:
+                    histogram = self._histograms[stage] = Histogram(self.buckets)
+                histogram.observe(duration)
+            for name, value in timings.get('counters', {}).items():
+                self._counters[name] = self._counters.get(name, 0) + value
+            self._counters['candidates'] = self._counters.get('candidates', 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retourne l'état des agrégats (sérialisable en JSON)"""
+        with self._lock:
+            return {
+                'durationsMs': {stage: histogram.snapshot() for stage, histogram in self._histograms.items()},
+                'counters': dict(self._counters)
+            }
+
+    def drain(self) -> Dict[str, Any]:
+        """Retourne l'état des agrégats puis les remet à zéro (transfert vers un autre processus)"""
+        with self._lock:
+            snapshot = {
+                'durationsMs': {stage: histogram.snapshot() for stage, histogram in self._histograms.items()},
+                'counters': dict(self._counters)
+            }
+            self._histograms.clear()
+            self._counters.clear()
+        return snapshot
+
+    def merge(self, snapshot: Dict[str, Any]) -> None:
+        """Ajoute aux agrégats un état produit par snapshot() ou drain() avec les mêmes bornes"""
+        with self._lock:
+            for stage, data in snapshot.get('durationsMs', {}).items():
+                histogram = self._histograms.get(stage)
+                if histogram is None:
+                    histogram = self._histograms[stage] = Histogram(self.buckets)
+                previous = 0
+                for index, (_, total) in enumerate(data['buckets']):
+                    histogram.counts[index] += total - previous
+                    previous = total
+                histogram.count += data['count']
+                histogram.sum += data['sum']
+            for name, value in snapshot.get('counters', {}).items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        """Remet les agrégats à zéro"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render_prometheus(self, prefix: str = 'candidate_parser') -> str:
+        """Exporte les agrégats au format texte de Prometheus"""
+        snapshot = self.snapshot()
+        lines: List[str] = [f"# TYPE {prefix}_stage_duration_ms histogram"]
+        for stage, histogram in sorted(snapshot['durationsMs'].items()):
+            for bound, count in histogram['buckets']:
+                lines.append(f'{prefix}_stage_duration_ms_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_stage_duration_ms_sum{{stage="{stage}"}} {histogram["sum"]}')
+            lines.append(f'{prefix}_stage_duration_ms_count{{stage="{stage}"}} {histogram["count"]}')
+
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+
+        return '\n'.join(lines) + '\n'
+
+
+# Agrégats du processus, alimentés par les parsers instrumentés
+PARSER_METRICS = ParserMetrics()
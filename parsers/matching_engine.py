@@ -0,0 +1,642 @@
+import re
+import math
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+
+# Règles de matching reprises de services/matching-algorithm.js, appliquées à des matrices
+# candidats × offres au lieu d'une paire à la fois
+
+DEFAULT_WEIGHTS = {
+    'skills': 0.35,
+    'experience': 0.20,
+    'location': 0.15,
+    'remotePreference': 0.10,
+    'contractType': 0.10,
+    'salary': 0.10
+}
+
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'react js': 'react',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'vue': 'vue.js',
+    'vuejs': 'vue.js',
+    'angular': 'angular.js',
+    'angularjs': 'angular.js',
+    'py': 'python',
+    'golang': 'go',
+    'c#': 'csharp',
+    '.net': 'dotnet',
+    'aws': 'amazon web services',
+    'azure': 'microsoft azure',
+    'gcp': 'google cloud platform',
+    'postgre': 'postgresql',
+    'mongo': 'mongodb',
+    'html': 'html5',
+    'css': 'css3',
+    'ui': 'user interface',
+    'ux': 'user experience'
+}
+
+SKILL_LEVELS = {
+    'débutant': 1,
+    'junior': 1,
+    'notions': 1,
+    'basique': 1,
+    'intermédiaire': 2,
+    'moyen': 2,
+    'confirmé': 3,
+    'avancé': 3,
+    'senior': 3,
+    'expert': 4,
+    'maître': 4
+}
+DEFAULT_SKILL_LEVEL = 2
+MAX_SKILL_LEVEL = 4
+
+RELATED_TECHNOLOGIES = {
+    'javascript': ['typescript', 'react', 'angular.js', 'vue.js', 'node.js', 'express', 'jquery', 'webpack', 'babel'],
+    'typescript': ['javascript', 'react', 'angular.js', 'node.js'],
+    'react': ['javascript', 'typescript', 'redux', 'next.js', 'gatsby'],
+    'angular.js': ['javascript', 'typescript', 'rxjs'],
+    'vue.js': ['javascript', 'vuex', 'nuxt.js'],
+    'node.js': ['javascript', 'typescript', 'express', 'mongodb', 'sql', 'rest api'],
+    'html5': ['css3', 'javascript', 'responsive design'],
+    'css3': ['html5', 'sass', 'less', 'bootstrap', 'tailwind'],
+    'python': ['django', 'flask', 'fastapi', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch'],
+    'java': ['spring', 'hibernate', 'maven', 'gradle', 'junit'],
+    'csharp': ['dotnet', 'asp.net', 'entity framework', 'linq', 'xamarin'],
+    'php': ['laravel', 'symfony', 'wordpress', 'mysql'],
+    'ruby': ['rails', 'sinatra'],
+    'sql': ['mysql', 'postgresql', 'oracle', 'sql server'],
+    'nosql': ['mongodb', 'cassandra', 'redis', 'elasticsearch']
+}
+
+CITY_COORDINATES = {
+    'paris': (48.8566, 2.3522),
+    'lyon': (45.7578, 4.8320),
+    'marseille': (43.2965, 5.3698),
+    'toulouse': (43.6047, 1.4442),
+    'nice': (43.7102, 7.2620),
+    'nantes': (47.2184, -1.5536),
+    'strasbourg': (48.5734, 7.7521),
+    'montpellier': (43.6108, 3.8767),
+    'bordeaux': (44.8378, -0.5792),
+    'lille': (50.6292, 3.0573),
+    'rennes': (48.1173, -1.6778),
+    'reims': (49.2583, 4.0317),
+    'saint-etienne': (45.4397, 4.3872),
+    'toulon': (43.1242, 5.9280),
+    'grenoble': (45.1885, 5.7245),
+    'angers': (47.4784, -0.5632),
+    'dijon': (47.3220, 5.0415),
+    'nîmes': (43.8367, 4.3601),
+    'le mans': (48.0061, 0.1996)
+}
+DEFAULT_CITY = 'paris'
+EARTH_RADIUS_KM = 6371
+
+# Préférences de télétravail : lignes = candidat, colonnes = offre
+REMOTE_TYPES = ['100% télétravail', 'hybride', 'sur site', 'peu importe']
+REMOTE_COMPATIBILITY = np.array([
+    [1.0, 0.7, 0.3, 0.7],
+    [0.8, 1.0, 0.7, 0.7],
+    [0.4, 0.7, 1.0, 0.7],
+    [0.9, 0.9, 0.9, 0.7]
+])
+
+CONTRACT_TYPES = ['cdi', 'cdd', 'freelance', 'stage', 'alternance', 'intérim']
+CONTRACT_COMPATIBILITY = np.array([
+    [1.0, 0.6, 0.4, 0.2, 0.3, 0.3],
+    [0.8, 1.0, 0.5, 0.2, 0.3, 0.7],
+    [0.5, 0.6, 1.0, 0.2, 0.2, 0.7],
+    [0.3, 0.3, 0.2, 1.0, 0.7, 0.2],
+    [0.4, 0.4, 0.2, 0.7, 1.0, 0.2],
+    [0.3, 0.7, 0.6, 0.2, 0.2, 1.0]
+])
+
+SALARY_PERIOD_FACTORS = {'hourly': 35 * 52, 'daily': 220, 'monthly': 12}
+SALARY_CURRENCY_FACTORS = {'USD': 0.85, 'GBP': 1.15, 'EUR': 1.0}
+
+_SKILL_PUNCTUATION = re.compile(r'[^A-Za-z0-9_\s]')
+_WHITESPACE = re.compile(r'\s+')
+_NUMBER = re.compile(r'\d+[,.]?\d*')
+
+
+def normalize_skill_name(name: str) -> str:
+    """Normalise le nom d'une compétence pour la comparaison (alias et ponctuation)"""
+    if not name:
+        return ''
+    normalized = _WHITESPACE.sub(' ', _SKILL_PUNCTUATION.sub(' ', name.lower().strip()))
+    return SKILL_ALIASES.get(normalized, normalized)
+
+
+def skill_level_value(level: Any) -> int:
+    """Convertit un libellé de niveau de compétence en valeur numérique"""
+    if not level:
+        return DEFAULT_SKILL_LEVEL
+    if isinstance(level, dict) and level.get('value'):
+        return level['value']
+    return SKILL_LEVELS.get(str(level).lower().strip(), DEFAULT_SKILL_LEVEL)
+
+
+def skill_level_match(candidate_level: int, required_level: int) -> float:
+    """Score d'une compétence requise possédée par le candidat, selon l'écart de niveau"""
+    if candidate_level >= required_level:
+        return 1.0
+    return max(0.3, 1 - (required_level - candidate_level) * 0.3)
+
+
+def normalize_remote_preference(preference: Any) -> str:
+    """Ramène une préférence de télétravail à l'une des valeurs de REMOTE_TYPES"""
+    if not preference:
+        return 'peu importe'
+    normalized = str(preference).lower().strip()
+    if re.search(r'100%|full|complet|total', normalized) and re.search(r'télétravail|remote|à distance', normalized):
+        return '100% télétravail'
+    if re.search(r'hybride|hybrid|mixte|partiel', normalized):
+        return 'hybride'
+    if re.search(r'sur site|on site|présentiel', normalized):
+        return 'sur site'
+    return 'peu importe'
+
+
+def normalize_contract_type(contract_type: Any) -> str:
+    """Ramène un type de contrat à l'une des valeurs de CONTRACT_TYPES"""
+    if not contract_type:
+        return 'cdi'
+    normalized = str(contract_type).lower().strip()
+    for pattern, value in ((r'cdi|indéterminée|indeterminee', 'cdi'),
+                           (r'cdd|déterminée|determinee', 'cdd'),
+                           (r'freelance|consultant|indépendant|independant', 'freelance'),
+                           (r'stage|intern', 'stage'),
+                           (r'alternance|apprentissage', 'alternance'),
+                           (r'intérim|interim|temporaire', 'intérim')):
+        if re.search(pattern, normalized):
+            return value
+    return 'cdi'
+
+
+def city_coordinates(location: str) -> Optional[Tuple[float, float]]:
+    """Coordonnées approximatives d'une grande ville française (Paris par défaut)"""
+    if not location:
+        return None
+    normalized = location.lower().strip()
+    for city, coordinates in CITY_COORDINATES.items():
+        if city in normalized:
+            return coordinates
+    return CITY_COORDINATES[DEFAULT_CITY]
+
+
+def parse_salary_text(salary_text: Any) -> Optional[Dict[str, Any]]:
+    """Extrait la fourchette de salaire d'un texte d'offre"""
+    if not salary_text:
+        return None
+    normalized = str(salary_text).lower().strip()
+
+    currency = 'EUR'
+    if '$' in normalized or 'usd' in normalized:
+        currency = 'USD'
+    elif '£' in normalized or 'gbp' in normalized:
+        currency = 'GBP'
+
+    period = 'yearly'
+    if re.search(r'mois|mensuel|month|monthly', normalized):
+        period = 'monthly'
+    elif re.search(r'jour|daily|day', normalized):
+        period = 'daily'
+    elif re.search(r'heure|horaire|hour|hourly', normalized):
+        period = 'hourly'
+
+    numbers = _NUMBER.findall(normalized)
+    if not numbers:
+        return None
+
+    multiplier = 1000 if 'k' in normalized else 1
+    values = [float(number.replace(',', '.')) * multiplier for number in numbers]
+    if len(values) == 1:
+        return {'min': values[0], 'max': None, 'currency': currency, 'period': period}
+    return {'min': min(values), 'max': max(values), 'currency': currency, 'period': period}
+
+
+def annual_salary(salary: Optional[Dict[str, Any]]) -> Tuple[float, float]:
+    """Convertit une fourchette de salaire en euros annuels (NaN pour une borne absente)"""
+    if not salary:
+        return math.nan, math.nan
+    # Fourchette déjà annualisée en euros par le parser
+    if 'annualMin' in salary or 'annualMax' in salary:
+        minimum, maximum = salary.get('annualMin'), salary.get('annualMax')
+        return (minimum if minimum is not None else math.nan,
+                maximum if maximum is not None else math.nan)
+    factor = SALARY_PERIOD_FACTORS.get(salary.get('period'), 1) * SALARY_CURRENCY_FACTORS.get(salary.get('currency'), 1)
+    minimum, maximum = salary.get('min'), salary.get('max')
+    return (minimum * factor if minimum is not None else math.nan,
+            maximum * factor if maximum is not None else math.nan)
+
+
+def _parsed(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Accepte indifféremment un résultat de process_candidate_data ou la sortie de ResponseParser"""
+    return candidate.get('parsedData', candidate)
+
+
+def _job_skills(job: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """Compétences requises d'une offre, sous forme (nom normalisé, niveau)"""
+    skills = []
+    if isinstance(job.get('requiredSkills'), list):
+        for skill in job['requiredSkills']:
+            if isinstance(skill, str):
+                skills.append((normalize_skill_name(skill), DEFAULT_SKILL_LEVEL))
+            else:
+                skills.append((normalize_skill_name(skill.get('name')), skill_level_value(skill.get('level'))))
+    elif isinstance(job.get('requirements'), str):
+        for token in re.split(r'[,;]', job['requirements']):
+            skills.append((normalize_skill_name(token.strip()), DEFAULT_SKILL_LEVEL))
+    return skills
+
+
+def _job_experience(job: Dict[str, Any]) -> float:
+    """Années d'expérience requises par une offre"""
+    experience = job.get('experience')
+    if isinstance(experience, (int, float)) and not isinstance(experience, bool) and experience:
+        return float(experience)
+    if isinstance(experience, str) and experience:
+        range_match = re.search(r'(\d+)\s*-\s*(\d+)', experience)
+        if range_match:
+            return float(range_match.group(1))
+        years_match = re.search(r'(\d+)\s*(?:ans|an|années|année|years|year)', experience, re.IGNORECASE)
+        if years_match:
+            return float(years_match.group(1))
+        for pattern, years in ((r'débutant|junior', 1), (r'confirmé|intermédiaire|mid', 3),
+                               (r'senior|expérimenté', 5), (r'expert', 8)):
+            if re.search(pattern, experience, re.IGNORECASE):
+                return float(years)
+    return 2.0
+
+
+def _is_remote_job(job: Dict[str, Any]) -> bool:
+    """Indique si l'offre est en télétravail complet"""
+    if job.get('type') in ('remote', 'télétravail'):
+        return True
+    if job.get('title') and re.search(r'télétravail|remote|à distance', job['title'], re.IGNORECASE):
+        return True
+    if job.get('description') and re.search(r'100%\s*télétravail|full\s*remote|entièrement à distance',
+                                            job['description'], re.IGNORECASE):
+        return True
+    return False
+
+
+def _job_remote_policy(job: Dict[str, Any]) -> str:
+    """Politique de télétravail de l'offre"""
+    if job.get('type') in ('remote', 'télétravail'):
+        return '100% télétravail'
+    if job.get('remotePolicy'):
+        return normalize_remote_preference(job['remotePolicy'])
+    title = job.get('title')
+    if title:
+        if re.search(r'télétravail|remote|à distance', title, re.IGNORECASE):
+            return '100% télétravail'
+        if re.search(r'hybride|hybrid', title, re.IGNORECASE):
+            return 'hybride'
+    description = job.get('description')
+    if description:
+        if re.search(r'100%\s*télétravail|full\s*remote|entièrement à distance', description, re.IGNORECASE):
+            return '100% télétravail'
+        if re.search(r'hybride|hybrid|télétravail partiel|jours? de télétravail', description, re.IGNORECASE):
+            return 'hybride'
+        if re.search(r'sur site|on site|présentiel complet', description, re.IGNORECASE):
+            return 'sur site'
+    return 'sur site'
+
+
+def _coordinates(value: Any) -> Optional[Tuple[float, float]]:
+    """Lit des coordonnées {lat, lng} ou (lat, lng)"""
+    if not value:
+        return None
+    if isinstance(value, dict):
+        return value.get('lat'), value.get('lng')
+    return tuple(value)
+
+
+def _location_columns(locations: List[Optional[Tuple[float, float]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Colonnes latitude/longitude (NaN si absentes) et masque des localisations connues"""
+    known = np.array([location is not None for location in locations], dtype=bool)
+    lat = np.array([location[0] if location and location[0] else np.nan for location in locations], dtype=np.float64)
+    lng = np.array([location[1] if location and location[1] else np.nan for location in locations], dtype=np.float64)
+    return lat, lng, known
+
+
+class BatchMatcher:
+    """Calcule les scores de matching de tous les candidats contre un ensemble d'offres"""
+
+    def __init__(self, jobs: List[Dict[str, Any]], weights: Optional[Dict[str, float]] = None):
+        self.jobs = jobs
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self._encode_jobs(jobs)
+
+    def _encode_jobs(self, jobs: List[Dict[str, Any]]) -> None:
+        """Encode les offres en tableaux NumPy"""
+        job_count = len(jobs)
+        job_skills = [_job_skills(job) for job in jobs]
+
+        # Seules les compétences requises ou liées à une offre peuvent influencer le score :
+        # le vocabulaire (et donc la largeur des matrices candidats) s'y limite
+        related = [set() for _ in jobs]
+        vocabulary: Dict[str, int] = {}
+        for j, skills in enumerate(job_skills):
+            required_names = {name for name, _ in skills}
+            for name in required_names:
+                related[j].update(RELATED_TECHNOLOGIES.get(name, []))
+            related[j] -= required_names
+            for name in required_names | related[j]:
+                vocabulary.setdefault(name, len(vocabulary))
+        self.vocabulary = vocabulary
+
+        # level_scores[l][v, j] : contribution d'un candidat de niveau l sur la compétence v pour l'offre j
+        vocabulary_size = len(vocabulary)
+        self.level_scores = np.zeros((MAX_SKILL_LEVEL + 1, vocabulary_size, job_count), dtype=np.float32)
+        self.related_skills = np.zeros((vocabulary_size, job_count), dtype=np.float32)
+        self.required_count = np.zeros(job_count, dtype=np.float32)
+
+        for j, skills in enumerate(job_skills):
+            self.required_count[j] = len(skills)
+            for name, required_level in skills:
+                v = vocabulary[name]
+                for level in range(1, MAX_SKILL_LEVEL + 1):
+                    self.level_scores[level, v, j] += skill_level_match(level, required_level)
+            for name in related[j]:
+                self.related_skills[vocabulary[name], j] = 1.0
+
+        self.job_experience = np.array([_job_experience(job) for job in jobs], dtype=np.float64)
+
+        locations = []
+        for job in jobs:
+            coordinates = _coordinates(job.get('locationCoordinates'))
+            locations.append(coordinates or city_coordinates(job.get('location')))
+        self.job_lat, self.job_lng, self.job_has_location = _location_columns(locations)
+        self.job_is_remote = np.array([_is_remote_job(job) for job in jobs], dtype=bool)
+
+        self.job_remote = np.array([REMOTE_TYPES.index(_job_remote_policy(job)) for job in jobs], dtype=np.intp)
+        self.job_contract = np.array([
+            CONTRACT_TYPES.index(normalize_contract_type(job.get('contractType') or job.get('type')))
+            for job in jobs
+        ], dtype=np.intp)
+
+        salaries = [parse_salary_text(job.get('salaryExpectation') or job.get('salary')) for job in jobs]
+        self.job_has_salary = np.array([salary is not None for salary in salaries], dtype=bool)
+        annual = np.array([annual_salary(salary) for salary in salaries], dtype=np.float64).reshape(-1, 2)
+        self.job_salary_min, self.job_salary_max = annual[:, 0], annual[:, 1]
+
+    def encode_candidates(self, candidates: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Encode des candidats (sortie du parser) en tableaux NumPy alignés sur le vocabulaire des offres"""
+        count = len(candidates)
+        vocabulary = self.vocabulary
+        skill_levels = np.zeros((count, len(vocabulary)), dtype=np.int8)
+        skill_counts = np.zeros((count, len(vocabulary)), dtype=np.float32)
+        has_skills = np.zeros(count, dtype=bool)
+        experience = np.full(count, 2.0)
+        relocate = np.zeros(count, dtype=bool)
+        remote = np.empty(count, dtype=np.intp)
+        contract = np.empty(count, dtype=np.intp)
+        has_salary = np.zeros(count, dtype=bool)
+        salary = np.full((count, 2), np.nan)
+        locations = []
+
+        for i, candidate in enumerate(candidates):
+            parsed = _parsed(candidate)
+            skills = parsed.get('skills', {}).get('normalized', {})
+            job_prefs = parsed.get('jobPreferences', {})
+            normalized_prefs = job_prefs.get('normalized', {})
+
+            names = skills.get('technicalSkills', [])
+            levels = skills.get('technicalSkillLevels', {})
+            has_skills[i] = bool(names)
+            for name in names:
+                level_info = levels.get(name)
+                level = skill_level_value(level_info.get('level') if level_info else None)
+                v = vocabulary.get(normalize_skill_name(name))
+                if v is None:
+                    continue
+                # Le premier niveau déclaré pour une compétence est celui retenu
+                if skill_counts[i, v] == 0:
+                    skill_levels[i, v] = level
+                skill_counts[i, v] += 1
+
+            years = (parsed.get('experience') or {}).get('years')
+            if years:
+                experience[i] = float(years)
+
+            coordinates = _coordinates(job_prefs.get('locationCoordinates'))
+            locations.append(coordinates or city_coordinates(job_prefs.get('location')))
+            relocate[i] = parsed.get('availability', {}).get('normalized', {}).get('relocateWilling') is True
+
+            remote[i] = REMOTE_TYPES.index(normalize_remote_preference(normalized_prefs.get('remotePreference')))
+            contract[i] = CONTRACT_TYPES.index(normalize_contract_type(normalized_prefs.get('contractType')))
+
+            salary_info = normalized_prefs.get('salaryExpectation')
+            if salary_info:
+                has_salary[i] = True
+                salary[i] = annual_salary(salary_info)
+
+        lat, lng, has_location = _location_columns(locations)
+        return {
+            'skill_levels': skill_levels,
+            'skill_counts': skill_counts,
+            'has_skills': has_skills,
+            'experience': experience,
+            'lat': lat,
+            'lng': lng,
+            'has_location': has_location,
+            'relocate': relocate,
+            'remote': remote,
+            'contract': contract,
+            'has_salary': has_salary,
+            'salary_min': salary[:, 0],
+            'salary_max': salary[:, 1]
+        }
+
+    def score(self, candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """Matrice des scores globaux (candidats × offres), entre 0 et 1"""
+        return self.score_encoded(self.encode_candidates(candidates))
+
+    def score_encoded(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        """Matrice des scores globaux à partir de candidats déjà encodés"""
+        weights = self.weights
+        total = weights['skills'] * self._skills_scores(encoded)
+        total += weights['experience'] * self._experience_scores(encoded)
+        total += weights['location'] * self._location_scores(encoded)
+        total += weights['remotePreference'] * REMOTE_COMPATIBILITY[np.ix_(encoded['remote'], self.job_remote)]
+        total += weights['contractType'] * CONTRACT_COMPATIBILITY[np.ix_(encoded['contract'], self.job_contract)]
+        total += weights['salary'] * self._salary_scores(encoded)
+        return total
+
+    def top_k_per_job(self, candidates: List[Dict[str, Any]], k: int = 10,
+                      block_size: int = 10000) -> List[List[Tuple[int, float]]]:
+        """Pour chaque offre, les k meilleurs candidats sous forme (index du candidat, score)"""
+        job_count = len(self.jobs)
+        best_scores = np.empty((0, job_count))
+        best_indices = np.empty((0, job_count), dtype=np.intp)
+
+        # Traitement par blocs de candidats : la matrice complète n'est jamais matérialisée
+        for start in range(0, len(candidates), block_size):
+            block = self.score(candidates[start:start + block_size])
+            indices = np.broadcast_to(np.arange(start, start + block.shape[0])[:, None], block.shape)
+            scores = np.vstack([best_scores, block])
+            indices = np.vstack([best_indices, indices])
+            if scores.shape[0] > k:
+                keep = np.argpartition(-scores, k - 1, axis=0)[:k]
+                scores = np.take_along_axis(scores, keep, axis=0)
+                indices = np.take_along_axis(indices, keep, axis=0)
+            best_scores, best_indices = scores, indices
+
+        return [self._ranked(best_indices[:, j], best_scores[:, j]) for j in range(job_count)]
+
+    def top_k_per_candidate(self, candidates: List[Dict[str, Any]], k: int = 10,
+                            block_size: int = 10000) -> List[List[Tuple[int, float]]]:
+        """Pour chaque candidat, les k meilleures offres sous forme (index de l'offre, score)"""
+        results = []
+        k = min(k, len(self.jobs))
+        for start in range(0, len(candidates), block_size):
+            block = self.score(candidates[start:start + block_size])
+            keep = np.argpartition(-block, k - 1, axis=1)[:, :k] if k < block.shape[1] else \
+                np.broadcast_to(np.arange(block.shape[1]), block.shape)
+            scores = np.take_along_axis(block, keep, axis=1)
+            results.extend(self._ranked(keep[i], scores[i]) for i in range(block.shape[0]))
+        return results
+
+    @staticmethod
+    def _ranked(indices: np.ndarray, scores: np.ndarray) -> List[Tuple[int, float]]:
+        """Trie par score décroissant (à score égal, par index croissant)"""
+        order = np.lexsort((indices, -scores))
+        return [(int(indices[position]), float(scores[position])) for position in order]
+
+    def _skills_scores(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        """Score de compétences : niveaux pondérés des compétences requises et bonus des compétences liées"""
+        levels = encoded['skill_levels']
+        weighted_match = np.zeros((levels.shape[0], len(self.jobs)), dtype=np.float32)
+        for level in range(1, MAX_SKILL_LEVEL + 1):
+            weighted_match += (levels == level).astype(np.float32) @ self.level_scores[level]
+
+        extra_bonus = np.minimum(0.2, (encoded['skill_counts'] @ self.related_skills) * 0.05)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.minimum(1.0, weighted_match.astype(np.float64) / self.required_count + extra_bonus)
+        scores = np.where(self.required_count > 0, ratio, 0.5)
+        return np.where(encoded['has_skills'][:, None], scores, 0.0)
+
+    def _experience_scores(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        """Score d'expérience selon le ratio années du candidat / années requises"""
+        return _factorized_scores([encoded['experience']], [self.job_experience], _experience_table)
+
+    def _location_scores(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        """Score de localisation selon la distance (formule de Haversine)"""
+        return _factorized_scores(
+            [encoded['lat'], encoded['lng'], encoded['has_location'], encoded['relocate']],
+            [self.job_lat, self.job_lng, self.job_has_location, self.job_is_remote],
+            _location_table
+        )
+
+    def _salary_scores(self, encoded: Dict[str, np.ndarray]) -> np.ndarray:
+        """Score de salaire selon le recouvrement des fourchettes annuelles"""
+        return _factorized_scores(
+            [encoded['salary_min'], encoded['salary_max'], encoded['has_salary']],
+            [self.job_salary_min, self.job_salary_max, self.job_has_salary],
+            _salary_table
+        )
+
+
+def _unique_rows(columns: List[np.ndarray]) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Valeurs distinctes d'un ensemble de colonnes et index de chaque ligne dans ces valeurs"""
+    keys = np.ascontiguousarray(np.column_stack(columns).astype(np.float64))
+    # Comparaison octet par octet : deux NaN identiques sont considérés égaux
+    rows = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    unique = keys[first]
+    return [unique[:, c].astype(column.dtype) for c, column in enumerate(columns)], inverse.ravel()
+
+
+def _factorized_scores(candidate_columns: List[np.ndarray], job_columns: List[np.ndarray], table_function) -> np.ndarray:
+    """Calcule un score sur les seules combinaisons distinctes de valeurs, puis le redistribue à toutes les paires
+
+    Les critères autres que les compétences ne dépendent que de quelques colonnes dont les valeurs
+    se répètent beaucoup (villes, fourchettes de salaire, années d'expérience) : la table des
+    valeurs distinctes est petite et la matrice finale n'est qu'une indexation.
+    """
+    candidate_unique, candidate_inverse = _unique_rows(candidate_columns)
+    job_unique, job_inverse = _unique_rows(job_columns)
+    table = table_function([column[:, None] for column in candidate_unique],
+                           [column[None, :] for column in job_unique])
+    table = np.broadcast_to(table, (len(candidate_unique[0]), len(job_unique[0])))
+    return table[np.ix_(candidate_inverse, job_inverse)]
+
+
+def _experience_table(candidate: List[np.ndarray], job: List[np.ndarray]) -> np.ndarray:
+    """Score d'expérience pour chaque couple (années du candidat, années requises)"""
+    (candidate_years,), (required_years,) = candidate, job
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = candidate_years / required_years
+    return np.select(
+        [(candidate_years >= required_years) & (required_years < 2) & (candidate_years > 5),
+         candidate_years >= required_years,
+         ratio >= 0.8,
+         ratio >= 0.6],
+        [0.8, 1.0, 0.9, 0.7],
+        default=np.maximum(0.1, ratio)
+    )
+
+
+def _location_table(candidate: List[np.ndarray], job: List[np.ndarray]) -> np.ndarray:
+    """Score de localisation pour chaque couple de localisations distinctes"""
+    candidate_lat, candidate_lng, candidate_known, relocate = candidate
+    job_lat, job_lng, job_known, job_is_remote = job
+
+    lat1, lng1 = np.radians(candidate_lat), np.radians(candidate_lng)
+    lat2, lng2 = np.radians(job_lat), np.radians(job_lng)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    distance = EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    # Coordonnées incomplètes : distance arbitrairement grande
+    distance = np.where(np.isnan(distance), 9999.0, distance)
+
+    same_location = (np.abs(candidate_lat - job_lat) < 0.01) & (np.abs(candidate_lng - job_lng) < 0.01)
+    missing = ~candidate_known.astype(bool) | ~job_known.astype(bool)
+
+    return np.select(
+        [missing, job_is_remote.astype(bool), same_location,
+         distance <= 10, distance <= 30, distance <= 50, distance <= 100],
+        [0.5, 0.9, 1.0, 0.95, 0.8, 0.6, 0.4],
+        default=np.where(relocate.astype(bool), 0.7, 0.2)
+    )
+
+
+def _salary_table(candidate: List[np.ndarray], job: List[np.ndarray]) -> np.ndarray:
+    """Score de salaire pour chaque couple de fourchettes annuelles distinctes"""
+    candidate_min, candidate_max, candidate_known = candidate
+    job_min, job_max, job_known = job
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        candidate_range = np.where(np.isnan(candidate_max) | (candidate_max == 0),
+                                   candidate_min * 1.2, candidate_max) - candidate_min
+        overlap_score = np.minimum(1.0, np.maximum(0.6, (job_max - candidate_min) / candidate_range))
+        overlap_score = np.where(np.isnan(overlap_score), 1.0, overlap_score)
+        far_score = np.maximum(0.3, 1 - (candidate_min - job_max) / job_max)
+
+    missing = ~candidate_known.astype(bool) | ~job_known.astype(bool)
+    no_job_max = np.isnan(job_max)
+
+    return np.select(
+        [missing,
+         np.isnan(candidate_min),
+         no_job_max & (candidate_min <= job_min * 1.2),
+         no_job_max,
+         (candidate_min <= job_min) & (np.isnan(candidate_max) | (candidate_max <= job_max)),
+         candidate_min <= job_max,
+         candidate_min <= job_max * 1.1],
+        [0.7, 0.8, 0.9, 0.6, 1.0, overlap_score, 0.7],
+        default=far_score
+    )
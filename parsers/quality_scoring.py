@@ -0,0 +1,137 @@
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Qualité des données d'un lot de candidats (distributions et percentiles du tableau de bord) :
+# la présence de chaque champ est codée par un bit, un entier par candidat, en un seul passage ;
+# les scores de section et le score global sont ensuite des opérations sur les tableaux.
+# Avec les poids par défaut, les scores sont identiques (au bit près) à ceux de
+# ResponseParser._calculate_data_quality.
+
+# Champs comptés par section : (nom, champs source) ; un champ est présent si l'un de ses champs
+# source a une valeur non vide
+QUALITY_FIELDS: Dict[str, Tuple[Tuple[str, Tuple[str, ...]], ...]] = {
+    'jobPreferences': (
+        ('preferredRole', ('preferredRole',)),
+        ('contractType', ('contractType',)),
+        ('location', ('location',)),
+        ('remotePreference', ('remotePreference',)),
+        ('salaryExpectation', ('salaryExpectation',))
+    ),
+    'skills': (
+        ('technicalSkills', ('technicalSkills',)),
+        ('softSkills', ('softSkills',)),
+        ('languages', ('languages',))
+    ),
+    'availability': (
+        ('currentlyEmployed', ('currentlyEmployed',)),
+        ('interviewAvailability', ('interviewAvailability',)),
+        ('reason', ('jobSearchReason', 'jobEndReason'))
+    ),
+    'additional': (
+        ('motivation', ('motivation',)),
+        ('strengths', ('strengths',))
+    )
+}
+QUALITY_SECTIONS = tuple(QUALITY_FIELDS)
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class QualityScorer:
+    """Scores de qualité d'un lot de candidats parsés, avec des poids configurables par champ et par section"""
+
+    def __init__(self, field_weights: Optional[Dict[str, Dict[str, float]]] = None,
+                 section_weights: Optional[Dict[str, float]] = None):
+        field_weights = field_weights or {}
+        section_weights = section_weights or {}
+        unknown = set(field_weights) - set(QUALITY_SECTIONS) | set(section_weights) - set(QUALITY_SECTIONS)
+        if unknown:
+            raise ValueError(f"Sections inconnues: {sorted(unknown)}")
+
+        # Un bit par champ, dans l'ordre des sections puis des champs
+        self.fields: List[Tuple[str, str]] = []
+        self._sources: List[Tuple[str, Tuple[str, ...]]] = []
+        self._section_bits: Dict[str, List[int]] = {}
+        self._weights: Dict[str, np.ndarray] = {}
+        for section, fields in QUALITY_FIELDS.items():
+            weights = field_weights.get(section, {})
+            unknown = set(weights) - {name for name, _ in fields}
+            if unknown:
+                raise ValueError(f"Champs inconnus pour {section}: {sorted(unknown)}")
+            self._section_bits[section] = []
+            for name, sources in fields:
+                self._section_bits[section].append(len(self.fields))
+                self.fields.append((section, name))
+                self._sources.append((section, sources))
+            self._weights[section] = np.array([float(weights.get(name, 1.0)) for name, _ in fields])
+            if self._weights[section].sum() <= 0:
+                raise ValueError(f"La somme des poids de {section} doit être positive")
+        self.section_weights = {section: float(section_weights.get(section, 1.0)) for section in QUALITY_SECTIONS}
+        if sum(self.section_weights.values()) <= 0:
+            raise ValueError("La somme des poids des sections doit être positive")
+
+    def presence_bitmap(self, parsed_candidates: Iterable[Dict[str, Any]]) -> np.ndarray:
+        """Bitmap de présence des champs (uint32, bit i = self.fields[i]) de chaque candidat"""
+        # Par section : (champ source, bit) ; un champ à plusieurs sources a une entrée par source
+        sections = [(section, [(field, 1 << bit) for bit in self._section_bits[section]
+                               for field in self._sources[bit][1]])
+                    for section in QUALITY_SECTIONS]
+        bits = []
+        for parsed_data in parsed_candidates:
+            parsed_data = parsed_data.get('parsedData', parsed_data)
+            value = 0
+            for section, fields in sections:
+                data = parsed_data.get(section)
+                if data:
+                    get = data.get
+                    for field, bit in fields:
+                        if get(field):
+                            value |= bit
+            bits.append(value)
+        return np.array(bits, dtype=np.uint32)
+
+    def presence(self, bitmap: np.ndarray) -> np.ndarray:
+        """Matrice booléenne (candidats × champs) à partir d'un bitmap de présence"""
+        return ((bitmap[:, None] >> np.arange(len(self.fields), dtype=np.uint32)) & 1).astype(bool)
+
+    def scores_from_bitmap(self, bitmap: np.ndarray) -> Dict[str, np.ndarray]:
+        """Scores par section et score global (float64) à partir d'un bitmap de présence"""
+        presence = self.presence(bitmap)
+        scores: Dict[str, np.ndarray] = {}
+        for section in QUALITY_SECTIONS:
+            weights = self._weights[section]
+            filled = presence[:, self._section_bits[section]] @ weights
+            scores[section] = np.minimum(filled / weights.sum(), 1.0)
+
+        # Somme des sections dans l'ordre, comme _calculate_data_quality (mêmes arrondis)
+        overall = np.zeros(len(bitmap))
+        for section in QUALITY_SECTIONS:
+            overall = overall + scores[section] * self.section_weights[section]
+        scores['overall'] = overall / sum(self.section_weights.values())
+        return scores
+
+    def score_batch(self, parsed_candidates: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Scores de qualité d'un lot de candidats parsés (résultats de ResponseParser ou de process_candidate_data)"""
+        return self.scores_from_bitmap(self.presence_bitmap(parsed_candidates))
+
+    def fill_rates(self, bitmap: np.ndarray) -> Dict[str, float]:
+        """Taux de remplissage de chaque champ ("section.champ") sur le lot"""
+        if not len(bitmap):
+            return {f'{section}.{name}': 0.0 for section, name in self.fields}
+        rates = self.presence(bitmap).mean(axis=0)
+        return {f'{section}.{name}': float(rate) for (section, name), rate in zip(self.fields, rates)}
+
+    @staticmethod
+    def summary(scores: Dict[str, np.ndarray],
+                percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, float]]:
+        """Moyenne et percentiles de chaque score (distribution du tableau de bord)"""
+        result = {}
+        for key, values in scores.items():
+            if not len(values):
+                result[key] = {'mean': None, **{f'p{q:g}': None for q in percentiles}}
+                continue
+            result[key] = {'mean': float(values.mean()),
+                           **{f'p{q:g}': float(value) for q, value in zip(percentiles, np.percentile(values, percentiles))}}
+        return result
@@ -0,0 +1,203 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+# Niveau disque : limites par défaut, nombre d'écritures entre deux purges (la purge parcourt la
+# table) et attente maximale d'un verrou sqlite tenu par un autre processus, en secondes
+DEFAULT_DISK_MAX_ENTRIES = 100000
+DEFAULT_DISK_MAX_BYTES = 512 * 1024 * 1024
+DISK_PRUNE_INTERVAL = 256
+DISK_LOCK_TIMEOUT = 0.5
+
+
+def canonical_hash(payload: Any, version: str) -> str:
+    """Empreinte SHA-256 d'un payload JSON, indépendante de l'ordre des clés"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(f"{version}\n{canonical}".encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Cache LRU des résultats du parser, avec expiration, limite en octets et niveau disque optionnel"""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None, path: Optional[str] = None, version: str = '',
+                 disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES, disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        # La version du parser fait partie de la clé : une nouvelle version invalide le cache
+        self.version = version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+
+        # Les valeurs sont stockées sérialisées : la taille est connue et un appelant
+        # qui modifie un résultat ne peut pas altérer l'entrée en cache
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'diskHits': 0,
+            'diskEvictions': 0,
+            'diskErrors': 0
+        }
+
+        # Niveau disque (sqlite) : survit aux redémarrages des workers. Il peut être partagé par
+        # plusieurs processus : une erreur sqlite (base verrouillée...) compte comme un échec du
+        # cache, jamais comme un échec de la requête.
+        self._db = None
+        self._writes = 0
+        if path:
+            self._open_disk(path)
+
+    def _open_disk(self, path: str) -> None:
+        """Ouvre le niveau disque ; en cas d'échec (chemin invalide, base verrouillée ou corrompue), le cache reste en mémoire"""
+        import sqlite3
+        self._db_error = sqlite3.Error
+        db = None
+        try:
+            db = sqlite3.connect(path, timeout=DISK_LOCK_TIMEOUT, check_same_thread=False)
+            db.execute('CREATE TABLE IF NOT EXISTS results '
+                       '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)')
+            db.commit()
+        except sqlite3.Error:
+            self._counters['diskErrors'] += 1
+            if db is not None:
+                db.close()
+            return
+        self._db = db
+        with self._lock:
+            self._prune_disk()
+
+    def key_for(self, payload: Any) -> str:
+        """Clé de cache d'un payload (empreinte canonique + version du parser)"""
+        return canonical_hash(payload, self.version)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retourne le résultat associé à la clé, ou None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, expires_at = entry
+                if expires_at is None or expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return json.loads(value)
+                self._remove(key)
+                self._counters['expirations'] += 1
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute('SELECT value, expires_at FROM results WHERE key = ?', (key,)).fetchone()
+                except self._db_error:
+                    self._counters['diskErrors'] += 1
+                    row = None
+                if row is not None and (row[1] is None or row[1] >= now):
+                    self._store(key, row[0], row[1])
+                    self._counters['hits'] += 1
+                    self._counters['diskHits'] += 1
+                    return json.loads(row[0])
+
+            self._counters['misses'] += 1
+            return None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Enregistre un résultat sous la clé donnée"""
+        value = json.dumps(result, ensure_ascii=False)
+        expires_at = time.time() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._db is not None:
+                try:
+                    self._db.execute('INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)',
+                                     (key, value, expires_at))
+                    self._db.commit()
+                except self._db_error:
+                    self._counters['diskErrors'] += 1
+                    self._rollback()
+                    return
+                self._writes += 1
+                if self._writes % DISK_PRUNE_INTERVAL == 0:
+                    self._prune_disk()
+
+    def clear(self) -> None:
+        """Vide le cache (mémoire et disque)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                try:
+                    self._db.execute('DELETE FROM results')
+                    self._db.commit()
+                except self._db_error:
+                    self._counters['diskErrors'] += 1
+                    self._rollback()
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs d'utilisation du cache"""
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+
+    def close(self) -> None:
+        """Ferme le niveau disque"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _prune_disk(self) -> None:
+        """Supprime du niveau disque les entrées expirées, puis les plus anciennes au-delà des limites"""
+        try:
+            self._db.execute('DELETE FROM results WHERE expires_at IS NOT NULL AND expires_at < ?', (time.time(),))
+            # Les entrées les plus récentes (rowid le plus grand) sont gardées
+            evicted = self._db.execute(
+                'DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY rowid DESC LIMIT -1 OFFSET ?)',
+                (self.disk_max_entries,)
+            ).rowcount
+            evicted += self._db.execute(
+                'DELETE FROM results WHERE rowid IN (SELECT rowid FROM '
+                '(SELECT rowid, SUM(length(CAST(value AS BLOB))) OVER (ORDER BY rowid DESC) AS total FROM results) '
+                'WHERE total > ?)',
+                (self.disk_max_bytes,)
+            ).rowcount
+            self._db.commit()
+        except self._db_error:
+            self._counters['diskErrors'] += 1
+            self._rollback()
+            return
+        self._counters['diskEvictions'] += max(evicted, 0)
+
+    def _rollback(self) -> None:
+        try:
+            self._db.rollback()
+        except self._db_error:
+            pass
+
+    def _store(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        """Ajoute une entrée en mémoire puis évince les plus anciennes au-delà des limites"""
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, expires_at)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._counters['evictions'] += 1
+
+    def _remove(self, key: str) -> None:
+        """Retire une entrée de la mémoire"""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
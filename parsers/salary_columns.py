@@ -0,0 +1,85 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from candidate_parser import ResponseParser, SALARY_PERIOD_FACTORS, SALARY_CURRENCY_RATES
+from columnar_snapshot import SALARY_PERIODS, SALARY_CURRENCIES, MISSING_CODE
+
+
+# Normalisation des prétentions salariales par colonnes entières : chaque texte distinct est
+# analysé une seule fois avec les règles de ResponseParser._normalize_salary, puis la conversion
+# en euros annuels et les filtres par fourchette se font sur des tableaux NumPy.
+
+
+def _lookup(table: tuple, factors: Dict[str, float]) -> np.ndarray:
+    """Facteur par code (indexé sur un octet) ; un code absent ou inconnu compte pour 1"""
+    values = np.ones(MISSING_CODE + 1)
+    for code, name in enumerate(table):
+        values[code] = factors.get(name, 1)
+    return values
+
+
+def parse_salary_column(texts: Iterable[str], parser: Optional[ResponseParser] = None) -> Dict[str, np.ndarray]:
+    """Analyse une colonne de textes de salaire : min/max bruts (NaN si absent), codes de période et de devise"""
+    parser = parser or ResponseParser()
+    distinct: Dict[str, int] = {}
+    inverse = np.fromiter((distinct.setdefault(text, len(distinct)) for text in texts), dtype=np.intp)
+
+    count = len(distinct)
+    minimum = np.full(count, np.nan)
+    maximum = np.full(count, np.nan)
+    periods = np.full(count, MISSING_CODE, dtype=np.uint8)
+    currencies = np.full(count, MISSING_CODE, dtype=np.uint8)
+    for position, text in enumerate(distinct):
+        try:
+            salary = parser._normalize_salary(text)
+        except ValueError:
+            # Montant illisible (ex. "45,5" sans k) : le parser échouerait, la ligne reste vide
+            continue
+        if salary['min'] is not None:
+            minimum[position] = salary['min']
+        if salary['max'] is not None:
+            maximum[position] = salary['max']
+        if salary['period'] in SALARY_PERIODS:
+            periods[position] = SALARY_PERIODS.index(salary['period'])
+        if salary['currency'] in SALARY_CURRENCIES:
+            currencies[position] = SALARY_CURRENCIES.index(salary['currency'])
+
+    return {
+        'min': minimum[inverse],
+        'max': maximum[inverse],
+        'period': periods[inverse],
+        'currency': currencies[inverse]
+    }
+
+
+def annualize(minimum: np.ndarray, maximum: np.ndarray, periods: np.ndarray, currencies: np.ndarray,
+              period_factors: Optional[Dict[str, float]] = None,
+              currency_rates: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Convertit des colonnes min/max en euros annuels (mêmes facteurs et même arrondi que le parser)"""
+    factor = (_lookup(SALARY_PERIODS, period_factors or SALARY_PERIOD_FACTORS)[periods]
+              * _lookup(SALARY_CURRENCIES, currency_rates or SALARY_CURRENCY_RATES)[currencies])
+    return np.asarray(minimum) * factor, np.asarray(maximum) * factor
+
+
+def normalize_salary_column(texts: Iterable[str],
+                            period_factors: Optional[Dict[str, float]] = None,
+                            currency_rates: Optional[Dict[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Salaires annuels en euros (min, max) d'une colonne de textes ; NaN pour une borne absente"""
+    columns = parse_salary_column(texts)
+    return annualize(columns['min'], columns['max'], columns['period'], columns['currency'],
+                     period_factors, currency_rates)
+
+
+def salary_range_mask(annual_min: np.ndarray, annual_max: np.ndarray,
+                      low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+    """Candidats dont la fourchette annuelle recoupe [low, high] (une seule borne suffit, sans salaire : exclu)"""
+    annual_min = np.asarray(annual_min)
+    # Sans maximum, la fourchette se réduit au minimum déclaré
+    annual_max = np.where(np.isnan(annual_max), annual_min, annual_max)
+    mask = ~np.isnan(annual_min)
+    if high is not None:
+        mask &= annual_min <= high
+    if low is not None:
+        mask &= annual_max >= low
+    return mask
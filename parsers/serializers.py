@@ -0,0 +1,165 @@
+import json
+import struct
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+# Couche de sérialisation des résultats du parser. Le profil par défaut reste json.dumps de la
+# bibliothèque standard (sortie identique octet pour octet) ; orjson, msgspec et msgpack sont
+# optionnels et importés seulement quand un profil qui les utilise est demandé, pour ne pas
+# alourdir le démarrage des workers.
+
+
+class JsonSerializer:
+    """JSON de la bibliothèque standard, identique à json.dumps(..., ensure_ascii=False)"""
+
+    name = 'json'
+    backend = 'json'
+    binary = False
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    def dumpb(self, value: Any) -> bytes:
+        return self.dumps(value).encode('utf-8')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class FastJsonSerializer(JsonSerializer):
+    """JSON compact via orjson ou msgspec s'ils sont installés, sinon bibliothèque standard compacte
+
+    Le texte diffère du profil par défaut (pas d'espaces, NaN écrit null avec orjson) mais
+    décode vers les mêmes valeurs.
+    """
+
+    name = 'json-fast'
+
+    def __init__(self):
+        self._encode = self._decode = None
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+        if orjson is not None:
+            self.backend = 'orjson'
+            options = orjson.OPT_NON_STR_KEYS
+            self._encode = lambda value: orjson.dumps(value, option=options)
+            self._decode = orjson.loads
+            return
+        try:
+            import msgspec
+        except ImportError:
+            msgspec = None
+        if msgspec is not None:
+            self.backend = 'msgspec'
+            self._encode = msgspec.json.encode
+            self._decode = msgspec.json.decode
+            return
+        self.backend = 'json'
+
+    def dumpb(self, value: Any) -> bytes:
+        if self._encode is not None:
+            try:
+                return self._encode(value)
+            except TypeError:
+                # Valeur non prise en charge par le backend (entier au-delà de 64 bits...)
+                pass
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, value: Any) -> str:
+        return self.dumpb(value).decode('utf-8')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        if self._decode is not None:
+            return self._decode(data)
+        return json.loads(data)
+
+
+class MessagePackSerializer:
+    """MessagePack (msgpack ou msgspec), pour les échanges binaires avec les workers"""
+
+    name = 'msgpack'
+    binary = True
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError:
+            msgpack = None
+        if msgpack is not None:
+            self.backend = 'msgpack'
+            self._encode = lambda value: msgpack.packb(value, use_bin_type=True)
+            self._decode = lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+            return
+        try:
+            import msgspec
+        except ImportError:
+            raise ImportError("MessagePack indisponible : installer msgpack ou msgspec") from None
+        self.backend = 'msgspec'
+        self._encode = msgspec.msgpack.encode
+        self._decode = msgspec.msgpack.decode
+
+    def dumpb(self, value: Any) -> bytes:
+        return self._encode(value)
+
+    def loads(self, data: bytes) -> Any:
+        return self._decode(data)
+
+
+SERIALIZERS = {
+    'json': JsonSerializer,
+    'json-fast': FastJsonSerializer,
+    'msgpack': MessagePackSerializer
+}
+
+# Profils de sortie : sérialiseur et traitement des données d'origine (voir CandidateDataProcessor).
+# "lean" ne garde de originalData que les champs hors questionnaire, déjà recopié dans parsedData.
+OUTPUT_PROFILES = {
+    'default': ('json', 'full'),
+    'fast': ('json-fast', 'full'),
+    'lean': ('json-fast', 'reference')
+}
+
+_instances: Dict[str, Any] = {}
+
+
+def get_serializer(name: str):
+    """Sérialiseur partagé d'un format (les backends optionnels sont importés au premier appel)"""
+    serializer = _instances.get(name)
+    if serializer is None:
+        if name not in SERIALIZERS:
+            raise ValueError(f"Sérialiseur inconnu: {name}")
+        serializer = _instances[name] = SERIALIZERS[name]()
+    return serializer
+
+
+def output_profile(name: str) -> Tuple[Any, str]:
+    """(sérialiseur, mode des données d'origine) d'un profil de sortie"""
+    if name not in OUTPUT_PROFILES:
+        raise ValueError(f"Profil de sortie inconnu: {name}")
+    serializer_name, original_data = OUTPUT_PROFILES[name]
+    return get_serializer(serializer_name), original_data
+
+
+# Trames binaires : longueur sur 4 octets (big-endian) puis le message sérialisé
+FRAME_HEADER = struct.Struct('>I')
+
+
+def write_frame(stream, payload: bytes) -> None:
+    """Écrit une trame sur un flux binaire"""
+    stream.write(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def read_frame(stream) -> Optional[bytes]:
+    """Lit une trame d'un flux binaire ; None en fin de flux"""
+    header = stream.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        raise EOFError("En-tête de trame tronqué")
+    (length,) = FRAME_HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise EOFError("Trame tronquée")
+    return payload
@@ -1,61 +1,43 @@
 const express = require('express');
 const bodyParser = require('body-parser');
-const { spawn } = require('child_process');
 const cors = require('cors');
+const PythonWorkerPool = require('./worker-pool');
 
 const app = express();
 const port = 3000;
 
+// Pool de workers Python pré-chargés (un processus par worker, réutilisé entre les requêtes)
+const workerPool = new PythonWorkerPool({
+  size: parseInt(process.env.PARSER_WORKERS, 10) || 2,
+  maxQueue: parseInt(process.env.PARSER_MAX_QUEUE, 10) || 100,
+  workerArgs: ['--cache-entries', process.env.PARSER_CACHE_ENTRIES || '5000']
+});
+workerPool.start();
+
 // Middleware
 app.use(cors());
 app.use(bodyParser.json({ limit: '10mb' }));
 app.use(bodyParser.urlencoded({ extended: true, limit: '10mb' }));
 
 // Route pour traiter les données de candidat
-app.post('/api/process-candidate', (req, res) => {
+app.post('/api/process-candidate', async (req, res) => {
   try {
     const candidateData = req.body;
     
-    // Lancer le script Python pour le traitement
-    // Utiliser simple_test.py pour tester, ou candidate_parser.py pour la version complète
-    const pythonProcess = spawn('python3', ['parsers/simple_test.py']);
-    
-    // Erreur du processus Python
-    pythonProcess.stderr.on('data', (data) => {
-      console.error(`Erreur Python: ${data}`);
-      res.status(500).json({ error: 'Erreur lors du traitement des données' });
-    });
-    
-    let result = '';
-    
-    // Résultat du processus Python
-    pythonProcess.stdout.on('data', (data) => {
-      result += data.toString();
-    });
-    
-    // Fin du processus Python
-    pythonProcess.on('close', (code) => {
-      if (code !== 0) {
-        return res.status(500).json({ error: `Le processus Python s'est terminé avec le code ${code}` });
-      }
-      
-      try {
-        // Essayer de parser le résultat JSON
-        const parsedResult = JSON.parse(result);
-        res.json(parsedResult);
-      } catch (e) {
-        console.error('Erreur lors du parsing du résultat JSON:', e);
-        res.status(500).json({ error: 'Erreur lors du parsing du résultat' });
-      }
-    });
-    
-    // Envoyer les données au processus Python
-    pythonProcess.stdin.write(JSON.stringify(candidateData));
-    pythonProcess.stdin.end();
+    // Confier le traitement à un worker Python disponible
+    const result = await workerPool.processCandidate(candidateData);
+    res.json(result);
     
   } catch (error) {
+    if (error.code === 'POOL_SATURATED') {
+      return res.status(503).json({ error: 'Serveur surchargé, veuillez réessayer' });
+    }
+    if (error.code === 'POOL_UNAVAILABLE') {
+      return res.status(503).json({ error: 'Parser indisponible' });
+    }
+    
     console.error('Erreur:', error);
-    res.status(500).json({ error: 'Erreur interne du serveur' });
+    res.status(500).json({ error: 'Erreur lors du traitement des données' });
   }
 });
 
@@ -64,7 +46,20 @@ app.get('/api/test', (req, res) => {
   res.json({ message: 'Le serveur API fonctionne correctement!' });
 });
 
+// Route de santé du pool de workers
+app.get('/api/health', (req, res) => {
+  const status = workerPool.getStatus();
+  // 503 quand aucun worker ne peut démarrer : le pool n'échoue pas en silence
+  res.status(status.failing ? 503 : 200).json(status);
+});
+
 // Démarrer le serveur
-app.listen(port, () => {
+const server = app.listen(port, () => {
   console.log(`Serveur API démarré sur le port ${port}`);
-});
\ No newline at end of file
+});
+
+// Arrêter proprement les workers Python
+process.on('SIGTERM', () => {
+  workerPool.stop();
+  server.close();
+});
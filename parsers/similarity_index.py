@@ -0,0 +1,129 @@
+from typing import Dict, List, Any, Hashable, Iterable, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from candidate_parser import TextNormalizer
+from text_vectors import TERM_SPACE_SIZE, TEXT_VECTOR_FIELDS, term_vector
+
+
+# Recherche par similarité sur les textes libres des candidats ("les candidats dont la motivation
+# ressemble à cette offre") : les vecteurs creux émis par le parser sont pondérés en TF-IDF,
+# normalisés, et le cosinus de tout un lot de requêtes est un seul produit de matrices CSR.
+
+# Nombre de requêtes traitées par produit de matrices (borne la taille du résultat intermédiaire)
+DEFAULT_QUERY_BLOCK = 256
+
+
+class TextSimilarityIndex:
+    """Index TF-IDF (cosinus) d'un ou plusieurs textes libres des candidats parsés"""
+
+    def __init__(self, fields: Sequence[str] = ('motivation',)):
+        unknown = [field for field in fields if field not in TEXT_VECTOR_FIELDS]
+        if unknown or not fields:
+            raise ValueError(f"Champs de texte inconnus: {unknown or fields}")
+        self.fields = tuple(fields)
+        self._ids: List[Hashable] = []
+        self._indices: List[List[int]] = []
+        self._counts: List[List[int]] = []
+        self._matrix = None
+        self._idf = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, candidate_id: Hashable, parsed_data: Dict[str, Any]) -> None:
+        """Ajoute un candidat parsé (résultat de process_candidate_data ou sortie de ResponseParser)"""
+        parsed_data = parsed_data.get('parsedData', parsed_data)
+        normalized = (parsed_data.get('additional') or {}).get('normalized') or {}
+        vectors = normalized.get('termVectors')
+        if vectors is None:
+            # Sortie antérieure aux vecteurs : ils sont recalculés à partir des termes clés
+            key_terms = normalized.get('keyTerms') or {}
+            vectors = {field: term_vector(key_terms.get(field) or []) for field in self.fields}
+
+        indices: List[int] = []
+        counts: List[int] = []
+        for field in self.fields:
+            indices.extend(vectors[field]['indices'])
+            counts.extend(vectors[field]['counts'])
+
+        self._ids.append(candidate_id)
+        self._indices.append(indices)
+        self._counts.append(counts)
+        self._matrix = None
+
+    def add_many(self, candidates: Iterable[Tuple[Hashable, Dict[str, Any]]]) -> None:
+        """Ajoute une suite de couples (id, données parsées)"""
+        for candidate_id, parsed_data in candidates:
+            self.add(candidate_id, parsed_data)
+
+    def build(self) -> None:
+        """Construit la matrice TF-IDF normalisée (appelé automatiquement à la première recherche)"""
+        counts = _csr(self._indices, self._counts)
+        # IDF lissé : log((1 + n) / (1 + df)) + 1, un terme absent du corpus garde un poids fini
+        document_frequency = np.bincount(counts.indices, minlength=TERM_SPACE_SIZE)
+        self._idf = np.log((1 + len(self._ids)) / (1 + document_frequency)) + 1
+        self._matrix = self._weight(counts)
+
+    def vectorize(self, texts: Iterable[str]):
+        """Matrice CSR TF-IDF normalisée de textes de requête, avec l'IDF du corpus indexé"""
+        if self._matrix is None:
+            self.build()
+        vectors = [term_vector(TextNormalizer.extract_key_terms(text)) for text in texts]
+        return self._weight(_csr([vector['indices'] for vector in vectors],
+                                 [vector['counts'] for vector in vectors]))
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Les k candidats les plus proches d'un texte, sous forme (id, cosinus)"""
+        return self.search_batch([text], k)[0]
+
+    def search_batch(self, texts: Sequence[str], k: int = 10,
+                     block_size: int = DEFAULT_QUERY_BLOCK) -> List[List[Tuple[Hashable, float]]]:
+        """Les k candidats les plus proches de chaque texte ; les candidats sans terme commun sont ignorés"""
+        queries = self.vectorize(texts)
+        results = []
+        for start in range(0, queries.shape[0], block_size):
+            # Produit creux : seuls les couples (requête, candidat) partageant un terme sont calculés
+            scores = (queries[start:start + block_size] @ self._matrix.T).tocsr()
+            for row in range(scores.shape[0]):
+                begin, end = scores.indptr[row], scores.indptr[row + 1]
+                results.append(self._top_k(scores.indices[begin:end], scores.data[begin:end], k))
+        return results
+
+    def similarity(self, texts: Sequence[str]):
+        """Matrice creuse des cosinus (textes × candidats)"""
+        return (self.vectorize(texts) @ self._matrix.T).tocsr()
+
+    def _weight(self, counts):
+        """Pondère une matrice d'occurrences par l'IDF et normalise chaque ligne (norme L2)"""
+        weighted = counts.multiply(self._idf).tocsr()
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ weighted
+
+    def _top_k(self, positions: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[Hashable, float]]:
+        """Les k meilleurs scores d'une ligne creuse, par ordre décroissant"""
+        if k <= 0:
+            return []
+        keep = scores > 0
+        positions, scores = positions[keep], scores[keep]
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[best], scores[best]
+        order = np.argsort(-scores, kind='stable')
+        return [(self._ids[position], float(score)) for position, score in zip(positions[order], scores[order])]
+
+
+def _csr(indices: List[List[int]], counts: List[List[int]]):
+    """Matrice CSR d'occurrences à partir de vecteurs creux (les indices répétés sont additionnés)"""
+    indptr = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in indices], out=indptr[1:])
+    matrix = sparse.csr_matrix(
+        (np.fromiter((value for row in counts for value in row), dtype=np.float64, count=int(indptr[-1])),
+         np.fromiter((value for row in indices for value in row), dtype=np.int64, count=int(indptr[-1])),
+         indptr),
+        shape=(len(indices), TERM_SPACE_SIZE)
+    )
+    matrix.sum_duplicates()
+    return matrix
@@ -0,0 +1,80 @@
+import sys
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+
+# Vocabulaire canonique des compétences techniques : chaque variante brute ("react.js", "ReactJS")
+# est associée une fois pour toutes à un nom canonique interné et à un identifiant entier.
+# L'identifiant est dérivé du nom (blake2b sur 53 bits) : il est le même dans tous les processus
+# et d'une exécution à l'autre, sans table partagée à synchroniser. 53 bits restent exacts côté
+# Node.js (Number.MAX_SAFE_INTEGER) et rendent les collisions négligeables (de l'ordre de 1e-4
+# pour un million de noms) ; une collision observée est journalisée, jamais levée dans l'analyse.
+
+# Nombre de variantes brutes mémorisées
+SKILL_CACHE_SIZE = 8192
+SKILL_ID_BITS = 53
+# Nombre de noms suivis par processus pour détecter les collisions (et de libellés du registre)
+MAX_TRACKED_NAMES = 65536
+
+logger = logging.getLogger(__name__)
+
+# Nom (en minuscules) des identifiants calculés dans ce processus, dans la limite de MAX_TRACKED_NAMES
+_ID_NAMES: Dict[int, str] = {}
+
+
+@lru_cache(maxsize=SKILL_CACHE_SIZE)
+def skill_id(name: str) -> int:
+    """Identifiant stable d'une compétence (insensible à la casse, entier positif sur 53 bits)"""
+    name = name.lower()
+    digest = hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest()
+    identifier = int.from_bytes(digest, 'little') & ((1 << SKILL_ID_BITS) - 1)
+    known = _ID_NAMES.get(identifier)
+    if known is None:
+        if len(_ID_NAMES) < MAX_TRACKED_NAMES:
+            _ID_NAMES[identifier] = name
+    elif known != name:
+        logger.warning("Collision d'identifiant de compétence: %r et %r (%d)", known, name, identifier)
+    return identifier
+
+
+class SkillRegistry:
+    """Associe les variantes brutes d'une compétence à (identifiant, nom canonique), avec un cache borné"""
+
+    def __init__(self, normalize: Callable[[str], str], cache_size: int = SKILL_CACHE_SIZE):
+        self._normalize = normalize
+        self._names: Dict[int, str] = {}
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+        self.tag = lru_cache(maxsize=cache_size)(self._tag)
+
+    def _resolve(self, raw: str) -> Tuple[Optional[int], str]:
+        """(identifiant, nom canonique) d'une variante brute ; (None, '') si elle ne donne aucun nom"""
+        name = self._normalize(raw)
+        if not name:
+            return None, ''
+        name = sys.intern(name)
+        identifier = skill_id(name)
+        # Le premier nom rencontré pour un identifiant sert de libellé (table bornée)
+        if len(self._names) < MAX_TRACKED_NAMES:
+            self._names.setdefault(identifier, name)
+        return identifier, name
+
+    @staticmethod
+    def _tag(raw: str) -> str:
+        """Tag de matching d'une compétence brute (texte brut en minuscules, inchangé pour les index existants)"""
+        return sys.intern(f"skill:{raw.lower()}")
+
+    def name(self, identifier: int) -> Optional[str]:
+        """Nom canonique d'un identifiant déjà rencontré par ce registre"""
+        return self._names.get(identifier)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Statistiques du cache des variantes brutes"""
+        info = self.resolve.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'entries': info.currsize, 'names': len(self._names)}
+
+    def clear(self) -> None:
+        """Vide le cache (à appeler si les corrections du normaliseur changent)"""
+        self.resolve.cache_clear()
+        self.tag.cache_clear()
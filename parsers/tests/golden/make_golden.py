@@ -0,0 +1,77 @@
+"""
+Génère les octets de référence du profil de sortie par défaut (tests/test_serialization.py)
+
+La sortie est produite par process_candidate tel qu'il était avant les sérialiseurs (copie ci-dessous),
+avec une date de traitement figée. À relancer uniquement lorsque la sortie du parser change
+volontairement (nouvelle PARSER_VERSION) : python3 tests/golden/make_golden.py
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+
+GOLDEN_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(GOLDEN_DIR, '..', '..'))
+sys.path.insert(0, os.path.join(GOLDEN_DIR, '..', '..', 'benchmarks'))
+
+import candidate_parser
+from candidate_parser import EXAMPLE_DATA, PARSER_VERSION, CandidateDataProcessor
+from candidate_generator import generate_candidates
+
+# Entrées du fichier de référence : l'exemple, des candidats générés et des entrées en erreur
+GENERATED_COUNT = 12
+GENERATED_SEED = 7
+ERROR_INPUTS = ['[]', '"texte"', '{"questionnaire": {"skills": {"technicalSkills": 42}}}']
+
+
+class FixedDatetime(datetime):
+    """Date de traitement figée"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 2, 3, 4, 5)
+
+
+def golden_inputs():
+    """Entrées JSON, dans l'ordre des lignes du fichier de référence"""
+    candidates = [EXAMPLE_DATA] + list(generate_candidates(GENERATED_COUNT, seed=GENERATED_SEED))
+    return [json.dumps(candidate, ensure_ascii=False) for candidate in candidates] + ERROR_INPUTS
+
+
+def golden_path(version=PARSER_VERSION):
+    return os.path.join(GOLDEN_DIR, f'default_profile-{version}.jsonl')
+
+
+# process_candidate d'avant les sérialiseurs, recopié tel quel
+def process_candidate(data_json):
+    """Traite les données JSON d'un candidat et retourne le résultat"""
+    try:
+        # Parser les données JSON
+        data = json.loads(data_json)
+        
+        # Initialiser le processeur
+        processor = CandidateDataProcessor()
+        
+        # Traiter les données
+        result = processor.process_candidate_data(data)
+        
+        # Retourner le résultat au format JSON
+        return json.dumps(result, ensure_ascii=False)
+    except Exception as e:
+        # En cas d'erreur, retourner un message d'erreur
+        return json.dumps({
+            'error': f"Erreur lors du traitement des données: {str(e)}"
+        }, ensure_ascii=False)
+
+
+def main():
+    candidate_parser.datetime = FixedDatetime
+    lines = [process_candidate(data_json) + '\n' for data_json in golden_inputs()]
+    with open(golden_path(), 'wb') as f:
+        f.write(''.join(lines).encode('utf-8'))
+    print(golden_path())
+
+
+if __name__ == '__main__':
+    main()
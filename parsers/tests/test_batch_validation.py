@@ -0,0 +1,61 @@
+"""
+Test différentiel de la validation par lots : BatchValidation.result(i) doit être identique à
+ResponseValidator.validate_responses pour chaque candidat
+"""
+
+import os
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from candidate_parser import ResponseParser, ResponseValidator
+from candidate_generator import generate_candidates
+
+
+def parsed_candidates():
+    """Candidats parsés réalistes, puis variantes vides, partielles et de types inattendus"""
+    parser = ResponseParser()
+    parsed = [parser.parse_candidate_response(candidate['questionnaire'])
+              for candidate in generate_candidates(2000, seed=11)]
+
+    rng = random.Random(5)
+    odd_values = [None, '', 0, 1, [], {}, 'oui', 'non', 'Oui', '45k', '40-50K€', '45 000 €', 'à négocier', True]
+    variants = [{}, {'metadata': {}}, {'jobPreferences': {}}, {'availability': {'currentlyEmployed': None}}]
+    for _ in range(1000):
+        candidate = {section: dict(data) for section, data in rng.choice(parsed).items() if isinstance(data, dict)}
+        for section in ('jobPreferences', 'skills', 'availability'):
+            data = candidate.get(section)
+            if data is None or rng.random() < 0.1:
+                candidate.pop(section, None)
+                continue
+            for field in list(data):
+                if rng.random() < 0.2:
+                    del data[field]
+                elif rng.random() < 0.2:
+                    data[field] = rng.choice(odd_values)
+        variants.append(candidate)
+    return parsed + variants
+
+
+def test_batch_results_match_validate_responses():
+    candidates = parsed_candidates()
+    validator = ResponseValidator()
+    batch = validator.validate_batch(candidates)
+
+    assert len(batch) == len(candidates)
+    for row, candidate in enumerate(candidates):
+        assert batch.result(row) == validator.validate_responses(candidate), row
+    assert list(batch.results()) == [validator.validate_responses(candidate) for candidate in candidates]
+
+
+def test_counts_match_row_results():
+    candidates = parsed_candidates()
+    validator = ResponseValidator()
+    batch = validator.validate_batch(candidates)
+    expected = [validator.validate_responses(candidate) for candidate in candidates]
+
+    assert batch.counts()['empty'] == sum(not result['valid'] for result in expected)
+    assert batch.warning_counts().tolist() == [len(result.get('warnings', [])) for result in expected]
+    assert batch.valid.tolist() == [result['valid'] for result in expected]
@@ -0,0 +1,56 @@
+"""
+Mise à jour sur place de CandidateIndex après une réanalyse incrémentale : les tags et les niveaux
+de compétence (top_k_by_skill) doivent être ceux d'un index reconstruit à partir des nouveaux résultats
+"""
+
+import os
+import sys
+import copy
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from candidate_index import CandidateIndex
+from candidate_parser import EXAMPLE_DATA, CandidateDataProcessor
+from candidate_generator import generate_candidates
+
+
+def test_update_after_reprocess_matches_rebuilt_index():
+    processor = CandidateDataProcessor()
+    candidates = list(generate_candidates(50, seed=3))
+    results = [processor.process_candidate_data(candidate) for candidate in candidates]
+
+    index = CandidateIndex()
+    index.add_many((position, result['parsedData']) for position, result in enumerate(results))
+
+    # Niveaux relevés, compétence remplacée et niveau supprimé pour un candidat sur trois
+    for position in range(0, len(results), 3):
+        skills = copy.deepcopy(candidates[position]['questionnaire']['skills'])
+        skills['technicalSkills'] = ['Rust'] + skills['technicalSkills'][1:]
+        skills['technicalSkillLevels'] = {skill: 'expert' for skill in skills['technicalSkills'][:2]}
+        results[position] = processor.reprocess_candidate_data(results[position], {'skills': skills})
+        index.update(position, results[position])
+
+    rebuilt = CandidateIndex()
+    rebuilt.add_many((position, result['parsedData']) for position, result in enumerate(results))
+
+    assert index.tags() == rebuilt.tags()
+    for tag in rebuilt.tags():
+        assert index.query(all_of=[tag]) == rebuilt.query(all_of=[tag]), tag
+    skills = {skill for result in results
+              for skill in result['parsedData']['skills']['normalized']['technicalSkillLevels']}
+    for skill in skills | {'JavaScript', 'COBOL'}:
+        assert index.top_k_by_skill(skill, k=len(results)) == rebuilt.top_k_by_skill(skill, k=len(results)), skill
+
+
+def test_update_removes_stale_skill_levels():
+    processor = CandidateDataProcessor()
+    result = processor.process_candidate_data(EXAMPLE_DATA)
+    index = CandidateIndex()
+    index.add('c1', result['parsedData'])
+    assert index.top_k_by_skill('TypeScript') == [('c1', 1)]
+
+    skills = dict(EXAMPLE_DATA['questionnaire']['skills'], technicalSkillLevels={'TypeScript': 'expert'})
+    index.update('c1', processor.reprocess_candidate_data(result, {'skills': skills}))
+    assert index.top_k_by_skill('TypeScript') == [('c1', 4)]
+    assert index.top_k_by_skill('JavaScript') == []
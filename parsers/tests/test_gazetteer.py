@@ -0,0 +1,39 @@
+"""
+Résolution des lieux saisis librement : noms composés, alias et complétion
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from gazetteer import Gazetteer
+
+
+@pytest.fixture(scope='module')
+def gazetteer():
+    return Gazetteer()
+
+
+@pytest.mark.parametrize('location, city', [
+    ('Paris 15e', 'Paris'),
+    ('Lyon, France', 'Lyon'),
+    ('Grand Lyon', 'Lyon'),
+    ('St-Étienne', 'Saint-Étienne'),
+    ('Aix-en-Provence', 'Aix-en-Provence'),
+    ('Le Mans', 'Le Mans'),
+    ('Marseil', 'Marseille'),
+    ('Clermont-Fer', 'Clermont-Ferrand'),
+    ('Île-de-France', 'Paris'),
+    ('La Défense', 'La Défense'),
+    ('Sophia Antipolis', 'Sophia Antipolis'),
+])
+def test_resolves_known_places(gazetteer, location, city):
+    assert gazetteer.resolve(location)['city'] == city
+
+
+@pytest.mark.parametrize('location', ['Metz-Tessy', 'Vannes-le-Châtel', 'Brest-Litovsk', 'Atlantide', '', None])
+def test_compound_names_match_only_whole(gazetteer, location):
+    assert gazetteer.resolve(location) is None
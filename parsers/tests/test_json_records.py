@@ -0,0 +1,43 @@
+"""
+Lecture en flux des exports (iter_json_records) : mêmes enregistrements et mêmes erreurs que json.loads
+"""
+
+import io
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from candidate_parser import iter_json_records
+
+READ_SIZES = (1, 3, 1 << 16)
+
+
+@pytest.mark.parametrize('read_size', READ_SIZES)
+@pytest.mark.parametrize('text', ['[]', ' [ ] ', '[1]', '[1, 2.5e3 ,-3]', '[{"a": [1, {"b": "]"}]}, "x,]", null]',
+                                  '\n[\n  {"questionnaire": {}},\n  {"questionnaire": {"skills": {}}}\n]\n'])
+def test_array_records_match_json_loads(text, read_size):
+    assert list(iter_json_records(io.StringIO(text), read_size)) == json.loads(text)
+
+
+@pytest.mark.parametrize('read_size', READ_SIZES)
+@pytest.mark.parametrize('text', ['[1,]', '[1 , ]', '[{"a": 1},\n]', '[,1]', '[1,,2]', '[1'])
+def test_invalid_arrays_raise_like_json_loads(text, read_size):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+    with pytest.raises(ValueError):
+        list(iter_json_records(io.StringIO(text), read_size))
+
+
+@pytest.mark.parametrize('text', ['[1,]', '[{"a": 1},\n]'])
+def test_trailing_comma_error(text):
+    with pytest.raises(json.JSONDecodeError, match='Expecting value'):
+        list(iter_json_records(io.StringIO(text)))
+
+
+def test_json_lines_are_returned_raw():
+    text = '{"a": 1}\n\n{"b": 2}\n'
+    assert list(iter_json_records(io.StringIO(text), 4)) == ['{"a": 1}', '{"b": 2}']
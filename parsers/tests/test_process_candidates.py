@@ -0,0 +1,35 @@
+"""
+Mode lot (process_candidates) : paramètres de découpage vérifiés avant tout traitement
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from candidate_parser import EXAMPLE_DATA, main, process_candidates
+
+
+@pytest.mark.parametrize('chunk_size', [0, -1])
+def test_invalid_chunk_size_raises(chunk_size):
+    with pytest.raises(ValueError):
+        process_candidates([EXAMPLE_DATA], chunk_size=chunk_size)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_smallest_chunk_size_keeps_every_record(max_workers):
+    candidates = [EXAMPLE_DATA, '[]', EXAMPLE_DATA]
+    results = list(process_candidates(candidates, chunk_size=1, max_workers=max_workers))
+    assert len(results) == 3
+    assert 'parsedData' in results[0] and 'parsedData' in results[2]
+    assert results[1]['index'] == 1
+
+
+@pytest.mark.parametrize('value', ['0', '-4', 'x'])
+def test_cli_rejects_non_positive_chunk_size(value, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(['--batch', '--chunk-size', value])
+    assert exit_info.value.code == 2
+    assert '--chunk-size' in capsys.readouterr().err
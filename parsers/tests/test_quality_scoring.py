@@ -0,0 +1,67 @@
+"""
+Test différentiel des scores de qualité par lots : avec les poids par défaut, QualityScorer.score_batch
+doit donner au bit près les scores de ResponseParser._calculate_data_quality
+"""
+
+import os
+import sys
+import random
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from candidate_parser import ResponseParser
+from candidate_generator import generate_candidates
+from quality_scoring import QUALITY_SECTIONS, QualityScorer
+
+
+def parsed_candidates(parser):
+    """Candidats parsés réalistes, puis variantes où des champs sont vidés ou retirés"""
+    parsed = [parser.parse_candidate_response(candidate['questionnaire'])
+              for candidate in generate_candidates(2000, seed=13)]
+    rng = random.Random(9)
+    variants = [{}]
+    for _ in range(1000):
+        candidate = {section: dict(data) for section, data in rng.choice(parsed).items()
+                     if section in QUALITY_SECTIONS and isinstance(data, dict)}
+        for section in QUALITY_SECTIONS:
+            data = candidate.get(section)
+            if data is None or rng.random() < 0.1:
+                candidate.pop(section, None)
+                continue
+            for field in list(data):
+                if rng.random() < 0.3:
+                    data[field] = rng.choice([None, '', [], 0, False, 'x', ['x'], True])
+        variants.append(candidate)
+    return parsed + variants
+
+
+def test_default_weights_match_parser_bit_for_bit():
+    parser = ResponseParser()
+    candidates = parsed_candidates(parser)
+    scores = QualityScorer().score_batch(candidates)
+
+    for row, candidate in enumerate(candidates):
+        expected = parser._calculate_data_quality(*(candidate.get(section, {}) for section in QUALITY_SECTIONS))
+        for key, value in expected.items():
+            # Égalité exacte, pas d'approximation
+            assert scores[key][row] == value, (row, key)
+
+
+def test_scores_of_parsed_results_match_metadata():
+    processor_results = [{'parsedData': parsed} for parsed in parsed_candidates(ResponseParser())[:2000]]
+    scores = QualityScorer().score_batch(processor_results)
+    for row, result in enumerate(processor_results):
+        quality = result['parsedData']['metadata']['dataQuality']
+        assert all(scores[key][row] == value for key, value in quality.items()), row
+
+
+def test_custom_weights():
+    scorer = QualityScorer(field_weights={'skills': {'technicalSkills': 2.0}}, section_weights={'additional': 0.0})
+    bitmap = scorer.presence_bitmap([{'skills': {'technicalSkills': ['Python']}, 'additional': {'motivation': 'x'}}])
+    scores = scorer.scores_from_bitmap(bitmap)
+    assert scores['skills'][0] == 0.5
+    assert scores['additional'][0] == 0.5
+    assert np.isclose(scores['overall'][0], 0.5 / 3)
@@ -0,0 +1,86 @@
+"""
+Niveau disque de ResultCache : purge au-delà des limites et erreurs sqlite traitées comme des échecs du cache
+"""
+
+import os
+import sys
+import sqlite3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import result_cache
+from result_cache import ResultCache
+
+
+def disk_rows(path):
+    with sqlite3.connect(path) as db:
+        return db.execute('SELECT COUNT(*), COALESCE(SUM(length(CAST(value AS BLOB))), 0) FROM results').fetchone()
+
+
+def test_disk_tier_is_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'DISK_PRUNE_INTERVAL', 10)
+    path = str(tmp_path / 'cache.db')
+    cache = ResultCache(max_entries=5, path=path, disk_max_entries=50, disk_max_bytes=1 << 20)
+    for number in range(500):
+        cache.set(f'k{number}', {'value': number})
+    count, _ = disk_rows(path)
+    assert count <= 50 + 10
+    # Les entrées les plus récentes sont gardées
+    assert cache.get('k499') == {'value': 499}
+    assert cache.get('k0') is None
+    assert cache.stats()['diskEvictions'] >= 500 - 60
+
+    small = ResultCache(max_entries=5, path=str(tmp_path / 'small.db'), disk_max_bytes=2000)
+    for number in range(100):
+        small.set(f'k{number}', {'value': 'x' * 100})
+    assert disk_rows(str(tmp_path / 'small.db'))[1] <= 2000 + 10 * 120
+
+
+def test_expired_disk_entries_are_pruned(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.db')
+    cache = ResultCache(path=path, ttl=60)
+    cache.set('old', {'value': 1})
+    cache.close()
+    monkeypatch.setattr(result_cache.time, 'time', lambda: 1e12)
+    ResultCache(path=path).close()
+    assert disk_rows(path)[0] == 0
+
+
+def test_locked_database_is_a_miss(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, 'DISK_LOCK_TIMEOUT', 0.01)
+    path = str(tmp_path / 'cache.db')
+    writer = ResultCache(path=path)
+    writer.set('shared', {'value': 1})
+    reader = ResultCache(max_entries=1, path=path)
+
+    lock = sqlite3.connect(path)
+    lock.execute('BEGIN EXCLUSIVE')
+    try:
+        writer.set('other', {'value': 2})
+        assert reader.get('shared') is None
+        assert reader.stats()['misses'] == 1
+        assert reader.stats()['diskErrors'] == 1 and writer.stats()['diskErrors'] == 1
+        # Le niveau mémoire reste utilisable
+        assert writer.get('other') == {'value': 2}
+    finally:
+        lock.rollback()
+        lock.close()
+    assert reader.get('shared') == {'value': 1}
+
+
+def test_unusable_database_falls_back_to_memory(tmp_path):
+    # Répertoire inexistant : sqlite3.connect échoue
+    missing = ResultCache(path=str(tmp_path / 'absent' / 'cache.db'))
+    # Fichier qui n'est pas une base sqlite : CREATE TABLE échoue
+    corrupt_path = tmp_path / 'corrupt.db'
+    corrupt_path.write_bytes(b'pas une base sqlite' * 100)
+    corrupt = ResultCache(path=str(corrupt_path))
+
+    for cache in (missing, corrupt):
+        assert cache.stats()['diskErrors'] == 1
+        cache.set('k', {'value': 1})
+        assert cache.get('k') == {'value': 1}
+        cache.clear()
+        assert cache.get('k') is None
+        assert cache.stats()['diskErrors'] == 1
+        cache.close()
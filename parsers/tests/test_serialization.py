@@ -0,0 +1,71 @@
+"""
+Compatibilité octet pour octet du profil de sortie par défaut : process_candidate, le mode lot
+et le mode worker écrivent les octets de référence de tests/golden/, produits par process_candidate
+d'avant les sérialiseurs (tests/golden/make_golden.py) avec une date de traitement figée
+"""
+
+import io
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden'))
+
+import candidate_parser
+from candidate_parser import EXAMPLE_DATA, PARSER_VERSION, process_candidate, run_batch, run_worker
+from make_golden import ERROR_INPUTS, FixedDatetime, golden_inputs, golden_path
+
+
+@pytest.fixture(autouse=True)
+def fixed_datetime(monkeypatch):
+    monkeypatch.setattr(candidate_parser, 'datetime', FixedDatetime)
+
+
+@pytest.fixture(scope='module')
+def golden():
+    """(entrée JSON, ligne de référence sans le saut de ligne) ; le fichier suit PARSER_VERSION"""
+    path = golden_path(PARSER_VERSION)
+    assert os.path.exists(path), f"octets de référence absents pour {PARSER_VERSION} : lancer tests/golden/make_golden.py"
+    with open(path, 'rb') as f:
+        lines = f.read().decode('utf-8').split('\n')
+    assert lines.pop() == ''
+    inputs = golden_inputs()
+    assert len(lines) == len(inputs)
+    return list(zip(inputs, lines))
+
+
+@pytest.fixture(scope='module')
+def golden_candidates(golden):
+    """Seulement les candidats valides (les entrées en erreur sont en fin de fichier)"""
+    return golden[:len(golden) - len(ERROR_INPUTS)]
+
+
+def test_process_candidate_default_profile(golden):
+    for data_json, expected in golden:
+        assert process_candidate(data_json) == expected
+        assert process_candidate(data_json, 'default') == expected
+
+
+def test_process_candidate_unknown_profile_returns_error():
+    result = json.loads(process_candidate(json.dumps(EXAMPLE_DATA), 'inconnu'))
+    assert 'Profil de sortie inconnu' in result['error']
+
+
+def test_batch_default_profile(golden_candidates):
+    input_stream = io.StringIO(''.join(data_json + '\n' for data_json, _ in golden_candidates))
+    output_stream = io.StringIO()
+    run_batch(input_stream, output_stream, max_workers=1)
+    assert output_stream.getvalue() == ''.join(expected + '\n' for _, expected in golden_candidates)
+
+
+def test_worker_default_profile(golden_candidates):
+    input_stream = io.StringIO(''.join(f'{{"id": {index}, "type": "process", "data": {data_json}}}\n'
+                                       for index, (data_json, _) in enumerate(golden_candidates)))
+    output_stream = io.StringIO()
+    run_worker(input_stream, output_stream)
+    assert output_stream.getvalue() == ''.join(f'{{"id": {index}, "result": {expected}}}\n'
+                                               for index, (_, expected) in enumerate(golden_candidates))
@@ -0,0 +1,40 @@
+"""
+Identifiants des compétences : stables, sur 53 bits, et une collision ne fait jamais échouer l'analyse
+"""
+
+import os
+import sys
+import json
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import skill_registry
+from candidate_parser import EXAMPLE_DATA, SKILL_REGISTRY, process_candidate
+from skill_registry import SKILL_ID_BITS, skill_id
+
+
+def test_ids_are_stable_and_case_insensitive():
+    assert skill_id('PostgreSQL') == skill_id('postgresql')
+    assert 0 <= skill_id('React') < 1 << SKILL_ID_BITS
+
+
+def test_collision_is_logged_not_raised(monkeypatch, caplog):
+    identifier = skill_id('javascript')
+    monkeypatch.setitem(skill_registry._ID_NAMES, identifier, 'autre compétence')
+    skill_id.cache_clear()
+    SKILL_REGISTRY.clear()
+    with caplog.at_level(logging.WARNING, logger='skill_registry'):
+        result = json.loads(process_candidate(json.dumps(EXAMPLE_DATA)))
+    skill_id.cache_clear()
+    SKILL_REGISTRY.clear()
+    assert 'error' not in result
+    assert identifier in result['parsedData']['skills']['normalized']['technicalSkillIds']
+    assert 'Collision' in caplog.text
+
+
+def test_tracked_names_are_bounded(monkeypatch):
+    monkeypatch.setattr(skill_registry, 'MAX_TRACKED_NAMES', len(skill_registry._ID_NAMES) + 10)
+    for number in range(100):
+        skill_id(f'framework{number}-bounded')
+    assert len(skill_registry._ID_NAMES) <= skill_registry.MAX_TRACKED_NAMES
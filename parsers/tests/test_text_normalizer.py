@@ -0,0 +1,74 @@
+"""
+Test différentiel de TextNormalizer.correct_common_errors (regex compilée en un seul passage)
+contre la boucle séquentielle d'origine
+"""
+
+import os
+import re
+import sys
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from candidate_parser import TextNormalizer
+
+
+def reference(text):
+    """Boucle d'origine de correct_common_errors (avant la regex compilée), recopiée telle quelle"""
+    if not text:
+        return ""
+    
+    cleaned_text = TextNormalizer.clean_text(text)
+    
+    for error, correction in TextNormalizer.CORRECTIONS.items():
+        pattern = r'\b' + re.escape(error) + r'\b'
+        cleaned_text = re.sub(pattern, correction, cleaned_text, flags=re.IGNORECASE)
+    
+    return cleaned_text
+
+
+def assert_same(text):
+    assert TextNormalizer.correct_common_errors(text) == reference(text), text
+
+
+def test_every_correction_key():
+    for error in TextNormalizer.CORRECTIONS:
+        assert_same(error)
+        assert_same(f"j'utilise {error} au quotidien")
+        assert_same(f"{error},{error}.{error}")
+
+
+def test_overlapping_and_prefix_keys():
+    for text in ("node", "node.js", "nodejs", "node.js et node", "node.jsx", "node.js.",
+                 "react", "react.js", "reactjs", "react.js/react", "react.json",
+                 "js react.js node.js ts", "css3 css html5 html", "postgre postgresql",
+                 "en poste actuellement en poste", "pas d'évolution évolution evolution"):
+        assert_same(text)
+
+
+def test_mixed_case():
+    for text in ("NODE.JS", "Node.Js et REACT", "ReactJS, TypeScript", "PostgreSQL / MONGO",
+                 "Actuellement EN POSTE", "Télétravail ou SUR SITE", "Pas De Préavis"):
+        assert_same(text)
+
+
+def test_unicode_case_equivalents():
+    # IGNORECASE rapproche "ſ" de "s", "ı" de "i" et le signe kelvin de "k"
+    for text in ("ſalaire", "jſ", "cdı", "ſans emploi", "tſ et jſ", "Pyth\u0131on", "ReacT.JS ı",
+                 "\u212aubernetes", "ſur ſite", "node.jſ", "teletravaıl"):
+        assert_same(text)
+
+
+def test_random_text():
+    rng = random.Random(20240601)
+    keys = list(TextNormalizer.CORRECTIONS)
+    words = keys + [key.upper() for key in keys] + [key.title() for key in keys] + \
+        ['et', 'ou', 'développeur', 'jsx', 'nodes', 'reacts', 'x', '3', 'mois'] + \
+        [key.replace('s', 'ſ').replace('i', 'ı') for key in keys]
+    separators = [' ', '  ', ', ', '.', '/', '-', '_', "'", '\t', '\n', '(', ')']
+    for _ in range(5000):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            parts.append(rng.choice(words))
+            parts.append(rng.choice(separators))
+        assert_same(''.join(parts))
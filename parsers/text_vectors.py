@@ -0,0 +1,35 @@
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, List
+
+
+# Vecteurs creux des textes libres : chaque terme clé est projeté par hachage (blake2b) dans un
+# espace de taille fixe. Le vocabulaire est ainsi partagé par tous les processus et toutes les
+# exécutions sans table à construire ni à synchroniser ; deux termes qui tombent sur le même
+# indice sont confondus, ce qui reste rare avec 2^20 dimensions.
+
+TERM_SPACE_BITS = 20
+TERM_SPACE_SIZE = 1 << TERM_SPACE_BITS
+
+# Textes libres vectorisés par le parser
+TEXT_VECTOR_FIELDS = ('motivation', 'strengths', 'challenges')
+
+# Nombre de termes distincts mémorisés
+TERM_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=TERM_CACHE_SIZE)
+def term_index(term: str) -> int:
+    """Indice d'un terme dans l'espace haché"""
+    digest = hashlib.blake2b(term.encode('utf-8'), digest_size=4).digest()
+    return int.from_bytes(digest, 'little') & (TERM_SPACE_SIZE - 1)
+
+
+def term_vector(terms: Iterable[str]) -> Dict[str, List[int]]:
+    """Vecteur creux des occurrences d'une liste de termes : indices triés et nombre d'occurrences"""
+    counts: Dict[int, int] = {}
+    for term in terms:
+        index = term_index(term)
+        counts[index] = counts.get(index, 0) + 1
+    indices = sorted(counts)
+    return {'indices': indices, 'counts': [counts[index] for index in indices]}
@@ -0,0 +1,325 @@
+const { spawn } = require('child_process');
+const path = require('path');
+
+/**
+ * Pool de workers Python résidents
+ *
+ * Chaque worker est un processus `candidate_parser.py --worker` lancé une seule fois :
+ * l'interpréteur et les imports sont déjà chargés quand une requête arrive.
+ * Le protocole est du JSON délimité par des retours à la ligne, chaque réponse
+ * reprenant l'id de la requête correspondante.
+ */
+class PythonWorkerPool {
+  constructor(options = {}) {
+    this.pythonPath = options.pythonPath || 'python3';
+    this.script = options.script || path.join(__dirname, 'candidate_parser.py');
+    this.size = options.size || 2;
+    this.maxQueue = options.maxQueue || 100;
+    this.requestTimeout = options.requestTimeout || 10000;
+    this.healthInterval = options.healthInterval || 15000;
+    this.healthTimeout = options.healthTimeout || 5000;
+    this.restartDelay = options.restartDelay || 500;
+    // Un worker qui s'arrête sans avoir répondu est relancé avec un délai doublé à chaque échec,
+    // puis abandonné après maxFailures échecs consécutifs
+    this.maxRestartDelay = options.maxRestartDelay || 30000;
+    this.maxFailures = options.maxFailures || 8;
+    // Options supplémentaires passées au worker (ex. ['--cache-entries', '5000'])
+    this.workerArgs = options.workerArgs || [];
+
+    this.workers = [];
+    this.queue = [];
+    this.nextId = 1;
+    this.stopped = false;
+    this.healthTimer = null;
+  }
+
+  /**
+   * Démarre les workers et les vérifications de santé périodiques
+   */
+  start() {
+    for (let slot = 0; slot < this.size; slot++) {
+      this.workers.push(this.spawnWorker(slot));
+    }
+
+    this.healthTimer = setInterval(() => this.checkHealth(), this.healthInterval);
+    this.healthTimer.unref();
+  }
+
+  /**
+   * Arrête tous les workers et rejette les requêtes en attente
+   */
+  stop() {
+    this.stopped = true;
+    clearInterval(this.healthTimer);
+
+    this.rejectQueue(new Error('Pool de workers arrêté'));
+
+    for (const worker of this.workers) {
+      worker.process.kill();
+    }
+  }
+
+  /**
+   * Envoie les données d'un candidat au premier worker disponible
+   * @param {Object} data - Données du candidat
+   * @returns {Promise<Object>} - Résultat du parser
+   */
+  processCandidate(data) {
+    return new Promise((resolve, reject) => {
+      // Aucun worker ne peut démarrer : inutile de mettre la requête en attente
+      if (this.isFailing()) {
+        reject(this.unavailableError());
+        return;
+      }
+
+      // Limiter la file d'attente pour ne pas accumuler les requêtes sous la charge
+      if (this.queue.length >= this.maxQueue) {
+        const error = new Error('Trop de requêtes en attente');
+        error.code = 'POOL_SATURATED';
+        reject(error);
+        return;
+      }
+
+      this.queue.push({ type: 'process', data, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Retourne l'état du pool (utilisé par la route de santé)
+   */
+  getStatus() {
+    return {
+      size: this.size,
+      queued: this.queue.length,
+      failing: this.isFailing(),
+      workers: this.workers.map(worker => ({
+        pid: worker.process.pid,
+        ready: worker.ready,
+        busy: worker.current !== null,
+        processed: worker.processed,
+        restarts: worker.restarts,
+        failures: worker.failures,
+        failed: worker.failed,
+        cache: worker.cache
+      }))
+    };
+  }
+
+  /**
+   * Vrai lorsque tous les workers ont été abandonnés après des échecs de démarrage répétés
+   */
+  isFailing() {
+    return this.workers.length > 0 && this.workers.every(worker => worker.failed);
+  }
+
+  /**
+   * Erreur des requêtes refusées quand le pool est abandonné
+   */
+  unavailableError() {
+    const error = new Error('Aucun worker Python ne peut démarrer');
+    error.code = 'POOL_UNAVAILABLE';
+    return error;
+  }
+
+  /**
+   * Lance un worker Python dans l'emplacement donné
+   */
+  spawnWorker(slot, restarts = 0, failures = 0) {
+    const child = spawn(this.pythonPath, [this.script, '--worker', ...this.workerArgs], {
+      stdio: ['pipe', 'pipe', 'pipe']
+    });
+
+    const worker = {
+      slot,
+      process: child,
+      ready: true,
+      current: null,
+      timer: null,
+      buffer: '',
+      processed: 0,
+      restarts,
+      // Arrêts consécutifs sans aucune réponse (remis à zéro à la première réponse)
+      failures,
+      failed: false,
+      cache: null
+    };
+
+    // Une écriture vers un worker mort ne doit pas faire tomber le serveur
+    child.stdin.on('error', (error) => {
+      console.error(`Erreur d'écriture vers le worker ${slot}:`, error.message);
+    });
+
+    child.stdout.setEncoding('utf8');
+    child.stdout.on('data', (chunk) => this.onWorkerData(worker, chunk));
+
+    child.stderr.on('data', (data) => {
+      console.error(`Erreur Python (worker ${slot}): ${data}`);
+    });
+
+    child.on('error', (error) => {
+      console.error(`Impossible de lancer le worker ${slot}:`, error);
+    });
+
+    // 'close' est émis aussi quand le processus n'a pas pu être lancé (python introuvable), contrairement à 'exit'
+    child.on('close', (code, signal) => this.onWorkerExit(worker, code, signal));
+
+    return worker;
+  }
+
+  /**
+   * Découpe la sortie du worker en réponses JSON (une par ligne)
+   */
+  onWorkerData(worker, chunk) {
+    worker.buffer += chunk;
+
+    let newlineIndex;
+    while ((newlineIndex = worker.buffer.indexOf('\n')) !== -1) {
+      const line = worker.buffer.slice(0, newlineIndex);
+      worker.buffer = worker.buffer.slice(newlineIndex + 1);
+
+      if (line.trim()) {
+        this.onWorkerResponse(worker, line);
+      }
+    }
+  }
+
+  /**
+   * Associe une réponse à la requête en cours du worker
+   */
+  onWorkerResponse(worker, line) {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch (e) {
+      console.error('Erreur lors du parsing de la réponse du worker:', e);
+      return;
+    }
+
+    const current = worker.current;
+    if (!current || response.id !== current.id) {
+      console.error(`Réponse inattendue du worker ${worker.slot} (id ${response.id})`);
+      return;
+    }
+
+    clearTimeout(worker.timer);
+    worker.current = null;
+    worker.processed++;
+    worker.failures = 0;
+
+    if (response.error) {
+      current.reject(new Error(response.error));
+    } else if (current.type === 'ping') {
+      current.resolve(response);
+    } else {
+      current.resolve(response.result);
+    }
+
+    this.dispatch();
+  }
+
+  /**
+   * Redémarre un worker qui s'est arrêté (avec un délai croissant s'il échoue en boucle)
+   * et rejette sa requête en cours
+   */
+  onWorkerExit(worker, code, signal) {
+    worker.ready = false;
+    clearTimeout(worker.timer);
+
+    if (worker.current) {
+      worker.current.reject(new Error(`Le worker Python s'est arrêté (code ${code}, signal ${signal})`));
+      worker.current = null;
+    }
+
+    if (this.stopped) {
+      return;
+    }
+
+    const failures = worker.failures + 1;
+    if (failures >= this.maxFailures) {
+      worker.failures = failures;
+      worker.failed = true;
+      console.error(`Worker ${worker.slot} arrêté ${failures} fois sans répondre (code ${code}, signal ${signal}), abandon`);
+      if (this.isFailing()) {
+        this.rejectQueue(this.unavailableError());
+      }
+      return;
+    }
+
+    const delay = Math.min(this.restartDelay * 2 ** (failures - 1), this.maxRestartDelay);
+    console.error(`Worker ${worker.slot} arrêté (code ${code}, signal ${signal}), redémarrage dans ${delay} ms`);
+    setTimeout(() => {
+      if (!this.stopped) {
+        this.workers[worker.slot] = this.spawnWorker(worker.slot, worker.restarts + 1, failures);
+        this.dispatch();
+      }
+    }, delay);
+  }
+
+  /**
+   * Rejette toutes les requêtes en attente
+   */
+  rejectQueue(error) {
+    for (const pending of this.queue) {
+      pending.reject(error);
+    }
+    this.queue = [];
+  }
+
+  /**
+   * Distribue les requêtes en attente aux workers libres
+   */
+  dispatch() {
+    for (const worker of this.workers) {
+      if (this.queue.length === 0) {
+        return;
+      }
+
+      if (worker.ready && worker.current === null) {
+        this.send(worker, this.queue.shift(), this.requestTimeout);
+      }
+    }
+  }
+
+  /**
+   * Écrit une requête sur l'entrée standard du worker
+   */
+  send(worker, pending, timeout) {
+    pending.id = this.nextId++;
+    worker.current = pending;
+
+    // Un worker bloqué est tué : l'événement exit le redémarrera
+    worker.timer = setTimeout(() => {
+      console.error(`Le worker ${worker.slot} ne répond plus, arrêt forcé`);
+      worker.process.kill('SIGKILL');
+    }, timeout);
+
+    const request = { id: pending.id, type: pending.type };
+    if (pending.type === 'process') {
+      request.data = pending.data;
+    }
+
+    worker.process.stdin.write(JSON.stringify(request) + '\n');
+  }
+
+  /**
+   * Envoie un ping aux workers libres ; un worker qui ne répond pas est redémarré
+   */
+  checkHealth() {
+    for (const worker of this.workers) {
+      if (!worker.ready || worker.current !== null) {
+        continue;
+      }
+
+      const ping = {
+        type: 'ping',
+        // Le pong transporte les compteurs du cache de résultats quand il est activé
+        resolve: (response) => { worker.cache = response.cache || null; },
+        reject: (error) => console.error(`Vérification de santé échouée (worker ${worker.slot}):`, error.message)
+      };
+      this.send(worker, ping, this.healthTimeout);
+    }
+  }
+}
+
+module.exports = PythonWorkerPool;
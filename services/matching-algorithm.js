@@ -1257,6 +1257,14 @@ class MatchingAlgorithm {
     convertToAnnual(salaryRange) {
         if (!salaryRange) return { min: null, max: null };
         
+        // Montants déjà annualisés en euros par le parser Python
+        if (salaryRange.annualMin !== undefined || salaryRange.annualMax !== undefined) {
+            return {
+                min: salaryRange.annualMin !== undefined ? salaryRange.annualMin : null,
+                max: salaryRange.annualMax !== undefined ? salaryRange.annualMax : null
+            };
+        }
+        
         const { min, max, currency, period } = salaryRange;
         
         // Facteurs de conversion en valeur annuelle